@@ -111,9 +111,10 @@ class FraudDetectionService:
         
         logger.info(f"Loaded {len(self.rules_engine.historical_claims)} historical claims")
     
-    async def analyze_claim(self, claim_data: ClaimData) -> FinalFraudScore:
+    def score_claim(self, claim_data: ClaimData) -> FinalFraudScore:
         """
-        Analyzes a claim using a hybrid rules-and-ML approach.
+        Scores a claim using a hybrid rules-and-ML approach.
+        Has no network side effects, so it can be embedded in-process by the backend.
         """
         start_time = datetime.now()
         
@@ -163,10 +164,6 @@ class FraudDetectionService:
             )
             
             self.rules_engine.add_historical_claim(claim_data)
-            await self._update_backend_fraud_score(final_fraud_score)
-            
-            if final_score >= 70:
-                await self._generate_fraud_alert(claim_data, final_fraud_score)
             
             logger.info(f"Claim {claim_data.claim_id} analysis complete: {final_score}/100 ({risk_level})")
             return final_fraud_score
@@ -180,6 +177,20 @@ class FraudDetectionService:
                 confidence=0.1, analysis_time_ms=round(analysis_time, 2)
             )
     
+    async def analyze_claim(self, claim_data: ClaimData) -> FinalFraudScore:
+        """
+        Analyzes a claim and reports the score (and any alert) back to the backend API.
+        """
+        final_fraud_score = self.score_claim(claim_data)
+        
+        if "ANALYSIS_ERROR" not in final_fraud_score.flags:
+            await self._update_backend_fraud_score(final_fraud_score)
+            
+            if final_fraud_score.score >= 70:
+                await self._generate_fraud_alert(claim_data, final_fraud_score)
+        
+        return final_fraud_score
+    
     async def _update_backend_fraud_score(self, fraud_score: FinalFraudScore):
         """Send fraud score back to backend API"""
         try:
@@ -7,10 +7,11 @@ from typing import Optional, Dict, Any
 from fastapi import Depends, Request, Query, Header
 from functools import lru_cache
 
-from app.auth.middleware import get_current_user
+from app.auth.middleware import authenticate_token, get_request_principal
 from app.config.settings import get_settings, Settings
-from app.utils.exceptions import AuthenticationError, ValidationError
+from app.utils.exceptions import AuthenticationError, RateLimitError, ValidationError
 from app.utils.logging import get_logger
+from app.utils.rate_limit import get_rate_limiter
 
 logger = get_logger(__name__)
 
@@ -31,7 +32,15 @@ async def get_authenticated_user(request: Request) -> Dict[str, Any]:
     Returns:
         User information dictionary
     """
-    return await get_current_user(request)
+    authorization = request.headers.get("Authorization", "")
+    if not authorization.startswith("Bearer "):
+        raise AuthenticationError("Missing bearer token")
+    try:
+        # Shares the verification already done for rate limiting on this request
+        return await authenticate_token(request, authorization[len("Bearer "):])
+    except Exception as e:
+        logger.error(f"Authentication error: {e}")
+        raise AuthenticationError()
 
 async def get_optional_user(request: Request) -> Optional[Dict[str, Any]]:
     """
@@ -44,7 +53,7 @@ async def get_optional_user(request: Request) -> Optional[Dict[str, Any]]:
         User information dictionary or None
     """
     try:
-        return await get_current_user(request)
+        return await get_authenticated_user(request)
     except AuthenticationError:
         return None
 
@@ -253,15 +262,20 @@ async def check_rate_limit(
         RateLimitError: If rate limit exceeded
     """
     
-    if not settings.RATE_LIMIT_ENABLED:
+    if not settings.rate_limit_enabled:
         return
     
-    # TODO: Implement actual rate limiting logic
-    # This would typically use Redis or in-memory store
-    # to track request counts per IP/user
+    client_ip = client_info.get("ip") or "unknown"
+    result = await get_rate_limiter().check(
+        client_ip,
+        settings.rate_limit_requests,
+        principal_id=await get_request_principal(request),
+        principal_limit=settings.rate_limit_principal_requests
+    )
     
-    client_ip = client_info.get("ip", "unknown")
-    logger.debug(f"Rate limit check for {client_ip}")
+    if not result.allowed:
+        logger.debug(f"Rate limit exceeded for {result.key}")
+        raise RateLimitError(headers=result.headers())
 
 # Health check dependencies
 async def check_service_health() -> Dict[str, str]:
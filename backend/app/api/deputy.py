@@ -17,9 +17,10 @@ from app.api.deps import (
     validate_principal_id, validate_amount
 )
 from app.utils.logging import log_user_action, get_logger
+from app.utils.request_body import ParsedBodyRoute
 
 logger = get_logger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=ParsedBodyRoute)
 
 # ===== VENDOR SELECTION ENDPOINTS =====
 
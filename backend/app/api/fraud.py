@@ -17,9 +17,11 @@ from app.api.deps import (
     validate_fraud_score
 )
 from app.utils.logging import log_user_action, get_logger
+from app.utils.metrics import get_realtime_stats
+from app.utils.request_body import ParsedBodyRoute
 
 logger = get_logger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=ParsedBodyRoute)
 
 # ===== FRAUD ANALYSIS ENDPOINTS =====
 
@@ -304,40 +306,10 @@ async def get_real_time_fraud_stats(
     logger.info("Getting real-time fraud statistics")
     
     try:
-        # TODO: Get real-time stats from fraud detection engine
+        # Throughput, latency percentiles, risk levels and dependencies since process start
         stats = {
-            "current_status": {
-                "monitoring_active": True,
-                "claims_in_queue": 5,
-                "alerts_pending": 3,
-                "high_risk_claims": 2
-            },
-            "last_24_hours": {
-                "claims_analyzed": 47,
-                "fraud_detected": 8,
-                "false_positives": 2,
-                "accuracy_rate": 89.4
-            },
-            "detection_engine": {
-                "ai_engine_status": "healthy",
-                "pattern_recognition": "active",
-                "blockchain_verification": "operational",
-                "citizen_reports": "monitored"
-            },
-            "recent_detections": [
-                {
-                    "claim_id": 105,
-                    "detection_time": datetime.utcnow(),
-                    "fraud_type": "price_inflation",
-                    "confidence": 0.92
-                },
-                {
-                    "claim_id": 104,
-                    "detection_time": datetime.utcnow() - timedelta(hours=2),
-                    "fraud_type": "shell_company",
-                    "confidence": 0.88
-                }
-            ]
+            "monitoring_active": True,
+            **get_realtime_stats()
         }
         
         return ResponseSchema(
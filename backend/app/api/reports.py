@@ -0,0 +1,39 @@
+"""
+CorruptGuard Report Export Endpoints
+Stored fraud results streamed as NDJSON or CSV
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.auth.middleware import get_current_user
+from app.config.settings import get_settings
+from app.database import AsyncSessionLocal
+from app.fraud.reports import FRAUD_REPORT_FIELDS, fraud_report_records, iter_fraud_results
+from app.utils.logging import get_logger
+from app.utils.request_body import ParsedBodyRoute
+from app.utils.streaming import stream_report
+
+logger = get_logger(__name__)
+settings = get_settings()
+router = APIRouter(route_class=ParsedBodyRoute)
+
+
+@router.get("/reports/export")
+async def export_fraud_report(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson (with a trailing summary) or csv"),
+    since: Optional[datetime] = Query(None, description="Only results recorded at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only results recorded before this time"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream stored fraud results, read from the database in keyset-paginated chunks"""
+    logger.info(f"Fraud report export ({format}) requested by {current_user['principal_id']}")
+    results = iter_fraud_results(AsyncSessionLocal, settings.report_chunk_size, since, until)
+    return stream_report(
+        fraud_report_records(results),
+        format,
+        filename=f"fraud_report_{datetime.utcnow():%Y%m%d}",
+        fieldnames=FRAUD_REPORT_FIELDS
+    )
@@ -11,6 +11,7 @@ import asyncio
 from ..auth.middleware import require_vendor_operations, get_current_user
 from ..services.hedera_service import hedera_service
 from ..schemas.vendor import ClaimSubmissionRequest, SupplierPaymentRequest
+from ..utils.uploads import hash_upload
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -258,21 +259,18 @@ async def upload_claim_document(
                 detail=f"File type {file_extension} not allowed. Allowed types: {allowed_types}"
             )
         
-        # Read file content
-        content = await file.read()
+        # Hash in chunks instead of reading the whole file into memory
+        digest = await hash_upload(file)
         
-        # Generate file hash
-        file_hash = hashlib.sha256(content).hexdigest()
-        
-        logger.info(f"Uploaded document: {file.filename} ({len(content)} bytes) for vendor {current_user['principal_id']}")
+        logger.info(f"Uploaded document: {file.filename} ({digest.size} bytes) for vendor {current_user['principal_id']}")
         
         return {
             "success": True,
             "message": "Document uploaded successfully",
             "document": {
                 "filename": file.filename,
-                "file_size": len(content),
-                "file_hash": file_hash,
+                "file_size": digest.size,
+                "file_hash": digest.sha256,
                 "document_type": document_type,
                 "claim_id": claim_id,
                 "uploaded_by": current_user['principal_id'],
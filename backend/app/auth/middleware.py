@@ -10,20 +10,33 @@ logger = logging.getLogger(__name__)
 # Security scheme for JWT tokens
 security = HTTPBearer()
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+async def authenticate_token(request: Request, token: str) -> dict:
     """
-    Get current authenticated user from JWT token
+    Verify a bearer token at most once per request
+    
+    The verified user is kept on request.state, so the rate limiter and the
+    auth dependency share one verification. Failures are not cached.
     """
-    try:
-        token = credentials.credentials
-        
-        # Handle demo tokens
-        if token.startswith('demo_token_'):
-            return parse_demo_token(token)
-        
+    cached = getattr(request.state, "authenticated", None)
+    if cached is not None and cached[0] == token:
+        return cached[1]
+    
+    # Handle demo tokens
+    if token.startswith('demo_token_'):
+        user_data = parse_demo_token(token)
+    else:
         # Handle standard JWT tokens
         user_data = await principal_auth_service.verify_token(token)
-        return user_data
+    
+    request.state.authenticated = (token, user_data)
+    return user_data
+
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    """
+    Get current authenticated user from JWT token
+    """
+    try:
+        return await authenticate_token(request, credentials.credentials)
         
     except HTTPException:
         raise
@@ -144,6 +157,21 @@ async def get_optional_user(request: Request) -> Optional[dict]:
     except Exception:
         return None
 
+async def get_request_principal(request: Request) -> Optional[str]:
+    """
+    Principal ID for a request's bearer token, or None if absent or invalid
+    Used where authentication is optional, e.g. per-principal rate limiting
+    """
+    authorization = request.headers.get("Authorization")
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    
+    token = authorization[len("Bearer "):]
+    try:
+        return (await authenticate_token(request, token))["principal_id"]
+    except Exception:
+        return None
+
 # Role-based dependency injection
 require_main_government = RoleChecker(["main_government"])
 require_state_head = RoleChecker(["main_government", "state_head"])
@@ -1,6 +1,6 @@
 # backend/app/config/settings.py - UPDATED
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Dict, Optional, List
 import secrets
 import os
 
@@ -72,23 +72,87 @@ class Settings(BaseSettings):
     # Database (for future use)
     database_url: str = "sqlite:///./corruptguard.db"
     database_echo: bool = False
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: int = 30  # seconds to wait for a pooled connection
+    database_pool_recycle: int = 1800  # seconds before a connection is replaced
+    sqlite_busy_timeout_ms: int = 5000
+    
+    # Write-behind buffer for fraud results and audit rows
+    write_behind_flush_ms: int = 200  # flush at least this often
+    write_behind_max_rows: int = 500  # or as soon as this many rows are pending
+    write_behind_spill_path: Optional[str] = "./data/write_behind.jsonl"  # None disables crash recovery
+    write_behind_max_pending: int = 50_000  # rows held while the database is unreachable
+    write_behind_overflow_policy: str = "reject"  # "reject" (503 to the caller) or "drop" (counted)
+    
+    # Read-through cache for claim scores and active alerts (invalidated on flush)
+    score_cache_ttl_seconds: float = 30.0  # bounds staleness from writes by other replicas
+    score_cache_max_entries: int = 10_000
+    fraud_alerts_active_window_hours: int = 24
+    fraud_alerts_active_limit: int = 100
+    report_chunk_size: int = 500  # rows fetched per keyset page when streaming reports
     
     # Logging
     log_level: str = "INFO"
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     log_file: Optional[str] = None
+    log_queue_enabled: bool = True  # handlers run on a background thread, off the event loop
+    log_queue_size: int = 10_000  # records buffered before the overflow policy applies
+    log_queue_policy: str = "drop"  # "drop" new records when full, or "block" the caller
+    log_queue_block_timeout: float = 0.05  # seconds a "block" caller waits before dropping
+    request_log_sample_rate: float = 1.0  # share of successful, fast requests logged; errors and slow ones always are
+    request_log_slow_seconds: float = 5.0  # requests slower than this are always logged, as SLOW_REQUEST
     
     # Fraud Detection
     FRAUD_DETECTION_ENABLED: bool = True
     fraud_detection_enabled: bool = True
-    fraud_scoring_endpoint: Optional[str] = None
+    fraud_scoring_mode: str = "local"  # "local" (built-in engine), "inprocess" or "http" (AI fraud engine)
+    fraud_scoring_endpoint: Optional[str] = None  # AI engine /analyze-claim URL for "http" mode
+    fraud_engine_path: Optional[str] = None  # AI/fraud_engine checkout for "inprocess" mode
     fraud_alert_threshold: int = 70
     fraud_critical_threshold: int = 85
+    fraud_batch_max_claims: int = 10_000
+    fraud_detectors_disabled: List[str] = []  # e.g. ["timeline_anomalies"]
+    fraud_detection_stop_on_block: bool = False  # skip remaining detectors once a critical alert fires
+    fraud_collusion_rings_path: Optional[str] = "./data/collusion_rings.json"  # written by scripts/find_collusion_rings.py
+    
+    # Fraud Scoring Pool (keeps CPU-bound scoring off the event loop)
+    fraud_scoring_workers: int = 4
+    fraud_scoring_max_queue: int = 64  # calls waiting beyond this are rejected with 503
+    fraud_scoring_timeout_seconds: float = 10.0
+    fraud_scoring_batch_timeout_seconds: float = 300.0
+    warmup_wait_seconds: float = 5.0  # scoring requests during startup wait this long, then 503
+    
+    # ML Model Retraining
+    ml_retrain_enabled: bool = True
+    ml_retrain_interval_seconds: int = 3600  # retrain at least hourly when new claims arrive
+    ml_retrain_min_new_claims: int = 100  # or as soon as this many new claims are recorded
+    ml_artifacts_enabled: bool = True
+    ml_model_path: str = "./models/fraud_detector.pkl"  # metadata sidecar is written next to it
     
     # Rate Limiting
     rate_limit_enabled: bool = True
-    rate_limit_requests: int = 100
+    rate_limit_requests: int = 100  # per client IP per window
+    rate_limit_principal_requests: int = 300  # per authenticated principal per window
     rate_limit_window: int = 60  # seconds
+    # Per-IP limits key on the socket peer by default, since X-Forwarded-For is
+    # client-supplied; behind a reverse proxy that sets it, turn this on or every
+    # caller shares the proxy's address and one bucket
+    rate_limit_trust_forwarded_for: bool = False
+    rate_limit_backend: str = "memory"  # "memory" (per process) or "redis" (shared across workers)
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    rate_limit_max_keys: int = 100_000  # in-memory backend evicts least recently seen clients beyond this
+    
+    # Middleware profiles: "full" inspection, "light" (cheap checks only) or "none"
+    middleware_default_profile: str = "full"  # routes not matched below, including all public routes
+    middleware_route_profiles: Dict[str, str] = {
+        "/health": "none",
+        "/ready": "none",
+        "/metrics": "none",
+        "/api/v1/fraud/analyze-claim": "light",
+        "/api/v1/fraud/analyze-claims/batch": "light",
+        "/api/v1/fraud/analyze": "light",
+    }  # path prefix -> profile; the longest matching prefix wins
     
     # Monitoring
     enable_metrics: bool = True
@@ -99,6 +163,11 @@ class Settings(BaseSettings):
     max_upload_size: int = 10 * 1024 * 1024  # 10MB
     allowed_file_types: list = [".pdf", ".jpg", ".jpeg", ".png", ".doc", ".docx"]
     upload_directory: str = "./uploads"
+    upload_chunk_size: int = 64 * 1024  # bytes read at a time when hashing uploads
+    max_request_body_size: int = 1024 * 1024  # bytes, for routes without their own limit
+    request_size_limits: Dict[str, int] = {
+        "/api/v1/vendor/documents/upload": 10 * 1024 * 1024,
+    }  # path prefix -> max body bytes; the longest matching prefix wins
     
     # Email (for notifications)
     smtp_server: Optional[str] = None
@@ -1,26 +1,102 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import NullPool
+from typing import AsyncIterator
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 from app.config.settings import get_settings
 
 settings = get_settings()
 
 DATABASE_URL = getattr(settings, 'database_url', 'sqlite:///./corruptguard.db')
 
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=NullPool,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def to_async_url(url: str) -> str:
+    """Map a plain database URL onto its async driver (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite:///"):
+        return "sqlite+aiosqlite:///" + url[len("sqlite:///"):]
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    if url.startswith("postgres://"):
+        return "postgresql+asyncpg://" + url[len("postgres://"):]
+    return url
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+IS_SQLITE = ASYNC_DATABASE_URL.startswith("sqlite")
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection for concurrent readers and cheap commits"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")  # safe under WAL, avoids an fsync per commit
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-20000")  # ~20MB page cache
+    cursor.close()
+
+
+def create_engine_for(url: str) -> AsyncEngine:
+    """Pooled async engine for `url`, with the SQLite connection pragmas when it is SQLite"""
+    is_sqlite = url.startswith("sqlite")
+    # In-memory SQLite lives on a single connection, so it can't take a sized pool
+    pool_options = {} if ":memory:" in url else {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+        "pool_recycle": settings.database_pool_recycle,
+    }
+
+    async_engine = create_async_engine(
+        url,
+        echo=settings.database_echo,
+        pool_pre_ping=not is_sqlite,
+        **pool_options,
+    )
+    if is_sqlite:
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return async_engine
+
+
+engine = create_engine_for(ASYNC_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
+
+# Indexes replaced by the composite ones on the models; dropped from existing databases
+SUPERSEDED_INDEXES = ("ix_fraud_results_claim_id",)
+
+
+def _upgrade_indexes(conn) -> None:
+    """
+    Bring indexes on tables that already existed up to date
+
+    create_all skips existing tables entirely, so indexes added to a model
+    later would never reach a database created before them.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    for name in SUPERSEDED_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+async def init_db() -> None:
+    """Create tables for all registered models and add any indexes they are missing"""
+    import app.schemas  # noqa: F401  (registers models on Base.metadata)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_indexes)
+
+
+async def close_db() -> None:
+    """Release every pooled connection"""
+    await engine.dispose()
@@ -0,0 +1,101 @@
+# backend/app/database/cache.py
+"""
+Read-through cache for hot database queries
+Serves repeated dashboard reads from memory until the underlying rows change
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Set, Tuple
+
+
+class ReadThroughCache:
+    """
+    Small async LRU cache with a TTL and explicit invalidation
+
+    `get_or_load` returns the cached value for a key, or awaits the loader
+    once and stores its result; concurrent misses for the same key share a
+    single load. Writers call `invalidate` when they persist new rows; the
+    TTL only bounds staleness from writers this process does not see.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+        self._stale: Set[Hashable] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            self._stale.discard(key)
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark retrieved so an unawaited failure doesn't log a warning
+                future.exception()
+            raise
+        finally:
+            self._loading.pop(key, None)
+
+        future.set_result(value)
+        # Only cache if nobody invalidated the key while we were loading
+        if key in self._stale:
+            self._stale.discard(key)
+        else:
+            self._store(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        self.invalidations += 1
+        self._entries.pop(key, None)
+        if key in self._loading:
+            self._stale.add(key)
+
+    def clear(self) -> None:
+        self.invalidations += 1
+        self._entries.clear()
+        self._stale.update(self._loading)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,334 @@
+# backend/app/database/write_behind.py
+"""
+Write-behind buffer for high-volume inserts
+Batches FraudResult / FraudAuditLog rows into bulk INSERTs with a crash spill file
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, insert
+
+from app.database import Base
+from app.utils.exceptions import WriteBufferFullError
+
+logger = logging.getLogger(__name__)
+
+PendingRow = Tuple[str, Dict[str, Any]]
+
+OVERFLOW_POLICIES = ("reject", "drop")
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class WriteBehindBuffer:
+    """
+    Accumulates rows in memory and flushes them with one INSERT per table
+
+    A flush happens every `flush_interval_ms`, or as soon as `max_rows` rows
+    are pending. Accepted rows are also appended to a local JSONL spill file
+    by a background writer, in batches with one fsync each, off the event loop.
+    The file is rewritten after each successful flush and replayed on start,
+    so rows buffered when the process dies are written on the next boot. Only
+    rows accepted since the last spill batch can be lost.
+
+    At most `max_pending` rows are held while the database is unreachable.
+    Past that, `overflow_policy` "reject" raises WriteBufferFullError to the
+    caller and "drop" discards the row; both are counted.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        flush_interval_ms: int = 200,
+        max_rows: int = 500,
+        spill_path: Optional[str] = None,
+        on_flush: Optional[Callable[[Dict[str, List[Dict[str, Any]]]], None]] = None,
+        max_pending: int = 50_000,
+        overflow_policy: str = "reject",
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}, not {overflow_policy!r}")
+
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_rows = max_rows
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.on_flush = on_flush
+        self.max_pending = max_pending
+        self.overflow_policy = overflow_policy
+
+        self._pending: List[PendingRow] = []
+        self._unspilled: List[PendingRow] = []
+        self._spill_file = None
+        self._task: Optional[asyncio.Task] = None
+        self._spill_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._spill_wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._spill_lock: Optional[asyncio.Lock] = None
+
+        self.rows_written = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.spill_batches = 0
+        self.overflowed_rows = 0
+        self.last_error: Optional[str] = None
+
+    # ------------------------------------------------------------------ lifecycle
+
+    async def start(self) -> None:
+        """Replay any spilled rows and start the periodic flusher"""
+        if self._task is not None:
+            return
+
+        self._wakeup = asyncio.Event()
+        self._spill_wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._spill_lock = asyncio.Lock()
+
+        if self.spill_path is not None:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            replayed = await asyncio.to_thread(self._load_spill)
+            self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+            if replayed:
+                logger.warning(f"Replaying {replayed} buffered rows from {self.spill_path}")
+                await self.flush()
+            self._spill_task = asyncio.create_task(self._run_spill(), name="write-behind-spill")
+
+        self._task = asyncio.create_task(self._run(), name="write-behind-flusher")
+
+    async def stop(self) -> None:
+        """Stop the flusher and write out everything still buffered"""
+        if self._task is not None:
+            # Never cancel mid-flush: the spill rewrite thread would outlive the await
+            async with self._flush_lock:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+
+        if self._spill_task is not None:
+            async with self._spill_lock:
+                self._spill_task.cancel()
+            try:
+                await self._spill_task
+            except asyncio.CancelledError:
+                pass
+            self._spill_task = None
+        # Whatever the database did not take must be on disk before the file closes
+        await self._spill_batch()
+
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+        if self._pending:
+            logger.error(f"{len(self._pending)} rows left unflushed; they remain in {self.spill_path}")
+
+    # ------------------------------------------------------------------ public API
+
+    def add(self, model: Any, values: Dict[str, Any]) -> bool:
+        """
+        Queue one row for `model` (a declarative class such as FraudResult)
+
+        Returns False if the buffer is full and the row was dropped.
+
+        Raises:
+            WriteBufferFullError: If the buffer is full and the policy is "reject"
+        """
+        table_name = model.__tablename__
+        if len(self._pending) >= self.max_pending:
+            self.overflowed_rows += 1
+            logger.error(
+                f"Write-behind buffer full ({self.max_pending} rows pending); "
+                f"{self.overflow_policy}ing a {table_name} row"
+            )
+            if self.overflow_policy == "reject":
+                raise WriteBufferFullError()
+            return False
+
+        row = dict(values)
+        if "created_at" in model.__table__.c and "created_at" not in row:
+            # Stamp at enqueue time so a delayed flush doesn't skew timestamps
+            row["created_at"] = datetime.now(timezone.utc)
+
+        self._pending.append((table_name, row))
+
+        if self._spill_file is not None:
+            self._unspilled.append((table_name, row))
+            self._spill_wakeup.set()
+
+        if len(self._pending) >= self.max_rows and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> int:
+        """Write all pending rows now; returns the number of rows written"""
+        if self._flush_lock is None:
+            return 0
+
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, []
+
+            rows_by_table: Dict[str, List[Dict[str, Any]]] = {}
+            for table_name, row in batch:
+                rows_by_table.setdefault(table_name, []).append(row)
+
+            try:
+                async with self.session_factory() as session:
+                    for table_name, rows in rows_by_table.items():
+                        await session.execute(insert(Base.metadata.tables[table_name]), rows)
+                    await session.commit()
+            except Exception as e:
+                # Put the batch back in front of anything queued meanwhile and retry next tick
+                self._pending = batch + self._pending
+                self.failed_flushes += 1
+                self.last_error = str(e)
+                logger.error(f"Write-behind flush of {len(batch)} rows failed: {e}")
+                return 0
+
+            self.flushes += 1
+            self.rows_written += len(batch)
+            self.last_error = None
+            await self._rewrite_spill()
+
+            if self.on_flush is not None:
+                try:
+                    self.on_flush(rows_by_table)
+                except Exception as e:
+                    logger.warning(f"Write-behind flush callback failed: {e}")
+
+            return len(batch)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffer counters for health reporting"""
+        return {
+            "pending_rows": len(self._pending),
+            "unspilled_rows": len(self._unspilled),
+            "rows_written": self.rows_written,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "spill_batches": self.spill_batches,
+            "overflowed_rows": self.overflowed_rows,
+            "overflow_policy": self.overflow_policy,
+            "flush_interval_ms": int(self.flush_interval * 1000),
+            "max_rows": self.max_rows,
+            "max_pending": self.max_pending,
+            "last_error": self.last_error,
+        }
+
+    # ------------------------------------------------------------------ internals
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _run_spill(self) -> None:
+        while True:
+            await self._spill_wakeup.wait()
+            self._spill_wakeup.clear()
+            try:
+                await self._spill_batch()
+            except OSError as e:
+                self.last_error = str(e)
+                logger.error(f"Write-behind spill write failed: {e}")
+
+    async def _spill_batch(self) -> None:
+        """Append every row accepted since the last batch to the spill file, with one fsync"""
+        if self._spill_lock is None:
+            return
+
+        async with self._spill_lock:
+            if self._spill_file is None or not self._unspilled:
+                return
+            batch, self._unspilled = self._unspilled, []
+            try:
+                await asyncio.to_thread(self._append_spill, batch)
+            except Exception:
+                # Keep them for the next batch; a flush rewrite may also cover them
+                self._unspilled = batch + self._unspilled
+                raise
+            self.spill_batches += 1
+
+    def _serialize(self, table_name: str, row: Dict[str, Any]) -> str:
+        values = {key: _encode(value) for key, value in row.items()}
+        return json.dumps({"table": table_name, "values": values}) + "\n"
+
+    def _append_spill(self, rows: List[PendingRow]) -> None:
+        self._spill_file.write("".join(self._serialize(table_name, row) for table_name, row in rows))
+        self._spill_file.flush()
+        os.fsync(self._spill_file.fileno())
+
+    async def _rewrite_spill(self) -> None:
+        """Replace the spill file with whatever is still pending after a flush"""
+        if self._spill_file is None:
+            return
+
+        async with self._spill_lock:
+            # Snapshot and reset together: rows added while the file is rewritten
+            # land in _unspilled and are appended by the next batch
+            remaining, self._unspilled = list(self._pending), []
+            await asyncio.to_thread(self._replace_spill, remaining)
+
+    def _replace_spill(self, rows: List[PendingRow]) -> None:
+        tmp_path = self.spill_path.with_name(self.spill_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for table_name, row in rows:
+                f.write(self._serialize(table_name, row))
+            f.flush()
+            os.fsync(f.fileno())
+        self._spill_file.close()
+        os.replace(tmp_path, self.spill_path)
+        self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+
+    def _load_spill(self) -> int:
+        if not self.spill_path.exists():
+            return 0
+
+        loaded = 0
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    table = Base.metadata.tables[record["table"]]
+                except (ValueError, KeyError) as e:
+                    # A torn final line is expected after a crash mid-write
+                    logger.warning(f"Skipping unreadable spill line {line_no}: {e}")
+                    continue
+
+                row = {}
+                for key, value in record["values"].items():
+                    column = table.c.get(key)
+                    if column is not None and isinstance(column.type, DateTime) and isinstance(value, str):
+                        value = datetime.fromisoformat(value)
+                    row[key] = value
+
+                self._pending.append((table.name, row))
+                loaded += 1
+
+        return loaded
@@ -0,0 +1,111 @@
+# backend/app/fraud/artifacts.py
+"""
+Model artifact persistence
+Serializes trained scaler/model pairs so replicas start without retraining
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.fraud.retraining import ModelBundle
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever MLFraudDetector.prepare_features changes meaning or order of features
+FEATURE_SCHEMA_VERSION = 1
+
+
+def _metadata_path(artifact_path: Path) -> Path:
+    return artifact_path.with_suffix(artifact_path.suffix + ".json")
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save_model_artifact(bundle: ModelBundle, feature_columns: List[str], artifact_path: str) -> str:
+    """
+    Write the bundle's scaler and model plus a metadata sidecar
+
+    Returns the SHA-256 content hash recorded in the metadata.
+    """
+    path = Path(artifact_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    payload = pickle.dumps((bundle.scaler, bundle.model), protocol=pickle.HIGHEST_PROTOCOL)
+    content_hash = hashlib.sha256(payload).hexdigest()
+
+    metadata = {
+        "content_sha256": content_hash,
+        "feature_schema_version": FEATURE_SCHEMA_VERSION,
+        "feature_columns": list(feature_columns),
+        "version": bundle.version,
+        "trained_at": bundle.trained_at.isoformat(),
+        "training_duration_ms": bundle.training_duration_ms,
+        "training_samples": bundle.training_samples,
+    }
+
+    # Model first, metadata last: a reader only trusts a model whose hash the metadata vouches for
+    _atomic_write(path, payload)
+    _atomic_write(_metadata_path(path), json.dumps(metadata, indent=2).encode("utf-8"))
+
+    logger.info(f"Saved ML model artifact v{bundle.version} to {path} ({content_hash[:12]})")
+    return content_hash
+
+
+def load_model_artifact(artifact_path: str, feature_columns: List[str]) -> Optional[Tuple[object, object, Dict]]:
+    """
+    Load a persisted scaler/model pair if present and current
+
+    Returns (scaler, model, metadata), or None when the artifact is missing,
+    was written for a different feature schema, or fails its content hash.
+    """
+    path = Path(artifact_path)
+    meta_path = _metadata_path(path)
+
+    if not path.exists() or not meta_path.exists():
+        return None
+
+    try:
+        metadata = json.loads(meta_path.read_text(encoding="utf-8"))
+        payload = path.read_bytes()
+    except (OSError, ValueError) as e:
+        logger.warning(f"Unreadable ML model artifact at {path}: {e}")
+        return None
+
+    if metadata.get("feature_schema_version") != FEATURE_SCHEMA_VERSION:
+        logger.info(
+            f"ML model artifact at {path} is stale (feature schema "
+            f"{metadata.get('feature_schema_version')} != {FEATURE_SCHEMA_VERSION})"
+        )
+        return None
+
+    if metadata.get("feature_columns") != list(feature_columns):
+        logger.info(f"ML model artifact at {path} is stale (feature columns changed)")
+        return None
+
+    if hashlib.sha256(payload).hexdigest() != metadata.get("content_sha256"):
+        logger.warning(f"ML model artifact at {path} failed its content hash check")
+        return None
+
+    scaler, model = pickle.loads(payload)
+    return scaler, model, metadata
+
+
+def parse_trained_at(metadata: Dict) -> datetime:
+    """Recover the training timestamp recorded in artifact metadata"""
+    try:
+        return datetime.fromisoformat(metadata["trained_at"])
+    except (KeyError, TypeError, ValueError):
+        return datetime.now()
@@ -7,12 +7,15 @@ Implements real fraud patterns found in government procurement
 import asyncio
 import logging
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-import statistics
 import re
 from collections import defaultdict, Counter
 
+from app.fraud.detectors import DetectorRegistry
+from app.fraud.history import ClaimHistoryIndex, CollusionCluster, find_collusion_clusters
+from app.fraud.rings import CollusionRingIndex, find_collusion_rings
+
 @dataclass
 class FraudAlert:
     alert_type: str
@@ -32,13 +35,21 @@ class ClaimAnalysis:
     total_risk_score: int
     recommendation: str
     reasoning: str
+    detector_timings_ms: Dict[str, float] = field(default_factory=dict)
+    skipped_detectors: List[str] = field(default_factory=list)
+    truncated: bool = False  # stop_on_block skipped detectors; total_risk_score is a lower bound
 
 class FraudDetectionEngine:
     """
     Advanced fraud detection using real government procurement patterns
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        disabled_detectors: Optional[List[str]] = None,
+        stop_on_block: Optional[bool] = None,
+        rings_path: Optional[str] = None
+    ):
         self.logger = logging.getLogger(__name__)
         
         # Fraud detection thresholds (tuned from real data)
@@ -48,10 +59,106 @@ class FraudDetectionEngine:
         self.RAPID_SUBMISSION_HOURS = 2  # Claims within 2 hours are suspicious
         self.HIGH_RISK_SCORE = 70
         self.CRITICAL_RISK_SCORE = 85
+        
+        # Incremental aggregates over recorded history
+        self.history = ClaimHistoryIndex()
+        self._history_source: Optional[List[Dict]] = None
+        self._history_synced = 0
+        
+        # Cluster membership from the last batch collusion scan
+        self.collusion_clusters: List[CollusionCluster] = []
+        self._vendor_clusters: Dict[str, List[CollusionCluster]] = defaultdict(list)
+        
+        # Detectors run cheapest first; costs are relative
+        self.detectors = DetectorRegistry()
+        self.detectors.register("cost_anomalies", self._detect_cost_anomalies, cost=1)
+        self.detectors.register("collusion_rings", self._detect_collusion_ring_membership, cost=1)
+        self.detectors.register("invoice_fraud", self._detect_invoice_fraud, cost=1)
+        self.detectors.register("process_violations", self._detect_process_violations, cost=2)
+        self.detectors.register("timeline_anomalies", self._detect_timeline_anomalies, cost=2)
+        self.detectors.register("vendor_fraud_patterns", self._detect_vendor_fraud_patterns, cost=3)
+        
+        if disabled_detectors is None or stop_on_block is None or rings_path is None:
+            from app.config.settings import get_settings
+            settings = get_settings()
+            if disabled_detectors is None:
+                disabled_detectors = settings.fraud_detectors_disabled
+            if stop_on_block is None:
+                stop_on_block = settings.fraud_detection_stop_on_block
+            if rings_path is None:
+                rings_path = settings.fraud_collusion_rings_path
+        self.detectors.configure(disabled_detectors)
+        self.stop_on_block = stop_on_block
+        
+        # Ring membership from the last offline discovery run (see discover_collusion_rings)
+        self.rings_path = rings_path
+        self.collusion_rings = CollusionRingIndex.load(rings_path) if rings_path else CollusionRingIndex()
+    
+    def record_claim(self, claim: Dict) -> None:
+        """Add a historical claim to the detection indexes"""
+        self.history.add(claim)
+    
+    def _sync_history(self, historical_data: Optional[List[Dict]]) -> None:
+        """
+        Index entries appended to `historical_data` since the last call
+        
+        Callers that keep one growing history list pay only for the new
+        entries; passing a different list rebuilds the indexes from it.
+        """
+        if historical_data is None:
+            return
+        
+        if historical_data is not self._history_source or len(historical_data) < self._history_synced:
+            self.history = ClaimHistoryIndex()
+            self._history_source = historical_data
+            self._history_synced = 0
+        
+        for claim in historical_data[self._history_synced:]:
+            self.history.add(claim)
+        self._history_synced = len(historical_data)
+    
+    def scan_collusion_clusters(self, historical_data: List[Dict]) -> List[CollusionCluster]:
+        """
+        Batch job: find collusion clusters across the full history and cache
+        which vendors belong to them for online lookups
+        """
+        clusters = find_collusion_clusters(historical_data)
+        
+        vendor_clusters: Dict[str, List[CollusionCluster]] = defaultdict(list)
+        for cluster in clusters:
+            for vendor in cluster.vendors:
+                vendor_clusters[vendor].append(cluster)
+        
+        self.collusion_clusters = clusters
+        self._vendor_clusters = vendor_clusters
+        self.logger.info(f"Collusion scan found {len(clusters)} clusters over {len(historical_data)} claims")
+        return clusters
+    
+    def discover_collusion_rings(self, historical_data: List[Dict], save: bool = True) -> CollusionRingIndex:
+        """
+        Offline job: find vendor rings over the full history, swap them in for
+        online lookups and persist them to `rings_path` for other workers
+        """
+        index = CollusionRingIndex(find_collusion_rings(historical_data))
+        if save and self.rings_path:
+            index.save(self.rings_path)
+        self.collusion_rings = index
+        self.logger.info(f"Collusion ring discovery found {len(index)} rings over {len(historical_data)} claims")
+        return index
+    
+    def collusion_clusters_for(self, vendor: str, amount: Optional[float] = None) -> List[CollusionCluster]:
+        """Cached clusters the vendor belongs to, optionally only those near `amount`"""
+        clusters = self._vendor_clusters.get(vendor, [])
+        if amount is None:
+            return list(clusters)
+        return [cluster for cluster in clusters if cluster.covers(amount)]
     
-    async def analyze_claim(self, claim_data: Dict, historical_data: List[Dict]) -> ClaimAnalysis:
+    async def analyze_claim(self, claim_data: Dict, historical_data: Optional[List[Dict]] = None) -> ClaimAnalysis:
         """
         Main fraud analysis function - combines all detection methods
+        
+        Pass `historical_data` to analyze against that history, or omit it to
+        use the claims added through `record_claim`.
         """
         claim_id = claim_data["claim_id"]
         vendor = claim_data["vendor_principal"]
@@ -59,33 +166,20 @@ class FraudDetectionEngine:
         
         self.logger.info(f"Starting fraud analysis for claim {claim_id}")
         
-        alerts = []
-        
-        # 1. Cost Variance Analysis (Most Common Fraud)
-        cost_alerts = await self._detect_cost_anomalies(claim_data, historical_data)
-        alerts.extend(cost_alerts)
-        
-        # 2. Vendor Pattern Analysis
-        vendor_alerts = await self._detect_vendor_fraud_patterns(claim_data, historical_data)
-        alerts.extend(vendor_alerts)
-        
-        # 3. Timeline Anomaly Detection
-        timeline_alerts = await self._detect_timeline_anomalies(claim_data, historical_data)
-        alerts.extend(timeline_alerts)
+        self._sync_history(historical_data)
         
-        # 4. Invoice Content Analysis
-        invoice_alerts = await self._detect_invoice_fraud(claim_data)
-        alerts.extend(invoice_alerts)
-        
-        # 5. Procurement Process Violations
-        process_alerts = await self._detect_process_violations(claim_data, historical_data)
-        alerts.extend(process_alerts)
+        # Once the claim is certain to be blocked nothing else can change the outcome
+        stop_when = self._is_blocked if self.stop_on_block else None
+        run = await self.detectors.run(claim_data, stop_when=stop_when)
+        alerts = run.alerts
         
         # Calculate total risk score
         total_risk_score = min(sum(alert.risk_score for alert in alerts), 100)
         
         # Determine recommendation
         recommendation, reasoning = self._calculate_recommendation(alerts, total_risk_score)
+        if run.stopped_early:
+            reasoning += f" Analysis stopped early; {len(run.skipped)} detector(s) not run."
         
         return ClaimAnalysis(
             claim_id=claim_id,
@@ -94,10 +188,19 @@ class FraudDetectionEngine:
             alerts=alerts,
             total_risk_score=total_risk_score,
             recommendation=recommendation,
-            reasoning=reasoning
+            reasoning=reasoning,
+            detector_timings_ms=run.timings_ms,
+            skipped_detectors=run.skipped,
+            truncated=run.stopped_early
         )
     
-    async def _detect_cost_anomalies(self, claim_data: Dict, historical_data: List[Dict]) -> List[FraudAlert]:
+    def _is_blocked(self, alerts: List[FraudAlert]) -> bool:
+        """True once _calculate_recommendation would return BLOCK for these alerts"""
+        if any(alert.severity == "critical" for alert in alerts):
+            return True
+        return min(sum(alert.risk_score for alert in alerts), 100) >= self.CRITICAL_RISK_SCORE
+    
+    async def _detect_cost_anomalies(self, claim_data: Dict) -> List[FraudAlert]:
         """
         Detect suspicious cost increases - #1 source of procurement fraud
         """
@@ -105,16 +208,12 @@ class FraudDetectionEngine:
         amount = claim_data["amount"]
         area = claim_data.get("area", "unknown")
         
-        # Get similar projects for comparison
-        similar_projects = [
-            h for h in historical_data 
-            if h.get("area") == area and h.get("amount", 0) > 0
-        ]
+        # Running mean/median of similar projects, maintained as claims are recorded
+        similar_projects = self.history.area_stats(area)
         
         if similar_projects:
-            amounts = [p["amount"] for p in similar_projects]
-            avg_amount = statistics.mean(amounts)
-            median_amount = statistics.median(amounts)
+            avg_amount = similar_projects.mean
+            median_amount = similar_projects.median
             
             # Calculate percentage increase from typical amounts
             avg_increase = ((amount - avg_amount) / avg_amount) * 100 if avg_amount > 0 else 0
@@ -131,7 +230,7 @@ class FraudDetectionEngine:
                         "claimed_amount": amount,
                         "typical_amount": int(avg_amount),
                         "increase_percentage": round(avg_increase, 1),
-                        "similar_projects_count": len(similar_projects)
+                        "similar_projects_count": similar_projects.count
                     },
                     risk_score=45,
                     recommended_action="block"
@@ -170,7 +269,31 @@ class FraudDetectionEngine:
         
         return alerts
     
-    async def _detect_vendor_fraud_patterns(self, claim_data: Dict, historical_data: List[Dict]) -> List[FraudAlert]:
+    async def _detect_collusion_ring_membership(self, claim_data: Dict) -> List[FraudAlert]:
+        """
+        Flag vendors that belong to a known collusion ring
+        """
+        ring = self.collusion_rings.ring_for(claim_data["vendor_principal"])
+        if ring is None:
+            return []
+        
+        return [FraudAlert(
+            alert_type="collusion_ring_member",
+            severity="high" if len(ring.vendors) >= 4 else "medium",
+            confidence=0.7,
+            description=f"Vendor belongs to a ring of {len(ring.vendors)} vendors with matching bids",
+            evidence={
+                "ring_id": ring.ring_id,
+                "ring_vendors": len(ring.vendors),
+                "shared_deputies": ring.deputies,
+                "shared_areas": ring.areas,
+                "linked_bids": ring.linked_bids
+            },
+            risk_score=ring.risk_score,
+            recommended_action="review"
+        )]
+    
+    async def _detect_vendor_fraud_patterns(self, claim_data: Dict) -> List[FraudAlert]:
         """
         Detect vendor-specific fraud patterns and collusion
         """
@@ -178,20 +301,16 @@ class FraudDetectionEngine:
         vendor = claim_data["vendor_principal"]
         amount = claim_data["amount"]
         
-        # Get vendor's history
-        vendor_claims = [h for h in historical_data if h.get("vendor") == vendor]
+        # Vendor's running totals, maintained as claims are recorded
+        vendor_stats = self.history.vendor_stats(vendor)
         
-        if vendor_claims:
-            vendor_amounts = [c["amount"] for c in vendor_claims]
-            
+        if vendor_stats:
             # Detect consistent over-pricing pattern
-            if len(vendor_amounts) >= 3:
-                avg_vendor_amount = statistics.mean(vendor_amounts)
-                all_amounts = [h["amount"] for h in historical_data if h.get("vendor") != vendor]
+            if vendor_stats.count >= 3:
+                avg_vendor_amount = vendor_stats.mean
+                avg_market_amount = self.history.market_average_excluding(vendor)
                 
-                if all_amounts:
-                    avg_market_amount = statistics.mean(all_amounts)
-                    
+                if avg_market_amount is not None:
                     # Vendor consistently charges more than market
                     if avg_vendor_amount > avg_market_amount * 1.3:
                         alerts.append(FraudAlert(
@@ -202,16 +321,15 @@ class FraudDetectionEngine:
                             evidence={
                                 "vendor_avg": int(avg_vendor_amount),
                                 "market_avg": int(avg_market_amount),
-                                "vendor_claims_count": len(vendor_claims)
+                                "vendor_claims_count": vendor_stats.count
                             },
                             risk_score=30,
                             recommended_action="review"
                         ))
             
             # Detect rapid claim escalation (vendor getting bolder)
-            recent_claims = sorted(vendor_claims, key=lambda x: x.get("timestamp", 0))[-5:]
-            if len(recent_claims) >= 3:
-                amounts = [c["amount"] for c in recent_claims]
+            amounts = vendor_stats.recent_amounts
+            if len(amounts) >= 3:
                 if all(amounts[i] < amounts[i+1] for i in range(len(amounts)-1)):
                     escalation_rate = (amounts[-1] - amounts[0]) / amounts[0] * 100
                     if escalation_rate > 100:  # 100% escalation in recent claims
@@ -230,30 +348,31 @@ class FraudDetectionEngine:
                         ))
         
         # Detect bid collusion (multiple vendors with similar amounts)
-        similar_amount_claims = [
-            h for h in historical_data 
-            if abs(h.get("amount", 0) - amount) / amount < 0.05  # Within 5%
-            and h.get("vendor") != vendor
-        ]
+        similar_amount_claims = self.history.count_similar_amounts(amount, exclude_vendor=vendor)
         
-        if len(similar_amount_claims) >= 2:
+        if similar_amount_claims >= 2:
+            evidence = {
+                "similar_claims": similar_amount_claims,
+                "amount": amount,
+                "variance_threshold": "5%"
+            }
+            known_clusters = self.collusion_clusters_for(vendor, amount)
+            if known_clusters:
+                evidence["collusion_clusters"] = [cluster.cluster_id for cluster in known_clusters]
+            
             alerts.append(FraudAlert(
                 alert_type="potential_bid_collusion",
                 severity="high",
                 confidence=0.7,
                 description=f"Multiple vendors submitting similar amounts (₹{amount:,})",
-                evidence={
-                    "similar_claims": len(similar_amount_claims),
-                    "amount": amount,
-                    "variance_threshold": "5%"
-                },
+                evidence=evidence,
                 risk_score=35,
                 recommended_action="review"
             ))
         
         return alerts
     
-    async def _detect_timeline_anomalies(self, claim_data: Dict, historical_data: List[Dict]) -> List[FraudAlert]:
+    async def _detect_timeline_anomalies(self, claim_data: Dict) -> List[FraudAlert]:
         """
         Detect suspicious timing patterns in claim submissions
         """
@@ -261,13 +380,10 @@ class FraudDetectionEngine:
         current_time = datetime.now()
         
         # Check for rapid-fire submissions (coordinated fraud)
-        recent_claims = [
-            h for h in historical_data
-            if abs(h.get("timestamp", 0) - current_time.timestamp()) < 3600 * self.RAPID_SUBMISSION_HOURS
-        ]
+        recent_claims = self.history.amounts_near(current_time.timestamp(), 3600 * self.RAPID_SUBMISSION_HOURS)
         
         if len(recent_claims) >= 3:
-            total_amount = sum(c.get("amount", 0) for c in recent_claims)
+            total_amount = sum(recent_claims)
             alerts.append(FraudAlert(
                 alert_type="rapid_submission_pattern",
                 severity="medium",
@@ -331,7 +447,7 @@ class FraudDetectionEngine:
         
         return alerts
     
-    async def _detect_process_violations(self, claim_data: Dict, historical_data: List[Dict]) -> List[FraudAlert]:
+    async def _detect_process_violations(self, claim_data: Dict) -> List[FraudAlert]:
         """
         Detect violations of procurement process and policy
         """
@@ -356,15 +472,14 @@ class FraudDetectionEngine:
         
         # Check for contract splitting (artificially keeping under thresholds)
         deputy = claim_data.get("deputy", "")
-        same_deputy_recent = [
-            h for h in historical_data
-            if h.get("deputy") == deputy and 
-            abs(h.get("timestamp", 0) - datetime.now().timestamp()) < 86400 * 30  # 30 days
-        ]
+        same_deputy_recent = self.history.amounts_near(
+            datetime.now().timestamp(), 86400 * 30, deputy=deputy  # 30 days
+        )
         
         if len(same_deputy_recent) >= 3:
-            total_recent = sum(c.get("amount", 0) for c in same_deputy_recent)
-            if total_recent > 20000000 and all(c.get("amount", 0) < 5000000 for c in same_deputy_recent):
+            total_recent = sum(same_deputy_recent)
+            individual_max = max(same_deputy_recent)
+            if total_recent > 20000000 and individual_max < 5000000:
                 alerts.append(FraudAlert(
                     alert_type="contract_splitting_pattern",
                     severity="high",
@@ -373,7 +488,7 @@ class FraudDetectionEngine:
                     evidence={
                         "contracts_count": len(same_deputy_recent),
                         "total_amount": total_recent,
-                        "individual_max": max(c.get("amount", 0) for c in same_deputy_recent)
+                        "individual_max": individual_max
                     },
                     risk_score=30,
                     recommended_action="review"
@@ -426,6 +541,7 @@ class FraudDetectionEngine:
                 for alert in analysis.alerts
             ],
             "fraud_patterns_detected": list(set(alert.alert_type for alert in analysis.alerts)),
+            "truncated": analysis.truncated,
             "analysis_timestamp": datetime.now().isoformat(),
             "money_at_risk": analysis.amount if analysis.recommendation in ["BLOCK", "REVIEW"] else 0
         }
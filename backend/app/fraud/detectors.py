@@ -0,0 +1,179 @@
+# backend/app/fraud/detectors.py
+"""
+Fraud detector registry
+Runs a configurable set of detectors in dependency and cost order, records
+how long each one takes, and can stop once the outcome is already decided
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.utils.exceptions import ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+DetectorFunc = Callable[[Dict], Awaitable[List[Any]]]
+
+
+@dataclass
+class Detector:
+    """One registered detector; lower `cost` runs earlier"""
+    name: str
+    run: DetectorFunc
+    cost: int = 1
+    depends_on: Tuple[str, ...] = ()
+    enabled: bool = True
+
+    # Latency counters
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
+@dataclass
+class DetectorRun:
+    """Alerts and timings from running the registry on one claim"""
+    alerts: List[Any] = field(default_factory=list)
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    stopped_early: bool = False
+
+
+class DetectorRegistry:
+    """
+    Ordered set of fraud detectors
+
+    Detectors run after everything they depend on; among detectors that are
+    ready, the cheapest runs first (ties keep registration order), so a
+    deciding alert is found before the expensive scans. A detector whose
+    dependency is disabled or skipped is skipped as well.
+    """
+
+    def __init__(self):
+        self._detectors: Dict[str, Detector] = {}
+        self._plan: Optional[List[Detector]] = None
+
+    def register(
+        self,
+        name: str,
+        run: DetectorFunc,
+        cost: int = 1,
+        depends_on: Iterable[str] = (),
+        enabled: bool = True,
+    ) -> Detector:
+        if name in self._detectors:
+            raise ConfigurationError(f"Fraud detector '{name}' is already registered")
+
+        detector = Detector(name=name, run=run, cost=cost, depends_on=tuple(depends_on), enabled=enabled)
+        self._detectors[name] = detector
+        self._plan = None
+        return detector
+
+    def enable(self, name: str) -> None:
+        self._get(name).enabled = True
+
+    def disable(self, name: str) -> None:
+        self._get(name).enabled = False
+
+    def configure(self, disabled: Iterable[str]) -> None:
+        """Disable the named detectors and enable all others"""
+        disabled = set(disabled)
+        unknown = disabled - set(self._detectors)
+        if unknown:
+            raise ConfigurationError(f"Unknown fraud detectors: {sorted(unknown)}")
+        for detector in self._detectors.values():
+            detector.enabled = detector.name not in disabled
+
+    def _get(self, name: str) -> Detector:
+        if name not in self._detectors:
+            raise ConfigurationError(f"Unknown fraud detector '{name}'")
+        return self._detectors[name]
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._detectors)
+
+    def plan(self) -> List[Detector]:
+        """All detectors in execution order, resolved once per registration change"""
+        if self._plan is None:
+            self._plan = self._resolve_order()
+        return self._plan
+
+    def _resolve_order(self) -> List[Detector]:
+        for detector in self._detectors.values():
+            for dependency in detector.depends_on:
+                if dependency not in self._detectors:
+                    raise ConfigurationError(
+                        f"Fraud detector '{detector.name}' depends on unknown detector '{dependency}'"
+                    )
+
+        ordered: List[Detector] = []
+        done = set()
+        pending = list(self._detectors.values())
+        while pending:
+            ready = [d for d in pending if all(dep in done for dep in d.depends_on)]
+            if not ready:
+                raise ConfigurationError(
+                    f"Fraud detector dependencies form a cycle: {sorted(d.name for d in pending)}"
+                )
+            # min() keeps the first of equal-cost detectors, i.e. registration order
+            detector = min(ready, key=lambda d: d.cost)
+            ordered.append(detector)
+            done.add(detector.name)
+            pending.remove(detector)
+        return ordered
+
+    async def run(
+        self,
+        claim_data: Dict,
+        stop_when: Optional[Callable[[List[Any]], bool]] = None,
+    ) -> DetectorRun:
+        """
+        Run enabled detectors on one claim
+
+        If `stop_when` returns True for the alerts gathered so far, the
+        remaining detectors are skipped.
+        """
+        result = DetectorRun()
+        completed = set()
+
+        for detector in self.plan():
+            if result.stopped_early or not detector.enabled or not all(
+                dep in completed for dep in detector.depends_on
+            ):
+                result.skipped.append(detector.name)
+                continue
+
+            start = time.perf_counter()
+            alerts = await detector.run(claim_data)
+            elapsed = time.perf_counter() - start
+
+            detector.record(elapsed)
+            result.timings_ms[detector.name] = round(elapsed * 1000, 3)
+            result.alerts.extend(alerts)
+            completed.add(detector.name)
+
+            if stop_when is not None and stop_when(result.alerts):
+                result.stopped_early = True
+
+        return result
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            detector.name: {
+                "enabled": detector.enabled,
+                "cost": detector.cost,
+                "depends_on": list(detector.depends_on),
+                "calls": detector.calls,
+                "avg_ms": round(detector.total_seconds / detector.calls * 1000, 3) if detector.calls else 0.0,
+                "max_ms": round(detector.max_seconds * 1000, 3),
+            }
+            for detector in self.plan()
+        }
@@ -0,0 +1,141 @@
+# backend/app/fraud/executor.py
+"""
+Bounded worker pool for CPU-bound fraud scoring
+Keeps rule scans, NumPy and scikit-learn work off the event loop
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.utils.exceptions import ScoringCapacityError, ScoringTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+class ScoringExecutor:
+    """
+    Runs synchronous scoring callables in a thread pool
+
+    At most `max_workers + max_queue` calls may be in flight; further calls
+    are rejected immediately with ScoringCapacityError instead of piling up
+    behind a long-running scan. Callers wait at most `timeout_seconds`.
+
+    Threads rather than processes: scoring reads the live claim history and
+    whichever model the retrainer last swapped in. A process pool would have
+    to ship that state to a worker on every call.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue: int = 64,
+        timeout_seconds: float = 10.0,
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="fraud-scoring"
+            )
+        return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run `fn(*args)` in the pool and await its result
+
+        Raises:
+            ScoringCapacityError: If the pool and its queue are full
+            ScoringTimeoutError: If the call does not finish within the timeout
+        """
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ScoringCapacityError()
+            self._in_flight += 1
+            self._submitted += 1
+
+        started = time.perf_counter()
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+        # The slot is released when the work really finishes, not when the caller gives up
+        future.add_done_callback(lambda f: self._on_done(f, started))
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=timeout if timeout is not None else self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            # Only succeeds while still queued; running work finishes in the background
+            future.cancel()
+            raise ScoringTimeoutError()
+
+    def _on_done(self, future: Future, started: float) -> None:
+        latency = time.perf_counter() - started
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool utilization and throughput counters"""
+        with self._lock:
+            in_flight = self._in_flight
+            finished = self._completed + self._failed
+            busy = min(in_flight, self.max_workers)
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "timeout_seconds": self.timeout_seconds,
+                "in_flight": in_flight,
+                "busy_workers": busy,
+                "queued": max(0, in_flight - self.max_workers),
+                "utilization": round(busy / self.max_workers, 3) if self.max_workers else 0.0,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "avg_latency_ms": round(self._total_latency / finished * 1000, 2) if finished else 0.0,
+                "max_latency_ms": round(self._max_latency * 1000, 2),
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release pool workers"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info("Fraud scoring pool shut down")
@@ -0,0 +1,281 @@
+# backend/app/fraud/history.py
+"""
+Incremental indexes over claim history
+Keeps the aggregates the fraud detectors need up to date as claims are
+recorded, so each check avoids rescanning the full history
+"""
+
+import bisect
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+RECENT_VENDOR_CLAIMS = 5
+SIMILAR_AMOUNT_TOLERANCE = 0.05
+
+
+class RunningMedian:
+    """
+    Streaming median over an append-only sequence
+
+    A max-heap holds the lower half and a min-heap the upper half, so adding
+    a value is O(log n) and reading the median is O(1).
+    """
+
+    def __init__(self):
+        self._low: List[float] = []   # max-heap via negation
+        self._high: List[float] = []  # min-heap
+
+    def add(self, value: float) -> None:
+        if self._low and value > -self._low[0]:
+            heapq.heappush(self._high, value)
+        else:
+            heapq.heappush(self._low, -value)
+
+        # Rebalance so len(low) == len(high) or len(high) + 1
+        if len(self._low) > len(self._high) + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+        elif len(self._high) > len(self._low):
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+
+    @property
+    def median(self) -> Optional[float]:
+        if not self._low:
+            return None
+        if len(self._low) > len(self._high):
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+    def __len__(self) -> int:
+        return len(self._low) + len(self._high)
+
+
+class AreaStats:
+    """Running count, sum and median of positive claim amounts in one area"""
+
+    __slots__ = ("count", "total", "_median")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self._median = RunningMedian()
+
+    def add(self, amount: float) -> None:
+        self.count += 1
+        self.total += amount
+        self._median.add(amount)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def median(self) -> float:
+        return self._median.median or 0.0
+
+
+class VendorStats:
+    """Running count and sum of one vendor's claims, plus its latest amounts"""
+
+    __slots__ = ("count", "total", "amounts", "_recent", "_seq")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.amounts: List[float] = []  # sorted
+        # (timestamp, arrival order, amount) for the latest claims, oldest first
+        self._recent: List[Tuple[float, int, float]] = []
+        self._seq = 0
+
+    def add(self, amount: float, timestamp: float) -> None:
+        self.count += 1
+        self.total += amount
+        bisect.insort(self.amounts, amount)
+
+        # Claims usually arrive in time order, so this is an append and a pop
+        self._seq += 1
+        bisect.insort(self._recent, (timestamp, self._seq, amount))
+        if len(self._recent) > RECENT_VENDOR_CLAIMS:
+            self._recent.pop(0)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def recent_amounts(self) -> List[float]:
+        """Amounts of the latest claims by timestamp, oldest first"""
+        return [amount for _, _, amount in self._recent]
+
+
+class Timeline:
+    """
+    Claim amounts ordered by timestamp
+
+    Window queries locate their bounds with two binary searches, so they cost
+    O(log n) plus the number of claims inside the window.
+    """
+
+    __slots__ = ("_timestamps", "_amounts")
+
+    def __init__(self):
+        self._timestamps: List[float] = []
+        self._amounts: List[float] = []
+
+    def add(self, timestamp: float, amount: float) -> None:
+        # Claims usually arrive in time order, so this is normally an append
+        position = bisect.bisect_right(self._timestamps, timestamp)
+        self._timestamps.insert(position, timestamp)
+        self._amounts.insert(position, amount)
+
+    def window(self, start: float, end: float) -> List[float]:
+        """Amounts of claims with start < timestamp < end"""
+        low = bisect.bisect_right(self._timestamps, start)
+        high = bisect.bisect_left(self._timestamps, end)
+        return self._amounts[low:high]
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+
+class ClaimHistoryIndex:
+    """
+    Aggregates over historical claim dicts (keys: vendor, amount, area, deputy, timestamp)
+
+    Claims are only ever added, matching how history is recorded.
+    """
+
+    def __init__(self, claims: Optional[List[Dict]] = None):
+        self.count = 0
+        self.total = 0.0
+        self._areas: Dict[str, AreaStats] = defaultdict(AreaStats)
+        self._vendors: Dict[str, VendorStats] = defaultdict(VendorStats)
+        self._amounts: List[float] = []  # sorted, for range queries
+        self._timeline = Timeline()
+        self._deputy_timelines: Dict[str, Timeline] = defaultdict(Timeline)
+
+        for claim in claims or []:
+            self.add(claim)
+
+    def add(self, claim: Dict) -> None:
+        """Fold one historical claim into every index"""
+        amount = claim.get("amount", 0)
+        self.count += 1
+        self.total += amount
+        bisect.insort(self._amounts, amount)
+
+        if amount > 0:
+            self._areas[claim.get("area")].add(amount)
+        timestamp = claim.get("timestamp", 0)
+        self._vendors[claim.get("vendor")].add(amount, timestamp)
+        self._timeline.add(timestamp, amount)
+        self._deputy_timelines[claim.get("deputy")].add(timestamp, amount)
+
+    def area_stats(self, area: str) -> Optional[AreaStats]:
+        """Amount statistics for an area, or None if no claims were recorded there"""
+        return self._areas.get(area)
+
+    def vendor_stats(self, vendor: str) -> Optional[VendorStats]:
+        """Claim statistics for a vendor, or None if it has no recorded claims"""
+        return self._vendors.get(vendor)
+
+    def market_average_excluding(self, vendor: str) -> Optional[float]:
+        """Mean amount of every other vendor's claims, or None if there are none"""
+        stats = self._vendors.get(vendor)
+        count = self.count - (stats.count if stats else 0)
+        if count <= 0:
+            return None
+        return (self.total - (stats.total if stats else 0.0)) / count
+
+    def amounts_near(self, timestamp: float, seconds: float, deputy: Optional[str] = None) -> List[float]:
+        """
+        Amounts of claims less than `seconds` away from `timestamp`, either
+        across all claims or only those handled by `deputy`
+        """
+        if deputy is None:
+            timeline = self._timeline
+        else:
+            timeline = self._deputy_timelines.get(deputy)
+            if timeline is None:
+                return []
+        return timeline.window(timestamp - seconds, timestamp + seconds)
+
+    def count_similar_amounts(
+        self, amount: float, exclude_vendor: Optional[str] = None, tolerance: float = SIMILAR_AMOUNT_TOLERANCE
+    ) -> int:
+        """
+        Number of claims whose amount is within `tolerance` of `amount`,
+        not counting `exclude_vendor`'s own claims
+
+        Two binary searches over the sorted amounts, minus the same window
+        over the excluded vendor's amounts.
+        """
+        low, high = amount * (1 - tolerance), amount * (1 + tolerance)
+        count = _count_open_range(self._amounts, low, high)
+
+        stats = self._vendors.get(exclude_vendor)
+        if stats:
+            count -= _count_open_range(stats.amounts, low, high)
+        return count
+
+
+def _count_open_range(values: List[float], low: float, high: float) -> int:
+    """Count of sorted `values` strictly between `low` and `high`"""
+    return max(0, bisect.bisect_left(values, high) - bisect.bisect_right(values, low))
+
+
+@dataclass
+class CollusionCluster:
+    """Claims from several vendors whose amounts all fall in one narrow band"""
+    cluster_id: int
+    min_amount: float
+    max_amount: float
+    vendors: Set[str] = field(default_factory=set)
+    claims_count: int = 0
+
+    def covers(self, amount: float, tolerance: float = SIMILAR_AMOUNT_TOLERANCE) -> bool:
+        return self.min_amount * (1 - tolerance) < amount < self.max_amount * (1 + tolerance)
+
+
+def find_collusion_clusters(
+    claims: List[Dict],
+    tolerance: float = SIMILAR_AMOUNT_TOLERANCE,
+    min_claims: int = 3,
+    min_vendors: int = 2,
+) -> List[CollusionCluster]:
+    """
+    Find every band of similar bids across the full history in one pass
+
+    Claims are sorted by amount and swept once. Each band starts at the
+    smallest unassigned amount and takes every following claim below
+    `tolerance` above it, so every band is at most `tolerance` wide. Bands
+    with at least `min_claims` claims from `min_vendors` distinct vendors
+    are reported.
+    """
+    ordered = sorted(
+        (claim for claim in claims if claim.get("amount", 0) > 0),
+        key=lambda claim: claim["amount"],
+    )
+
+    clusters: List[CollusionCluster] = []
+    start = 0
+    while start < len(ordered):
+        anchor = ordered[start]["amount"]
+        end = start
+        while end < len(ordered) and ordered[end]["amount"] < anchor * (1 + tolerance):
+            end += 1
+
+        band = ordered[start:end]
+        vendors = {claim.get("vendor") for claim in band}
+        if len(band) >= min_claims and len(vendors) >= min_vendors:
+            clusters.append(CollusionCluster(
+                cluster_id=len(clusters),
+                min_amount=anchor,
+                max_amount=band[-1]["amount"],
+                vendors=vendors,
+                claims_count=len(band),
+            ))
+        start = end
+
+    return clusters
@@ -0,0 +1,235 @@
+# backend/app/fraud/ml.py
+"""
+ML anomaly detector for fraud scoring
+Extracts per-claim features and scores them against the active IsolationForest,
+which can be retrained, swapped and rolled back while requests are served
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.fraud.artifacts import load_model_artifact, parse_trained_at, save_model_artifact
+from app.fraud.retraining import ModelBundle, fit_anomaly_model
+
+logger = logging.getLogger(__name__)
+
+# A ClaimData, or anything with vendor_id, amount and timestamp
+Claim = Any
+
+
+class MLFraudDetector:
+    """Machine Learning based fraud detection using anomaly detection"""
+
+    def __init__(self):
+        self._active: Optional[ModelBundle] = None
+        self._previous: Optional[ModelBundle] = None
+        self._version_counter = 0
+        self.feature_columns = [
+            'amount', 'vendor_submissions_count', 'time_since_last_submission',
+            'amount_vs_avg', 'approval_speed', 'weekend_submission'
+        ]
+
+    @property
+    def is_trained(self) -> bool:
+        return self._active is not None
+
+    @property
+    def model(self):
+        return self._active.model if self._active else None
+
+    @property
+    def scaler(self):
+        return self._active.scaler if self._active else None
+
+    def prepare_features(self, claim: Claim, historical_data: List[Claim]) -> np.ndarray:
+        """Extract features for ML model"""
+        vendor_history = [c for c in historical_data if c.vendor_id == claim.vendor_id]
+
+        features = {
+            'amount': claim.amount,
+            'vendor_submissions_count': len(vendor_history),
+            'time_since_last_submission': self._get_time_since_last_submission(claim, vendor_history),
+            'amount_vs_avg': self._get_amount_vs_average(claim, vendor_history),
+            'approval_speed': 1.0,
+            'weekend_submission': 1.0 if claim.timestamp.weekday() >= 5 else 0.0
+        }
+
+        return np.array([features[col] for col in self.feature_columns]).reshape(1, -1)
+
+    def _get_time_since_last_submission(self, claim: Claim, vendor_history: List[Claim]) -> float:
+        """Calculate time since vendor's last submission"""
+        if not vendor_history:
+            return 365.0
+
+        last_submission = max(vendor_history, key=lambda x: x.timestamp)
+        time_diff = (claim.timestamp - last_submission.timestamp).days
+        return min(time_diff, 365.0)
+
+    def _get_amount_vs_average(self, claim: Claim, vendor_history: List[Claim]) -> float:
+        """Calculate ratio of current amount vs vendor's average"""
+        if not vendor_history:
+            return 1.0
+
+        avg_amount = np.mean([c.amount for c in vendor_history])
+        return claim.amount / avg_amount if avg_amount > 0 else 1.0
+
+    def prepare_feature_matrix(self, claims: List[Claim], historical_data: List[Claim]) -> np.ndarray:
+        """
+        Extract features for many claims at once
+
+        Produces the same rows as prepare_features, but aggregates vendor
+        history in a single pass instead of rescanning it for every claim.
+        """
+        vendor_stats: Dict[str, List] = {}
+        for c in historical_data:
+            stats = vendor_stats.get(c.vendor_id)
+            if stats is None:
+                vendor_stats[c.vendor_id] = [1, c.amount, c.timestamp]
+            else:
+                stats[0] += 1
+                stats[1] += c.amount
+                if c.timestamp > stats[2]:
+                    stats[2] = c.timestamp
+
+        X = np.empty((len(claims), len(self.feature_columns)))
+        for i, claim in enumerate(claims):
+            stats = vendor_stats.get(claim.vendor_id)
+            if stats is None:
+                count, time_since_last, amount_vs_avg = 0, 365.0, 1.0
+            else:
+                count = stats[0]
+                avg_amount = stats[1] / count
+                time_since_last = min((claim.timestamp - stats[2]).days, 365.0)
+                amount_vs_avg = claim.amount / avg_amount if avg_amount > 0 else 1.0
+
+            X[i] = (
+                claim.amount,
+                count,
+                time_since_last,
+                amount_vs_avg,
+                1.0,
+                1.0 if claim.timestamp.weekday() >= 5 else 0.0
+            )
+
+        return X
+
+    def build_training_matrix(self, historical_data: List[Claim]) -> np.ndarray:
+        """Build the training feature matrix for a snapshot of historical claims"""
+        return self.prepare_feature_matrix(historical_data, historical_data)
+
+    def install_model(
+        self,
+        scaler,
+        model,
+        training_duration_ms: float,
+        training_samples: int,
+        version: Optional[int] = None,
+        trained_at: Optional[datetime] = None
+    ) -> ModelBundle:
+        """Atomically swap in a newly trained scaler/model pair, keeping the old one for rollback"""
+        self._version_counter = max(self._version_counter + 1, version or 0)
+        bundle = ModelBundle(
+            version=self._version_counter,
+            scaler=scaler,
+            model=model,
+            trained_at=trained_at or datetime.now(),
+            training_duration_ms=round(training_duration_ms, 2),
+            training_samples=training_samples
+        )
+        self._previous = self._active
+        self._active = bundle
+        return bundle
+
+    def rollback(self) -> bool:
+        """Restore the previously active model version"""
+        if self._previous is None:
+            return False
+
+        self._active, self._previous = self._previous, self._active
+        logger.warning(f"ML model rolled back to v{self._active.version}")
+        return True
+
+    def load_artifact(self, artifact_path: str) -> bool:
+        """Install a persisted model if one exists for the current feature schema"""
+        loaded = load_model_artifact(artifact_path, self.feature_columns)
+        if loaded is None:
+            return False
+
+        scaler, model, metadata = loaded
+        bundle = self.install_model(
+            scaler,
+            model,
+            metadata.get("training_duration_ms", 0.0),
+            metadata.get("training_samples", 0),
+            version=metadata.get("version"),
+            trained_at=parse_trained_at(metadata)
+        )
+        bundle.content_hash = metadata["content_sha256"]
+
+        logger.info(f"ML model v{bundle.version} loaded from {artifact_path}")
+        return True
+
+    def save_artifact(self, artifact_path: str, bundle: Optional[ModelBundle] = None) -> Optional[str]:
+        """Persist the given (or active) model so other replicas and restarts can reuse it"""
+        bundle = bundle or self._active
+        if bundle is None:
+            return None
+
+        bundle.content_hash = save_model_artifact(bundle, self.feature_columns, artifact_path)
+        return bundle.content_hash
+
+    def get_model_info(self) -> Dict:
+        """Active model metadata for health reporting"""
+        active = self._active
+        return {
+            "trained": active is not None,
+            "version": active.version if active else None,
+            "trained_at": active.trained_at.isoformat() if active else None,
+            "training_duration_ms": active.training_duration_ms if active else None,
+            "training_samples": active.training_samples if active else 0,
+            "content_hash": active.content_hash if active else None,
+            "rollback_version": self._previous.version if self._previous else None
+        }
+
+    def train(self, historical_data: List[Claim], fraud_labels: List[bool]):
+        """Train the ML model on historical data"""
+        if len(historical_data) < 10:
+            logger.warning("Insufficient training data for ML model")
+            return
+
+        X = self.build_training_matrix(historical_data)
+        scaler, model, duration_ms = fit_anomaly_model(X)
+        bundle = self.install_model(scaler, model, duration_ms, len(historical_data))
+
+        logger.info(f"ML model v{bundle.version} trained on {len(historical_data)} samples")
+
+    def predict_fraud_probability(self, claim: Claim, historical_data: List[Claim]) -> float:
+        """Predict fraud probability for a claim"""
+        # Read the bundle once so a concurrent swap can't mix scaler and model versions
+        bundle = self._active
+        if bundle is None:
+            return 0.5
+
+        features = self.prepare_features(claim, historical_data)
+        features_scaled = bundle.scaler.transform(features)
+
+        anomaly_score = bundle.model.decision_function(features_scaled)[0]
+        probability = max(0, min(1, 0.5 - anomaly_score))
+
+        return probability
+
+    def predict_many(self, claims: List[Claim], historical_data: List[Claim]) -> List[float]:
+        """Predict fraud probabilities for many claims with one transform and one decision_function call"""
+        bundle = self._active
+        if bundle is None:
+            return [0.5] * len(claims)
+        if not claims:
+            return []
+
+        features = self.prepare_feature_matrix(claims, historical_data)
+        anomaly_scores = bundle.model.decision_function(bundle.scaler.transform(features))
+
+        return np.clip(0.5 - anomaly_scores, 0, 1).tolist()
@@ -0,0 +1,107 @@
+# backend/app/fraud/reports.py
+"""
+Streaming fraud reports
+Reads stored fraud results in keyset-paginated chunks and aggregates them
+as they pass, so report memory stays constant however many claims it covers
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas import ALERT_RISK_LEVELS, FraudResult
+
+FRAUD_REPORT_FIELDS = ("id", "claim_id", "score", "risk_level", "flags", "confidence", "created_at")
+
+
+async def iter_fraud_results(
+    session_factory: Callable[[], AsyncSession],
+    chunk_size: int = 500,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> AsyncIterator[FraudResult]:
+    """
+    Yield stored fraud results in id order, `chunk_size` rows at a time
+
+    Each chunk resumes after the last id seen (WHERE id > :last ORDER BY id
+    LIMIT n), so every page is an index range scan rather than an ever
+    larger OFFSET. A short session per chunk avoids holding a connection
+    open while the client reads the response.
+    """
+    last_id = 0
+    while True:
+        query = select(FraudResult).where(FraudResult.id > last_id)
+        if since is not None:
+            query = query.where(FraudResult.created_at >= since)
+        if until is not None:
+            query = query.where(FraudResult.created_at < until)
+
+        async with session_factory() as session:
+            chunk = list(await session.scalars(query.order_by(FraudResult.id).limit(chunk_size)))
+
+        for result in chunk:
+            yield result
+
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1].id
+
+
+def fraud_result_record(result: FraudResult) -> Dict[str, Any]:
+    return {
+        "type": "claim",
+        "id": result.id,
+        "claim_id": result.claim_id,
+        "score": result.score,
+        "risk_level": result.risk_level,
+        "flags": result.flags or "",
+        "confidence": result.confidence,
+        "created_at": result.created_at.isoformat() if result.created_at else None,
+    }
+
+
+class FraudReportSummary:
+    """Running totals over the results of one report"""
+
+    def __init__(self):
+        self.results = 0
+        self.score_total = 0
+        self.max_score = 0
+        self.flagged = 0
+        self.by_risk_level: Counter = Counter()
+        self.flags: Counter = Counter()
+
+    def add(self, result: FraudResult) -> None:
+        self.results += 1
+        self.score_total += result.score
+        self.max_score = max(self.max_score, result.score)
+        self.by_risk_level[result.risk_level] += 1
+        if result.risk_level in ALERT_RISK_LEVELS:
+            self.flagged += 1
+        if result.flags:
+            self.flags.update(flag for flag in result.flags.split(",") if flag)
+
+    def as_record(self, top_flags: int = 10) -> Dict[str, Any]:
+        return {
+            "type": "summary",
+            "results": self.results,
+            "average_score": round(self.score_total / self.results, 2) if self.results else 0.0,
+            "max_score": self.max_score,
+            "flagged": self.flagged,
+            "by_risk_level": dict(self.by_risk_level),
+            "top_flags": dict(self.flags.most_common(top_flags)),
+            "generated_at": datetime.utcnow().isoformat(),
+        }
+
+
+async def fraud_report_records(results: AsyncIterator[FraudResult]) -> AsyncIterator[Dict[str, Any]]:
+    """One record per result, then a summary record aggregated along the way"""
+    summary = FraudReportSummary()
+    async for result in results:
+        summary.add(result)
+        yield fraud_result_record(result)
+    yield summary.as_record()
+
@@ -0,0 +1,194 @@
+# backend/app/fraud/retraining.py
+"""
+Background retraining for the ML anomaly model
+Fits a fresh scaler + IsolationForest in a worker process and hot-swaps it in
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelBundle:
+    """A trained scaler/model pair plus the metadata needed to serve and audit it"""
+    version: int
+    scaler: Any
+    model: Any
+    trained_at: datetime
+    training_duration_ms: float
+    training_samples: int
+    content_hash: Optional[str] = None
+
+
+def fit_anomaly_model(features: Any, random_state: int = 42) -> Tuple[Any, Any, float]:
+    """
+    Fit a StandardScaler + IsolationForest on a feature matrix
+
+    Kept at module level so it can be shipped to a worker process.
+    Returns (scaler, model, training_duration_ms).
+    """
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import StandardScaler
+
+    start = time.perf_counter()
+
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(features)
+
+    model = IsolationForest(
+        contamination=0.1,
+        random_state=random_state,
+        n_estimators=100
+    )
+    model.fit(X_scaled)
+
+    return scaler, model, (time.perf_counter() - start) * 1000
+
+
+class ModelRetrainer:
+    """
+    Retrains the ML detector off the request path
+
+    A retrain is triggered every `interval_seconds`, or earlier once
+    `min_new_claims` claims have been recorded since the last fit. Feature
+    extraction runs in a thread, fitting runs in a single-worker process pool,
+    and the result is installed with one reference swap on the detector so
+    in-flight predictions always see a consistent scaler/model pair.
+    """
+
+    def __init__(
+        self,
+        detector: Any,
+        history_provider: Callable[[], List[Any]],
+        interval_seconds: int = 3600,
+        min_new_claims: int = 100,
+        min_training_samples: int = 10,
+        on_model_installed: Optional[Callable[[ModelBundle], None]] = None,
+    ):
+        self.detector = detector
+        self.history_provider = history_provider
+        self.interval_seconds = interval_seconds
+        self.min_new_claims = min_new_claims
+        self.min_training_samples = min_training_samples
+        self.on_model_installed = on_model_installed
+
+        self.new_claims_since_fit = 0
+        self.retrain_count = 0
+        self.last_error: Optional[str] = None
+        self.last_retrain_at: Optional[datetime] = None
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._trigger: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def notify_new_claims(self, count: int = 1) -> None:
+        """Record newly seen claims and wake the retrain loop once the threshold is reached"""
+        self.new_claims_since_fit += count
+        if self._trigger is not None and self.new_claims_since_fit >= self.min_new_claims:
+            self._trigger.set()
+
+    async def start(self) -> None:
+        """Start the background retrain loop"""
+        if self._task is not None:
+            return
+
+        # Spawn keeps the worker from inheriting the parent's sockets and event loop
+        self._pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        self._trigger = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run(), name="ml-model-retrainer")
+        logger.info(
+            f"Model retrainer started (interval={self.interval_seconds}s, "
+            f"min_new_claims={self.min_new_claims})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the retrain loop and shut down the worker process"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+        logger.info("Model retrainer stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._trigger.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._trigger.clear()
+
+            if self.new_claims_since_fit == 0:
+                continue
+
+            try:
+                await self.retrain_now()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Background model retrain failed: {e}")
+
+    async def retrain_now(self) -> Optional[ModelBundle]:
+        """Fit a new model on the current history and swap it in"""
+        if self._lock is None:
+            raise RuntimeError("ModelRetrainer has not been started")
+
+        async with self._lock:
+            # Snapshot so concurrent appends don't change the training set mid-fit
+            history = list(self.history_provider())
+            if len(history) < self.min_training_samples:
+                logger.warning("Insufficient training data for background retrain")
+                return None
+
+            seen_claims = self.new_claims_since_fit
+            loop = asyncio.get_running_loop()
+
+            features = await asyncio.to_thread(self.detector.build_training_matrix, history)
+            scaler, model, duration_ms = await loop.run_in_executor(
+                self._pool, fit_anomaly_model, features
+            )
+
+            bundle = self.detector.install_model(scaler, model, duration_ms, len(history))
+            if self.on_model_installed is not None:
+                await asyncio.to_thread(self.on_model_installed, bundle)
+
+            self.new_claims_since_fit = max(0, self.new_claims_since_fit - seen_claims)
+            self.retrain_count += 1
+            self.last_error = None
+            self.last_retrain_at = datetime.now()
+
+            logger.info(
+                f"ML model v{bundle.version} trained on {len(history)} samples "
+                f"in {duration_ms:.1f}ms and swapped in"
+            )
+            return bundle
+
+    def get_status(self) -> dict:
+        """Retrainer state for health reporting"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval_seconds,
+            "min_new_claims": self.min_new_claims,
+            "new_claims_since_fit": self.new_claims_since_fit,
+            "retrain_count": self.retrain_count,
+            "last_retrain_at": self.last_retrain_at.isoformat() if self.last_retrain_at else None,
+            "last_error": self.last_error,
+        }
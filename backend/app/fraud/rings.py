@@ -0,0 +1,186 @@
+# backend/app/fraud/rings.py
+"""
+Collusion ring discovery
+Offline batch job that links vendors repeatedly bidding near-identical amounts
+under the same deputy and area, and groups them into rings with union-find. Ring
+membership is persisted so the online detector needs one dictionary lookup.
+"""
+
+import json
+import logging
+import os
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.fraud.history import SIMILAR_AMOUNT_TOLERANCE
+
+logger = logging.getLogger(__name__)
+
+
+class UnionFind:
+    """Disjoint sets with path halving and union by size; near-constant amortized operations"""
+
+    def __init__(self):
+        self._parent: Dict[str, str] = {}
+        self._size: Dict[str, int] = {}
+
+    def add(self, item: str) -> None:
+        if item not in self._parent:
+            self._parent[item] = item
+            self._size[item] = 1
+
+    def find(self, item: str) -> str:
+        parent = self._parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: str, b: str) -> str:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size[root_b]
+        return root_a
+
+    def groups(self) -> Dict[str, List[str]]:
+        members: Dict[str, List[str]] = defaultdict(list)
+        for item in self._parent:
+            members[self.find(item)].append(item)
+        return members
+
+
+@dataclass
+class CollusionRing:
+    """Vendors connected by near-identical bids under shared deputies and areas"""
+    ring_id: int
+    vendors: List[str]
+    deputies: List[str] = field(default_factory=list)
+    areas: List[str] = field(default_factory=list)
+    linked_bids: int = 0
+    risk_score: int = 0
+
+
+def _ring_risk_score(vendors: int, linked_bids: int) -> int:
+    # Larger rings and more repeated matching bids are stronger evidence
+    return min(40, 10 * (vendors - 1) + 2 * linked_bids)
+
+
+def find_collusion_rings(
+    claims: Iterable[Dict],
+    tolerance: float = SIMILAR_AMOUNT_TOLERANCE,
+    min_shared_bids: int = 2,
+    min_vendors: int = 3,
+) -> List[CollusionRing]:
+    """
+    Find vendor rings across the full claim history in O(n log n)
+
+    Claims (keys: vendor, deputy, area, amount) are grouped by (deputy, area)
+    and sorted by amount. Each claim is linked to the nearest lower bid from a
+    different vendor when the two are within `tolerance`, which connects every
+    such pair of vendors transitively. Two vendors are joined once they have
+    been linked at least `min_shared_bids` times, so a single coincidental
+    match does not chain unrelated vendors together. Connected groups of at
+    least `min_vendors` vendors are reported as rings.
+    """
+    groups: Dict[Tuple[str, str], List[Tuple[float, str]]] = defaultdict(list)
+    for claim in claims:
+        amount = claim.get("amount", 0)
+        if amount > 0 and claim.get("vendor"):
+            groups[(claim.get("deputy"), claim.get("area"))].append((amount, claim["vendor"]))
+
+    pair_links: Counter = Counter()
+    pair_contexts: Dict[Tuple[str, str], set] = defaultdict(set)
+
+    for context, bids in groups.items():
+        bids.sort()
+        before_run: Optional[int] = None  # last bid before the current same-vendor run
+        for j in range(1, len(bids)):
+            amount, vendor = bids[j]
+            if bids[j - 1][1] != vendor:
+                before_run = j - 1
+            if before_run is None:
+                continue
+
+            other_amount, other_vendor = bids[before_run]
+            if amount - other_amount < tolerance * other_amount:
+                pair = (vendor, other_vendor) if vendor < other_vendor else (other_vendor, vendor)
+                pair_links[pair] += 1
+                pair_contexts[pair].add(context)
+
+    vendors = UnionFind()
+    for (a, b), links in pair_links.items():
+        if links >= min_shared_bids:
+            vendors.add(a)
+            vendors.add(b)
+            vendors.union(a, b)
+
+    link_counts: Counter = Counter()
+    contexts: Dict[str, set] = defaultdict(set)
+    for (a, b), links in pair_links.items():
+        if links >= min_shared_bids:
+            root = vendors.find(a)
+            link_counts[root] += links
+            contexts[root].update(pair_contexts[(a, b)])
+
+    rings: List[CollusionRing] = []
+    for root, members in vendors.groups().items():
+        if len(members) < min_vendors:
+            continue
+        rings.append(CollusionRing(
+            ring_id=len(rings),
+            vendors=sorted(members),
+            deputies=sorted({d for d, _ in contexts[root] if d is not None}),
+            areas=sorted({a for _, a in contexts[root] if a is not None}),
+            linked_bids=link_counts[root],
+            risk_score=_ring_risk_score(len(members), link_counts[root]),
+        ))
+    return rings
+
+
+class CollusionRingIndex:
+    """Vendor → ring lookup over the last persisted ring discovery"""
+
+    def __init__(self, rings: Optional[List[CollusionRing]] = None, generated_at: Optional[str] = None):
+        self.rings = rings or []
+        self.generated_at = generated_at
+        self._by_vendor: Dict[str, CollusionRing] = {
+            vendor: ring for ring in self.rings for vendor in ring.vendors
+        }
+
+    def ring_for(self, vendor: str) -> Optional[CollusionRing]:
+        return self._by_vendor.get(vendor)
+
+    def __len__(self) -> int:
+        return len(self.rings)
+
+    def save(self, path: str) -> None:
+        """Write ring membership atomically so a reader never sees a partial file"""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "generated_at": self.generated_at or datetime.utcnow().isoformat(),
+            "rings": [asdict(ring) for ring in self.rings],
+        }
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, target)
+
+    @classmethod
+    def load(cls, path: str) -> "CollusionRingIndex":
+        """Load persisted rings; a missing or unreadable file gives an empty index"""
+        try:
+            payload = json.loads(Path(path).read_text(encoding="utf-8"))
+            rings = [CollusionRing(**ring) for ring in payload["rings"]]
+        except FileNotFoundError:
+            return cls()
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable collusion ring file {path}: {e}")
+            return cls()
+        return cls(rings, payload.get("generated_at"))
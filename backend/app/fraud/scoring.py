@@ -0,0 +1,156 @@
+# backend/app/fraud/scoring.py
+"""
+Claim scoring backends
+Lets the API score claims with its built-in engine, the AI fraud engine
+loaded in-process, or the AI fraud engine over HTTP, behind one interface
+"""
+
+import asyncio
+import importlib.util
+import logging
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pydantic import BaseModel
+
+from app.fraud.executor import ScoringExecutor
+from app.utils.exceptions import ConfigurationError, FraudDetectionError
+
+logger = logging.getLogger(__name__)
+
+SCORING_MODES = ("local", "inprocess", "http")
+
+# Fields every scorer returns; matches the API's FraudScore model
+SCORE_FIELDS = ("claim_id", "score", "risk_level", "flags", "reasoning", "confidence")
+
+DEFAULT_ENGINE_PATH = Path(__file__).resolve().parents[3] / "AI" / "fraud_engine"
+
+
+def _normalize(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: result[field] for field in SCORE_FIELDS}
+
+
+class ClaimScorer(ABC):
+    """Scores one claim and returns a dict with SCORE_FIELDS"""
+
+    mode: str = ""
+
+    @abstractmethod
+    async def score(self, claim: BaseModel) -> Dict[str, Any]:
+        ...
+
+    async def warm_up(self) -> None:
+        """Load anything expensive ahead of the first request"""
+
+    async def close(self) -> None:
+        """Release any resources held by the scorer"""
+
+
+class LocalScorer(ClaimScorer):
+    """The API's built-in rules + IsolationForest engine"""
+
+    mode = "local"
+
+    def __init__(self, analyze: Callable[[Any], Awaitable[BaseModel]]):
+        self.analyze = analyze
+
+    async def score(self, claim: BaseModel) -> Dict[str, Any]:
+        return _normalize((await self.analyze(claim)).model_dump())
+
+
+class InProcessEngineScorer(ClaimScorer):
+    """
+    The AI fraud engine's FraudDetectionService, imported into this process
+
+    Skips the HTTP hop and JSON round trip to a separately deployed engine.
+    The engine's synchronous `score_claim` runs on the scoring pool so it
+    never blocks the event loop. The engine and its dependencies are loaded
+    by `warm_up`, or by the first call to `score`.
+    """
+
+    mode = "inprocess"
+
+    def __init__(self, executor: ScoringExecutor, engine_path: Optional[str] = None):
+        self.executor = executor
+        self.engine_path = Path(engine_path) if engine_path else DEFAULT_ENGINE_PATH
+        if not (self.engine_path / "main.py").exists():
+            raise ConfigurationError(f"AI fraud engine not found at {self.engine_path}")
+
+        self.engine = None
+        self.service = None
+        self._load_lock = asyncio.Lock()
+
+    async def warm_up(self) -> None:
+        async with self._load_lock:
+            if self.service is None:
+                self.engine, self.service = await asyncio.to_thread(self._load_engine)
+
+    def _load_engine(self):
+        entry_point = self.engine_path / "main.py"
+
+        # The engine imports its siblings as top-level modules (rules_engine, ml_detector)
+        if str(self.engine_path) not in sys.path:
+            sys.path.insert(0, str(self.engine_path))
+
+        # Loaded under its own name so it can't shadow another module called "main"
+        spec = importlib.util.spec_from_file_location("ai_fraud_engine", entry_point)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        service = module.FraudDetectionService()
+        logger.info(f"Loaded AI fraud engine in-process from {self.engine_path}")
+        return module, service
+
+    async def score(self, claim: BaseModel) -> Dict[str, Any]:
+        if self.service is None:
+            await self.warm_up()
+        engine_claim = self.engine.ClaimData(**claim.model_dump())
+        result = await self.executor.run(self.service.score_claim, engine_claim)
+        return _normalize(result.model_dump())
+
+
+class HttpEngineScorer(ClaimScorer):
+    """The AI fraud engine deployed as a separate service"""
+
+    mode = "http"
+
+    def __init__(self, endpoint: str, timeout_seconds: float = 10.0):
+        import httpx  # only needed in this mode; kept off the default import path
+
+        self.endpoint = endpoint
+        # One pooled client so requests reuse keep-alive connections
+        self.client = httpx.AsyncClient(timeout=timeout_seconds)
+
+    async def score(self, claim: BaseModel) -> Dict[str, Any]:
+        import httpx
+
+        try:
+            response = await self.client.post(self.endpoint, json=claim.model_dump(mode="json"))
+            response.raise_for_status()
+            return _normalize(response.json()["fraud_analysis"])
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            raise FraudDetectionError(f"AI fraud engine request failed: {e}", claim_id=str(claim.claim_id))
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_claim_scorer(
+    mode: str,
+    local_analyze: Callable[[Any], Awaitable[BaseModel]],
+    executor: ScoringExecutor,
+    endpoint: Optional[str] = None,
+    engine_path: Optional[str] = None,
+    timeout_seconds: float = 10.0,
+) -> ClaimScorer:
+    """Build the scorer selected by the `fraud_scoring_mode` setting"""
+    if mode == "local":
+        return LocalScorer(local_analyze)
+    if mode == "inprocess":
+        return InProcessEngineScorer(executor, engine_path)
+    if mode == "http":
+        if not endpoint:
+            raise ConfigurationError("fraud_scoring_endpoint must be set when fraud_scoring_mode is 'http'")
+        return HttpEngineScorer(endpoint, timeout_seconds)
+    raise ConfigurationError(f"Unknown fraud scoring mode '{mode}', expected one of {SCORING_MODES}")
@@ -15,6 +15,8 @@ import hashlib
 import jwt
 from typing import Optional, Dict, Any
 
+from app.utils.rate_limit import InMemoryRateLimitBackend, RateLimiter
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -41,31 +43,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Simple rate limiting
+# Per-IP sliding-window rate limiting (100 requests per minute) with bounded memory
+rate_limiter = RateLimiter(InMemoryRateLimitBackend(max_keys=100_000), window_seconds=60)
+
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     start_time = time.time()
     
-    # Simple IP-based rate limiting
     ip = request.client.host if request.client else "unknown"
-    if not hasattr(app.state, "rate_buckets"):
-        app.state.rate_buckets = {}
-    
-    bucket = app.state.rate_buckets
-    now = time.time()
-    
-    if ip not in bucket:
-        bucket[ip] = {"count": 0, "reset_time": now + 60}
-    
-    if now > bucket[ip]["reset_time"]:
-        bucket[ip] = {"count": 0, "reset_time": now + 60}
-    
-    bucket[ip]["count"] += 1
-    
-    if bucket[ip]["count"] > 100:  # 100 requests per minute
+    result = await rate_limiter.hit(f"ip:{ip}", 100)
+    if not result.allowed:
         return JSONResponse(
             status_code=429,
-            content={"detail": "Rate limit exceeded. Try again later."}
+            content={"detail": "Rate limit exceeded. Try again later."},
+            headers=result.headers()
         )
     
     response = await call_next(request)
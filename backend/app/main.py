@@ -6,35 +6,42 @@ Preventing corruption and saving lives through transparency
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-import pandas as pd
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 from dataclasses import dataclass
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
-import httpx
 import json
 import time
 from contextlib import asynccontextmanager
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
 from app.api import auth as auth_api
-from app.api import government, vendor, deputy, citizen, fraud
+from app.api import government, vendor, deputy, citizen, fraud, reports
 
 # Import our modules
 from app.config.settings import get_settings
-from app.utils.logging import setup_logging
+from app.utils.logging import get_log_queue_stats, setup_logging, stop_queued_logging
+from app.utils.metrics import PROMETHEUS_CONTENT_TYPE, get_metrics_registry, record_fraud_score, track_dependency
+from app.utils.rate_limit import get_rate_limiter
+from app.utils.readiness import WarmupState
 from app.utils.exceptions import CorruptGuardException, ValidationError, AuthenticationError
-from app.auth.middleware import AuthenticationMiddleware, get_current_user, require_main_government
-from app.database import Base, engine, get_db
-from sqlalchemy.orm import Session
-from app.schemas import FraudResult, FraudAuditLog
+from app.auth.middleware import AuthenticationMiddleware, get_current_user, get_request_principal, require_main_government
+from app.database import AsyncSessionLocal, close_db, get_db, init_db
+from app.database.cache import ReadThroughCache
+from app.database.write_behind import WriteBehindBuffer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas import ALERT_RISK_FILTER, ALERT_RISK_LEVELS, FraudResult, FraudAuditLog
 from app.services.hedera_service import hedera_service
 from app.auth.prinicipal_auth import principal_auth_service
+from app.fraud.ml import MLFraudDetector
+from app.fraud.retraining import ModelBundle, ModelRetrainer
+from app.fraud.executor import ScoringExecutor
+from app.fraud.scoring import create_claim_scorer
+from app.utils.request_body import ParsedBodyRoute
+from app.middleware.stack import install_middleware
+from app.middleware.profiles import PROFILE_FULL, get_route_profiles
 
 # Setup
 setup_logging()
@@ -72,6 +79,9 @@ class FraudAlert(BaseModel):
     description: str
     auto_generated: bool = True
 
+class BatchAnalysisRequest(BaseModel):
+    claims: List[ClaimData] = Field(..., min_length=1)
+
 @dataclass
 class FraudRule:
     name: str
@@ -328,86 +338,47 @@ class FraudRulesEngine:
         matches = sum(1 for a, b in zip(hash1, hash2) if a == b)
         return matches / len(hash1)
 
-class MLFraudDetector:
-    """Machine Learning based fraud detection using anomaly detection"""
-    
-    def __init__(self):
-        self.model = None
-        self.scaler = StandardScaler()
-        self.is_trained = False
-        self.feature_columns = [
-            'amount', 'vendor_submissions_count', 'time_since_last_submission',
-            'amount_vs_avg', 'approval_speed', 'weekend_submission'
-        ]
-    
-    def prepare_features(self, claim: ClaimData, historical_data: List[ClaimData]) -> np.ndarray:
-        """Extract features for ML model"""
-        vendor_history = [c for c in historical_data if c.vendor_id == claim.vendor_id]
-        
-        features = {
-            'amount': claim.amount,
-            'vendor_submissions_count': len(vendor_history),
-            'time_since_last_submission': self._get_time_since_last_submission(claim, vendor_history),
-            'amount_vs_avg': self._get_amount_vs_average(claim, vendor_history),
-            'approval_speed': 1.0,
-            'weekend_submission': 1.0 if claim.timestamp.weekday() >= 5 else 0.0
-        }
-        
-        return np.array([features[col] for col in self.feature_columns]).reshape(1, -1)
-    
-    def _get_time_since_last_submission(self, claim: ClaimData, vendor_history: List[ClaimData]) -> float:
-        """Calculate time since vendor's last submission"""
-        if not vendor_history:
-            return 365.0
-        
-        last_submission = max(vendor_history, key=lambda x: x.timestamp)
-        time_diff = (claim.timestamp - last_submission.timestamp).days
-        return min(time_diff, 365.0)
-    
-    def _get_amount_vs_average(self, claim: ClaimData, vendor_history: List[ClaimData]) -> float:
-        """Calculate ratio of current amount vs vendor's average"""
-        if not vendor_history:
-            return 1.0
-        
-        avg_amount = np.mean([c.amount for c in vendor_history])
-        return claim.amount / avg_amount if avg_amount > 0 else 1.0
-    
-    def train(self, historical_data: List[ClaimData], fraud_labels: List[bool]):
-        """Train the ML model on historical data"""
-        if len(historical_data) < 10:
-            logger.warning("Insufficient training data for ML model")
-            return
-        
-        features_list = []
-        for claim in historical_data:
-            features = self.prepare_features(claim, historical_data)
-            features_list.append(features.flatten())
-        
-        X = np.array(features_list)
-        X_scaled = self.scaler.fit_transform(X)
-        
-        self.model = IsolationForest(
-            contamination=0.1,
-            random_state=42,
-            n_estimators=100
-        )
-        self.model.fit(X_scaled)
-        self.is_trained = True
-        
-        logger.info(f"ML model trained on {len(historical_data)} samples")
-    
-    def predict_fraud_probability(self, claim: ClaimData, historical_data: List[ClaimData]) -> float:
-        """Predict fraud probability for a claim"""
-        if not self.is_trained:
-            return 0.5
-        
-        features = self.prepare_features(claim, historical_data)
-        features_scaled = self.scaler.transform(features)
-        
-        anomaly_score = self.model.decision_function(features_scaled)[0]
-        probability = max(0, min(1, 0.5 - anomaly_score))
-        
-        return probability
+# Claim score and active alert reads, invalidated as buffered rows reach the database
+score_cache = ReadThroughCache(
+    ttl_seconds=settings.score_cache_ttl_seconds,
+    max_entries=settings.score_cache_max_entries
+)
+
+ACTIVE_ALERTS_CACHE_KEY = ("alerts", "active")
+
+def invalidate_score_cache(rows_by_table: Dict[str, List[Dict[str, Any]]]):
+    """Drop cached reads made stale by a write-behind flush"""
+    alerts_changed = False
+    for row in rows_by_table.get(FraudResult.__tablename__, []):
+        score_cache.invalidate(("claim", row["claim_id"]))
+        alerts_changed = alerts_changed or row["risk_level"] in ALERT_RISK_LEVELS
+    for row in rows_by_table.get(FraudAuditLog.__tablename__, []):
+        if row.get("claim_id") is not None:
+            score_cache.invalidate(("claim", row["claim_id"]))
+    if alerts_changed:
+        score_cache.invalidate(ACTIVE_ALERTS_CACHE_KEY)
+
+# Fraud results and audit rows are bulk-inserted off the request path
+write_buffer = WriteBehindBuffer(
+    AsyncSessionLocal,
+    flush_interval_ms=settings.write_behind_flush_ms,
+    max_rows=settings.write_behind_max_rows,
+    spill_path=settings.write_behind_spill_path,
+    max_pending=settings.write_behind_max_pending,
+    overflow_policy=settings.write_behind_overflow_policy,
+    on_flush=invalidate_score_cache
+)
+
+def fraud_result_row(fraud_score: FraudScore) -> Dict[str, Any]:
+    """Column values for persisting a FraudScore as a FraudResult row"""
+    return {
+        "claim_id": fraud_score.claim_id,
+        "score": fraud_score.score,
+        "risk_level": fraud_score.risk_level,
+        "flags": ",".join(fraud_score.flags),
+        "reasoning": fraud_score.reasoning,
+        "confidence": fraud_score.confidence,
+    }
 
 class FraudDetectionService:
     """Main fraud detection service combining rule-based and ML approaches"""
@@ -415,9 +386,37 @@ class FraudDetectionService:
     def __init__(self):
         self.rules_engine = FraudRulesEngine()
         self.ml_detector = MLFraudDetector()
+        self.retrainer = ModelRetrainer(
+            self.ml_detector,
+            lambda: self.rules_engine.historical_claims,
+            interval_seconds=settings.ml_retrain_interval_seconds,
+            min_new_claims=settings.ml_retrain_min_new_claims,
+            on_model_installed=self._persist_model
+        )
+        self.scoring_executor = ScoringExecutor(
+            max_workers=settings.fraud_scoring_workers,
+            max_queue=settings.fraud_scoring_max_queue,
+            timeout_seconds=settings.fraud_scoring_timeout_seconds
+        )
+    
+    def warm_up(self):
+        """Load the persisted model, training only when it is missing or stale"""
+        if self.ml_detector.is_trained:
+            return
         
-        # Train ML model
-        self._train_ml_model()
+        if not (settings.ml_artifacts_enabled and self.ml_detector.load_artifact(settings.ml_model_path)):
+            self._train_ml_model()
+            self._persist_model()
+    
+    def _persist_model(self, bundle: Optional[ModelBundle] = None):
+        """Write the model artifact, logging rather than failing if storage is unavailable"""
+        if not settings.ml_artifacts_enabled:
+            return
+        
+        try:
+            self.ml_detector.save_artifact(settings.ml_model_path, bundle)
+        except Exception as e:
+            logger.warning(f"Failed to persist ML model artifact: {e}")
     
     def _train_ml_model(self):
         """Train ML model with historical data"""
@@ -430,59 +429,228 @@ class FraudDetectionService:
         
         self.ml_detector.train(historical_claims, fraud_labels)
     
+    def record_claim(self, claim_data: ClaimData):
+        """Add an analyzed claim to the history and count it towards the next retrain"""
+        self.rules_engine.historical_claims.append(claim_data)
+        self.retrainer.notify_new_claims()
+    
+    def score_claim(self, claim_data: ClaimData) -> FraudScore:
+        """CPU-bound scoring of a single claim; runs inside the scoring pool"""
+        # Rule-based analysis
+        rules_score = self.rules_engine.analyze_claim(claim_data)
+        
+        # ML-based analysis
+        ml_probability = self.ml_detector.predict_fraud_probability(
+            claim_data, 
+            self.rules_engine.historical_claims
+        )
+        
+        # Combine rules and ML results
+        return self._combine_scores(claim_data, rules_score, ml_probability, self.ml_detector.is_trained)
+    
+    def score_claims_batch(self, claims: List[ClaimData]) -> List[FraudScore]:
+        """
+        CPU-bound rescoring of many claims in one pass
+        
+        Rules still run per claim, but the ML detector scores the whole batch
+        with a single vectorized call.
+        """
+        historical_claims = self.rules_engine.historical_claims
+        ml_available = self.ml_detector.is_trained
+        ml_probabilities = self.ml_detector.predict_many(claims, historical_claims)
+        
+        results = []
+        for claim_data, ml_probability in zip(claims, ml_probabilities):
+            try:
+                rules_score = self.rules_engine.analyze_claim(claim_data)
+                results.append(self._combine_scores(claim_data, rules_score, ml_probability, ml_available))
+            except Exception as e:
+                logger.error(f"Error analyzing claim {claim_data.claim_id} in batch: {str(e)}")
+                results.append(self._error_score(claim_data, e))
+        
+        return results
+    
     async def analyze_claim(self, claim_data: ClaimData) -> FraudScore:
         """Main function to analyze a claim for fraud"""
         try:
-            # Rule-based analysis
-            rules_score = self.rules_engine.analyze_claim(claim_data)
-            
-            # ML-based analysis
-            ml_probability = self.ml_detector.predict_fraud_probability(
-                claim_data, 
-                self.rules_engine.historical_claims
-            )
-            ml_score = int(ml_probability * 100)
-            
-            # Combine scores (weighted average)
-            combined_score = int(0.7 * rules_score.score + 0.3 * ml_score)
-            
-            # Determine final risk level
-            if combined_score >= 80:
-                risk_level = "critical"
-            elif combined_score >= 60:
-                risk_level = "high"
-            elif combined_score >= 30:
-                risk_level = "medium"
-            else:
-                risk_level = "low"
-            
-            # Combine reasoning
-            combined_reasoning = f"Rules: {rules_score.reasoning}; ML anomaly score: {ml_probability:.2f}"
-            
-            final_score = FraudScore(
-                claim_id=claim_data.claim_id,
-                score=combined_score,
-                risk_level=risk_level,
-                flags=rules_score.flags,
-                reasoning=combined_reasoning,
-                confidence=0.8
-            )
+            final_score = await self.scoring_executor.run(self.score_claim, claim_data)
             
             # Update Hedera with fraud score (mocked for now)
             await self._update_hedera_fraud_score(final_score)
             
             # Generate alerts for high-risk claims
-            if combined_score >= 70:
+            if final_score.score >= 70:
                 await self._generate_fraud_alert(claim_data, final_score)
             
             return final_score
-            
+        
+        except CorruptGuardException:
+            # Overload and timeout must reach the client rather than become a fake score
+            raise
         except Exception as e:
             logger.error(f"Error analyzing claim {claim_data.claim_id}: {str(e)}")
-            return FraudScore(
-                claim_id=claim_data.claim_id,
-                score=50,
-                risk_level="medium",
+            return self._error_score(claim_data, e)
+    
+    async def analyze_claims_batch(self, claims: List[ClaimData]) -> List[FraudScore]:
+        """Rescore many claims in the scoring pool without blocking the event loop"""
+        results = await self.scoring_executor.run(
+            self.score_claims_batch,
+            claims,
+            timeout=settings.fraud_scoring_batch_timeout_seconds
+        )
+        
+        for claim_data, final_score in zip(claims, results):
+            if final_score.score >= 70:
+                await self._generate_fraud_alert(claim_data, final_score)
+        
+        return results
+    
+    def _error_score(self, claim_data: ClaimData, error: Exception) -> FraudScore:
+        """Neutral score returned when analysis of a claim fails"""
+        return FraudScore(
+            claim_id=claim_data.claim_id,
+            score=50,
+            risk_level="medium",
+            flags=["ANALYSIS_ERROR"],
+            reasoning=f"Analysis failed: {str(error)}",
+            confidence=0.1
+        )
+    
+    def _combine_scores(
+        self,
+        claim_data: ClaimData,
+        rules_score: FraudScore,
+        ml_probability: float,
+        ml_available: bool = True
+    ) -> FraudScore:
+        """Blend the rules and ML results into the final fraud score"""
+        ml_score = int(ml_probability * 100)
+        
+        # Combine scores (weighted average)
+        combined_score = int(0.7 * rules_score.score + 0.3 * ml_score)
+        
+        # Determine final risk level
+        if combined_score >= 80:
+            risk_level = "critical"
+        elif combined_score >= 60:
+            risk_level = "high"
+        elif combined_score >= 30:
+            risk_level = "medium"
+        else:
+            risk_level = "low"
+        
+        # Combine reasoning
+        combined_reasoning = f"Rules: {rules_score.reasoning}; ML anomaly score: {ml_probability:.2f}"
+        flags = rules_score.flags
+        if not ml_available:
+            # No trained model: the ML half is the neutral fallback, not an assessment
+            combined_reasoning = f"Rules: {rules_score.reasoning}; ML model unavailable, neutral {ml_probability:.2f} used"
+            flags = flags + ["ML_MODEL_UNAVAILABLE"]
+        
+        return FraudScore(
+            claim_id=claim_data.claim_id,
+            score=combined_score,
+            risk_level=risk_level,
+            flags=flags,
+            reasoning=combined_reasoning,
+            confidence=0.8
+        )
+    
+    async def _update_hedera_fraud_score(self, fraud_score: FraudScore):
+        """Record fraud score on the Hedera audit trail (mocked for now)"""
+        logger.debug(f"Hedera fraud score update queued for claim {fraud_score.claim_id}: {fraud_score.score}/100")
+    
+    async def _generate_fraud_alert(self, claim_data: ClaimData, fraud_score: FraudScore):
+        """Generate fraud alert for high-risk claims"""
+        alert = FraudAlert(
+            claim_id=claim_data.claim_id,
+            alert_type="high_fraud_risk",
+            severity=fraud_score.risk_level,
+            description=f"Claim scored {fraud_score.score}/100. Flags: {', '.join(fraud_score.flags)}"
+        )
+        write_buffer.add(FraudAuditLog, {
+            "event_type": alert.alert_type,
+            "description": alert.description,
+            "claim_id": alert.claim_id,
+            "severity": alert.severity,
+        })
+        logger.warning(f"🚨 FRAUD ALERT: Claim {alert.claim_id} - {fraud_score.score}/100 risk ({alert.severity})")
+
+# Initialize fraud detection service
+fraud_service = FraudDetectionService()
+
+# Single-claim scoring: built-in engine, or the AI fraud engine in-process / over HTTP
+claim_scorer = create_claim_scorer(
+    settings.fraud_scoring_mode,
+    fraud_service.analyze_claim,
+    fraud_service.scoring_executor,
+    endpoint=settings.fraud_scoring_endpoint,
+    engine_path=settings.fraud_engine_path,
+    timeout_seconds=settings.fraud_scoring_timeout_seconds
+)
+
+# Startup warm-up progress, reported by /ready
+warmup = WarmupState(("ml_model", "claim_scorer", "hedera"))
+# What scoring needs before it can answer; Hedera only records results afterwards
+SCORING_COMPONENTS = ("ml_model", "claim_scorer")
+
+async def warm_up_services():
+    """Load the ML model, scoring engine and Hedera client off the startup path"""
+    await warmup.run([
+        ("ml_model", lambda: asyncio.to_thread(fraud_service.warm_up)),
+        ("claim_scorer", claim_scorer.warm_up),
+        # A missing Hedera configuration leaves the client disabled, which is not a startup failure
+        ("hedera", lambda: asyncio.to_thread(hedera_service.connect)),
+    ])
+
+async def score_claim(claim_data: ClaimData) -> FraudScore:
+    """Score a claim with the configured scorer, raising alerts for external engines"""
+    await warmup.wait_for(*SCORING_COMPONENTS, timeout=settings.warmup_wait_seconds)
+    with track_dependency(f"scorer_{claim_scorer.mode}"):
+        fraud_score = FraudScore(**await claim_scorer.score(claim_data))
+    record_fraud_score(fraud_score.risk_level)
+    
+    # The built-in engine raises its own alerts inside analyze_claim
+    if claim_scorer.mode != "local" and fraud_score.score >= settings.fraud_alert_threshold:
+        await fraud_service._generate_fraud_alert(claim_data, fraud_score)
+    
+    return fraud_score
+
+# ================================================================================
+# APPLICATION LIFESPAN
+# ================================================================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup and shutdown hooks"""
+    logger.info("🚀 TransGov API starting...")
+    
+    # Every route is mounted by now; fix each static path's middleware profile once
+    route_table = get_route_profiles().resolve(app.routes)
+    skipped = sorted(path for path, profile in route_table.items() if profile != PROFILE_FULL)
+    logger.info(f"Middleware profiles resolved for {len(route_table)} routes; reduced checks on {skipped}")
+    
+    await init_db()
+    await write_buffer.start()
+    
+    # Heavy loading happens in the background; /ready reports when it is done
+    warmup_task = asyncio.create_task(warm_up_services(), name="startup-warm-up")
+    
+    if settings.ml_retrain_enabled:
+        await fraud_service.retrainer.start()
+    
+    yield
+    
+    if not warmup_task.done():
+        warmup_task.cancel()
+    await fraud_service.retrainer.stop()
+    await claim_scorer.close()
+    fraud_service.scoring_executor.shutdown()
+    await write_buffer.stop()
+    await close_db()
+    logger.info("TransGov API shut down")
+    stop_queued_logging()
+
 app = FastAPI(
     title="TransGov API",
     description="""
@@ -514,22 +682,11 @@ app = FastAPI(
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
 )
+# JSON bodies already parsed by validation middleware are reused, not decoded again
+app.router.route_class = ParsedBodyRoute
 
 # Middleware
-app.add_middleware(
-    TrustedHostMiddleware, 
-    allowed_hosts=settings.ALLOWED_HOSTS
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=settings.cors_allow_credentials,
-    allow_methods=settings.cors_allow_methods,
-    allow_headers=settings.cors_allow_headers,
-)
-
-app.add_middleware(AuthenticationMiddleware)
+install_middleware(app, principal_resolver=get_request_principal, authentication_middleware=AuthenticationMiddleware)
 
 # Mount API routers
 app.include_router(auth_api.router, prefix="/api/v1")
@@ -538,33 +695,9 @@ app.include_router(vendor.router, prefix="/api/v1/vendor", tags=["Vendor"])
 app.include_router(deputy.router, prefix="/api/v1/deputy", tags=["Deputy"])
 app.include_router(citizen.router, prefix="/api/v1/citizen", tags=["Citizen"])
 app.include_router(fraud.router, prefix="/api/v1/fraud", tags=["Fraud Detection"])
+app.include_router(reports.router, prefix="/api/v1/fraud", tags=["Fraud Detection"])
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    # Simple IP-based rate limiting
-    try:
-        if settings.rate_limit_enabled:
-            ip = request.client.host if request.client else "unknown"
-            if not hasattr(app.state, "rate_buckets"):
-                app.state.rate_buckets = {}
-            bucket = app.state.rate_buckets
-            now = time.time()
-            window = settings.rate_limit_window
-            max_req = settings.rate_limit_requests
-            data = bucket.get(ip)
-            if not data or now - data["start"] > window:
-                bucket[ip] = {"start": now, "count": 0}
-            bucket[ip]["count"] += 1
-            if bucket[ip]["count"] > max_req:
-                return JSONResponse(status_code=429, content={"error": "Rate limit exceeded"})
-    except Exception:
-        pass
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = f"{process_time:.4f}"
-    return response
+rate_limiter = get_rate_limiter()
 
 # ================================================================================
 # CORE API ENDPOINTS
@@ -604,7 +737,7 @@ async def health_check():
             "api": "healthy",
             "fraud_detection": "active",
             "ml_model": "trained" if fraud_service.ml_detector.is_trained else "not_trained",
-            "hedera_service": "connected",
+            "hedera_service": "connected" if hedera_service.is_connected else "not_connected",
             "authentication": "active"
         },
         "version": "1.0.0",
@@ -612,9 +745,37 @@ async def health_check():
             "total_rules": len(fraud_service.rules_engine.rules),
             "historical_claims": len(fraud_service.rules_engine.historical_claims),
             "ml_features": len(fraud_service.ml_detector.feature_columns)
-        }
+        },
+        "ml_model": {
+            **fraud_service.ml_detector.get_model_info(),
+            "retraining": fraud_service.retrainer.get_status()
+        },
+        "scoring_mode": claim_scorer.mode,
+        "scoring_pool": fraud_service.scoring_executor.get_metrics(),
+        "write_behind": write_buffer.get_stats(),
+        "score_cache": score_cache.get_stats(),
+        "rate_limiter": rate_limiter.get_stats()
     }
 
+@app.get("/ready", tags=["System"])
+async def readiness_check():
+    """Readiness probe: 200 only once the model and services are warm"""
+    return warmup.readiness_response()
+
+metrics_registry = get_metrics_registry()
+log_queue_depth = metrics_registry.gauge("log_queue_depth", "Log records waiting for the log writer thread")
+log_records_dropped = metrics_registry.gauge("log_records_dropped", "Log records dropped because the log queue was full")
+
+if settings.enable_metrics:
+    @app.get(settings.metrics_endpoint, tags=["System"], include_in_schema=False)
+    async def prometheus_metrics():
+        """Process metrics in the Prometheus text exposition format"""
+        # Values owned by other components are sampled at scrape time
+        log_stats = get_log_queue_stats()
+        log_queue_depth.set(log_stats["depth"])
+        log_records_dropped.set(log_stats["dropped"])
+        return PlainTextResponse(metrics_registry.expose(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 # ================================================================================
 # FRAUD DETECTION API ENDPOINTS
 # ================================================================================
@@ -623,8 +784,7 @@ async def health_check():
 async def analyze_claim_endpoint(
     claim_data: ClaimData, 
     background_tasks: BackgroundTasks,
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: dict = Depends(get_current_user)
 ):
     """
     Analyze a claim for fraud indicators using advanced ML + rules
@@ -632,25 +792,13 @@ async def analyze_claim_endpoint(
     try:
         logger.info(f"Analyzing claim {claim_data.claim_id} for fraud by {current_user['principal_id']}")
         
-        fraud_score = await fraud_service.analyze_claim(claim_data)
+        fraud_score = await score_claim(claim_data)
         
-        # Add to historical data for future analysis
-        fraud_service.rules_engine.historical_claims.append(claim_data)
+        # Add to historical data for future analysis and retraining
+        fraud_service.record_claim(claim_data)
         
-        # Persist result
-        try:
-            db_result = FraudResult(
-                claim_id=fraud_score.claim_id,
-                score=fraud_score.score,
-                risk_level=fraud_score.risk_level,
-                flags=",".join(fraud_score.flags),
-                reasoning=fraud_score.reasoning,
-                confidence=fraud_score.confidence,
-            )
-            db.add(db_result)
-            db.commit()
-        except Exception as e:
-            logger.warning(f"Failed to persist FraudResult: {e}")
+        # Persisted by the write-behind flusher
+        write_buffer.add(FraudResult, fraud_result_row(fraud_score))
 
         return {
             "success": True,
@@ -668,28 +816,142 @@ async def analyze_claim_endpoint(
             "message": f"Claim {claim_data.claim_id} analyzed successfully"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in analyze_claim_endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Fraud analysis failed: {str(e)}")
 
+@app.post("/api/v1/fraud/analyze-claims/batch", tags=["Fraud Detection"])
+async def analyze_claims_batch_endpoint(
+    batch: BatchAnalysisRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Rescore a batch of claims with one vectorized ML pass
+    """
+    if len(batch.claims) > settings.fraud_batch_max_claims:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(batch.claims)} claims (max {settings.fraud_batch_max_claims})"
+        )
+    
+    try:
+        logger.info(f"Batch analyzing {len(batch.claims)} claims for {current_user['principal_id']}")
+        
+        await warmup.wait_for(*SCORING_COMPONENTS, timeout=settings.warmup_wait_seconds)
+        fraud_scores = await fraud_service.analyze_claims_batch(batch.claims)
+        
+        # Persisted by the write-behind flusher in bulk inserts
+        for score in fraud_scores:
+            write_buffer.add(FraudResult, fraud_result_row(score))
+        
+        risk_summary: Dict[str, int] = {}
+        for score in fraud_scores:
+            risk_summary[score.risk_level] = risk_summary.get(score.risk_level, 0) + 1
+            record_fraud_score(score.risk_level)
+        
+        return {
+            "success": True,
+            "analyzed": len(fraud_scores),
+            "risk_summary": risk_summary,
+            "results": [
+                {
+                    "claim_id": score.claim_id,
+                    "fraud_score": score.score,
+                    "risk_level": score.risk_level,
+                    "flags": score.flags,
+                    "confidence": score.confidence
+                }
+                for score in fraud_scores
+            ],
+            "analyzed_at": datetime.now().isoformat(),
+            "analyzed_by": current_user['principal_id']
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in analyze_claims_batch_endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch fraud analysis failed: {str(e)}")
+
+async def _load_claim_fraud_score(db: AsyncSession, claim_id: int) -> Optional[Dict[str, Any]]:
+    """Latest score and recent alerts for a claim (served by the claim_id/created_at indexes)"""
+    latest = await db.scalar(
+        select(FraudResult)
+        .where(FraudResult.claim_id == claim_id)
+        .order_by(FraudResult.created_at.desc())
+        .limit(1)
+    )
+    if latest is None:
+        return None
+    
+    alerts = await db.scalars(
+        select(FraudAuditLog)
+        .where(FraudAuditLog.claim_id == claim_id)
+        .order_by(FraudAuditLog.created_at.desc())
+        .limit(20)
+    )
+    return {
+        "fraud_analysis": {
+            "score": latest.score,
+            "risk_level": latest.risk_level,
+            "flagged": latest.risk_level in ALERT_RISK_LEVELS,
+            "flags": latest.flags.split(",") if latest.flags else [],
+            "reasoning": latest.reasoning,
+            "confidence": latest.confidence,
+            "analyzed_at": latest.created_at.isoformat() if latest.created_at else None
+        },
+        "alerts": [
+            {
+                "alert_type": alert.event_type,
+                "severity": alert.severity,
+                "description": alert.description,
+                "created_at": alert.created_at.isoformat() if alert.created_at else None
+            }
+            for alert in alerts
+        ]
+    }
+
+async def _load_active_fraud_alerts(db: AsyncSession) -> List[Dict[str, Any]]:
+    """Recent high/critical results (served by the partial alerts index)"""
+    since = datetime.now(timezone.utc) - timedelta(hours=settings.fraud_alerts_active_window_hours)
+    results = await db.scalars(
+        select(FraudResult)
+        .where(ALERT_RISK_FILTER, FraudResult.created_at >= since)
+        .order_by(FraudResult.created_at.desc())
+        .limit(settings.fraud_alerts_active_limit)
+    )
+    return [
+        {
+            "claim_id": result.claim_id,
+            "alert_type": "high_fraud_risk",
+            "severity": result.risk_level,
+            "fraud_score": result.score,
+            "flags": result.flags.split(",") if result.flags else [],
+            "created_at": result.created_at.isoformat() if result.created_at else None
+        }
+        for result in results
+    ]
+
 @app.get("/api/v1/fraud/claim/{claim_id}/score", tags=["Fraud Detection"])
 async def get_claim_fraud_score(
     claim_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get detailed fraud score for a specific claim"""
     try:
-        # Mock data for now
+        cached = await score_cache.get_or_load(
+            ("claim", claim_id), lambda: _load_claim_fraud_score(db, claim_id)
+        )
+        if cached is None:
+            raise HTTPException(status_code=404, detail=f"No fraud score recorded for claim {claim_id}")
+        
         return {
             "success": True,
             "claim_id": claim_id,
-            "fraud_analysis": {
-                "score": 15,
-                "risk_level": "low",
-                "flagged": False,
-                "challenge_count": 0
-            },
-            "alerts": [],
+            **cached,
             "requested_by": current_user['principal_id']
         }
         
@@ -700,15 +962,26 @@ async def get_claim_fraud_score(
         raise HTTPException(status_code=500, detail="Failed to retrieve fraud score")
 
 @app.get("/api/v1/fraud/alerts/active", tags=["Fraud Detection"])
-async def get_active_fraud_alerts(current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_active_fraud_alerts(current_user: dict = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     """Get all active fraud alerts across the system"""
     try:
-        # Mock data
-        return []
+        return await score_cache.get_or_load(ACTIVE_ALERTS_CACHE_KEY, lambda: _load_active_fraud_alerts(db))
     except Exception as e:
         logger.error(f"Error getting active alerts: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve active alerts")
 
+@app.post("/api/v1/fraud/model/rollback", tags=["Fraud Detection"])
+async def rollback_ml_model(current_user: dict = Depends(require_main_government)):
+    """Swap the ML detector back to the previously trained model version"""
+    if not fraud_service.ml_detector.rollback():
+        raise HTTPException(status_code=409, detail="No previous model version to roll back to")
+    
+    logger.warning(f"ML model rollback requested by {current_user['principal_id']}")
+    return {
+        "success": True,
+        "ml_model": fraud_service.ml_detector.get_model_info()
+    }
+
 def get_fraud_recommendations(score: FraudScore) -> List[str]:
     """Generate actionable recommendations based on fraud score"""
     recommendations = []
@@ -3,13 +3,20 @@ CorruptGuard Middleware Package
 Middleware components for request processing, validation, and logging
 """
 
-from .error_handler import ErrorHandlerMiddleware
-from .validation import RequestValidationMiddleware, RequestBodyValidationMiddleware
+from .vaiidation import (
+    RateLimitMiddleware,
+    RequestValidationMiddleware,
+    RequestBodyValidationMiddleware,
+    RequestSizeLimitMiddleware,
+)
 from .logging import RequestLoggingMiddleware
+from .stack import install_middleware
 
 __all__ = [
-    "ErrorHandlerMiddleware",
     "RequestValidationMiddleware", 
     "RequestBodyValidationMiddleware",
-    "RequestLoggingMiddleware"
+    "RequestSizeLimitMiddleware",
+    "RateLimitMiddleware",
+    "RequestLoggingMiddleware",
+    "install_middleware"
 ]
\ No newline at end of file
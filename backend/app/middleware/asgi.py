@@ -0,0 +1,53 @@
+"""
+CorruptGuard ASGI Middleware Helpers
+Shared plumbing for middleware written directly against the ASGI interface
+"""
+
+from typing import Awaitable, Callable
+
+from starlette.datastructures import MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import Message, Receive, Scope, Send
+
+ResponseStartHook = Callable[[int, MutableHeaders], Awaitable[None]]
+
+
+def on_response_start(send: Send, hook: ResponseStartHook) -> Send:
+    """
+    Wrap `send` so `hook(status_code, headers)` runs as the response starts
+
+    Headers are mutable at that point, so the hook can add to them. Body
+    messages pass straight through, which keeps streaming responses streaming.
+    """
+    async def send_wrapper(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            await hook(message["status"], MutableHeaders(scope=message))
+        await send(message)
+
+    return send_wrapper
+
+
+def replay_body(body: bytes, receive: Receive) -> Receive:
+    """A receive callable that yields an already-read body, then defers to `receive`"""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+async def send_http_exception(exc: HTTPException, scope: Scope, receive: Receive, send: Send) -> None:
+    """
+    Answer with `exc` as the app's exception handling would
+
+    Middleware sits outside FastAPI's exception handlers, so an exception it
+    raises would reach the client as a 500.
+    """
+    response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+    await response(scope, receive, send)
@@ -3,27 +3,85 @@ CorruptGuard Logging Middleware
 Request/response logging and performance monitoring
 """
 
+import logging
+import random
 import time
 import uuid
-from typing import Dict, Any
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Any, Callable, Dict, Mapping, Optional
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.utils.logging import get_logger, log_user_action, log_performance_metric
+from app.middleware.asgi import on_response_start
+from app.middleware.profiles import PROFILE_FULL, PROFILE_NONE, RouteProfiles, get_route_profiles
+from app.config.settings import get_settings
+from app.utils.logging import get_logger, log_user_action, log_performance_metric, performance_metrics_enabled
+from app.utils.metrics import http_requests_in_progress, record_http_request
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class _LazyClientInfo:
+    """Client details for a request, extracted from the headers on first use"""
+    
+    __slots__ = ("_request", "_extract", "_info")
+    
+    def __init__(self, request: Request, extract: Callable[[Request], Dict[str, Any]]):
+        self._request = request
+        self._extract = extract
+        self._info: Optional[Dict[str, Any]] = None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._info is None:
+            self._info = self._extract(self._request)
+        return self._info.get(key, default)
+
+
+class RequestLoggingMiddleware:
     """
     Request and response logging middleware
+    
+    Log records are only built when the logger is enabled for their level.
+    Successful, fast requests can be sampled with `sample_rate`; errors, slow
+    requests, sensitive endpoints and authenticated user actions are always
+    logged.
     """
     
-    async def dispatch(self, request: Request, call_next) -> Response:
+    # Endpoints whose requests are always logged, with the client address
+    SENSITIVE_PATHS = ("/auth", "/login", "/token", "/admin")
+    
+    def __init__(
+        self, 
+        app: ASGIApp, 
+        profiles: Optional[RouteProfiles] = None, 
+        sample_rate: Optional[float] = None, 
+        slow_seconds: Optional[float] = None
+    ):
+        self.app = app
+        self.profiles = profiles or get_route_profiles()
+        self.sample_rate = settings.request_log_sample_rate if sample_rate is None else sample_rate
+        self.slow_seconds = settings.request_log_slow_seconds if slow_seconds is None else slow_seconds
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Log request and response details with performance metrics
+        
+        Light-profile routes get the request ID, timing and response line but
+        not the detailed request log.
         """
         
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        profile = self.profiles.profile_for(scope["path"])
+        if profile == PROFILE_NONE:
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
+        
         # Generate unique request ID
         request_id = str(uuid.uuid4())
         
@@ -33,98 +91,118 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         # Start timing
         start_time = time.time()
         
-        # Get client information
-        client_info = self.get_client_info(request)
+        # Client details are only extracted if a record that uses them is written
+        client_info = _LazyClientInfo(request, self.get_client_info)
         
-        # Log incoming request
-        await self.log_request(request, request_id, client_info)
+        # Decided up front; a sampled-out request is still logged if it fails or is slow
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        detailed = profile == PROFILE_FULL
+        request_logged = False
         
-        try:
-            # Process the request
-            response = await call_next(request)
+        # Log incoming request
+        if detailed:
+            if sampled or self.is_sensitive(scope["path"]):
+                await self.log_request(request, request_id, client_info)
+                request_logged = True
+            await self.log_user_request(request, request_id, client_info)
+        
+        async def on_start(status_code: int, headers: MutableHeaders) -> None:
+            nonlocal request_logged
             
             # Calculate processing time
             process_time = time.time() - start_time
             
-            # Log successful response
-            await self.log_response(request, response, request_id, process_time, client_info)
+            if sampled or status_code >= 400 or process_time > self.slow_seconds:
+                if detailed and not request_logged:
+                    await self.log_request(request, request_id, client_info)
+                    request_logged = True
+                await self.log_response(request, status_code, headers, request_id, process_time, client_info)
             
             # Log performance metrics
-            log_performance_metric(
-                operation=f"{request.method} {request.url.path}",
-                duration_ms=process_time * 1000,
-                success=True,
-                details={
-                    "status_code": response.status_code,
-                    "user_agent": client_info.get("user_agent"),
-                    "client_ip": client_info.get("ip")
-                }
-            )
+            if performance_metrics_enabled():
+                log_performance_metric(
+                    operation=f"{request.method} {request.url.path}",
+                    duration_ms=process_time * 1000,
+                    success=True,
+                    details={
+                        "status_code": status_code,
+                        "user_agent": client_info.get("user_agent"),
+                        "client_ip": client_info.get("ip")
+                    }
+                )
             
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = f"{process_time:.3f}s"
-            
-            return response
+            # Add request ID to response headers; X-Process-Time is RateLimitMiddleware's
+            headers["X-Request-ID"] = request_id
+        
+        try:
+            # Process the request
+            await self.app(scope, receive, on_response_start(send, on_start))
             
         except Exception as exc:
             # Calculate processing time for failed requests
             process_time = time.time() - start_time
             
-            # Log failed request
+            # Log failed request, in full even if it was sampled out
+            if detailed and not request_logged:
+                await self.log_request(request, request_id, client_info)
             await self.log_error(request, exc, request_id, process_time, client_info)
             
             # Log performance metrics for failures
-            log_performance_metric(
-                operation=f"{request.method} {request.url.path}",
-                duration_ms=process_time * 1000,
-                success=False,
-                details={
-                    "error": str(exc),
-                    "user_agent": client_info.get("user_agent"),
-                    "client_ip": client_info.get("ip")
-                }
-            )
+            if performance_metrics_enabled():
+                log_performance_metric(
+                    operation=f"{request.method} {request.url.path}",
+                    duration_ms=process_time * 1000,
+                    success=False,
+                    details={
+                        "error": str(exc),
+                        "user_agent": client_info.get("user_agent"),
+                        "client_ip": client_info.get("ip")
+                    }
+                )
             
             # Re-raise the exception
             raise exc
     
-    async def log_request(self, request: Request, request_id: str, client_info: Dict[str, Any]) -> None:
+    def is_sensitive(self, path: str) -> bool:
+        return any(sensitive in path for sensitive in self.SENSITIVE_PATHS)
+    
+    async def log_request(self, request: Request, request_id: str, client_info: Mapping[str, Any]) -> None:
         """
         Log incoming request details
         """
         
-        # Extract user information if available
-        user_principal = request.headers.get("X-Principal-ID", "anonymous")
-        
-        # Create request log entry
-        request_log = {
-            "request_id": request_id,
-            "method": request.method,
-            "url": str(request.url),
-            "path": request.url.path,
-            "query_params": dict(request.query_params),
-            "headers": dict(request.headers),
-            "client_ip": client_info.get("ip"),
-            "user_agent": client_info.get("user_agent"),
-            "user_principal": user_principal,
-            "content_type": request.headers.get("content-type"),
-            "content_length": request.headers.get("content-length"),
-        }
+        path = request.url.path
         
         # Log sensitive endpoints with higher detail
-        sensitive_paths = ["/auth", "/login", "/token", "/admin"]
-        is_sensitive = any(path in request.url.path for path in sensitive_paths)
-        
-        if is_sensitive:
-            logger.info(f"SENSITIVE_REQUEST: {request_id} {request.method} {request.url.path} from {client_info.get('ip')}")
-        else:
-            logger.info(f"REQUEST: {request_id} {request.method} {request.url.path}")
+        if self.is_sensitive(path):
+            logger.info(f"SENSITIVE_REQUEST: {request_id} {request.method} {path} from {client_info.get('ip')}")
+        elif logger.isEnabledFor(logging.INFO):
+            logger.info(f"REQUEST: {request_id} {request.method} {path}")
         
         # Log detailed request info in debug mode
-        logger.debug(f"REQUEST_DETAILS: {request_log}")
+        if logger.isEnabledFor(logging.DEBUG):
+            request_log = {
+                "request_id": request_id,
+                "method": request.method,
+                "url": str(request.url),
+                "path": path,
+                "query_params": dict(request.query_params),
+                "headers": dict(request.headers),
+                "client_ip": client_info.get("ip"),
+                "user_agent": client_info.get("user_agent"),
+                "user_principal": request.headers.get("X-Principal-ID", "anonymous"),
+                "content_type": request.headers.get("content-type"),
+                "content_length": request.headers.get("content-length"),
+            }
+            logger.debug(f"REQUEST_DETAILS: {request_log}")
+    
+    async def log_user_request(self, request: Request, request_id: str, client_info: Mapping[str, Any]) -> None:
+        """
+        Record an authenticated request in the audit trail; never sampled
+        """
+        
+        user_principal = request.headers.get("X-Principal-ID", "anonymous")
         
-        # Log user action if authenticated
         if user_principal != "anonymous":
             log_user_action(
                 user_principal=user_principal,
@@ -140,37 +218,38 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
     async def log_response(
         self, 
         request: Request, 
-        response: Response, 
+        status_code: int, 
+        headers: MutableHeaders, 
         request_id: str, 
         process_time: float,
-        client_info: Dict[str, Any]
+        client_info: Mapping[str, Any]
     ) -> None:
         """
         Log response details and performance metrics
         """
         
-        response_log = {
-            "request_id": request_id,
-            "status_code": response.status_code,
-            "process_time": f"{process_time:.3f}s",
-            "response_headers": dict(response.headers),
-            "content_type": response.headers.get("content-type"),
-            "content_length": response.headers.get("content-length"),
-        }
-        
         # Log response based on status code
-        if response.status_code >= 500:
-            logger.error(f"RESPONSE_ERROR: {request_id} {response.status_code} {process_time:.3f}s")
-        elif response.status_code >= 400:
-            logger.warning(f"RESPONSE_CLIENT_ERROR: {request_id} {response.status_code} {process_time:.3f}s")
-        else:
-            logger.info(f"RESPONSE_SUCCESS: {request_id} {response.status_code} {process_time:.3f}s")
+        if status_code >= 500:
+            logger.error(f"RESPONSE_ERROR: {request_id} {status_code} {process_time:.3f}s")
+        elif status_code >= 400:
+            logger.warning(f"RESPONSE_CLIENT_ERROR: {request_id} {status_code} {process_time:.3f}s")
+        elif logger.isEnabledFor(logging.INFO):
+            logger.info(f"RESPONSE_SUCCESS: {request_id} {status_code} {process_time:.3f}s")
         
         # Log detailed response info in debug mode
-        logger.debug(f"RESPONSE_DETAILS: {response_log}")
+        if logger.isEnabledFor(logging.DEBUG):
+            response_log = {
+                "request_id": request_id,
+                "status_code": status_code,
+                "process_time": f"{process_time:.3f}s",
+                "response_headers": dict(headers),
+                "content_type": headers.get("content-type"),
+                "content_length": headers.get("content-length"),
+            }
+            logger.debug(f"RESPONSE_DETAILS: {response_log}")
         
         # Log slow requests
-        if process_time > 5.0:  # Requests taking more than 5 seconds
+        if process_time > self.slow_seconds:
             logger.warning(f"SLOW_REQUEST: {request_id} took {process_time:.3f}s - {request.method} {request.url.path}")
     
     async def log_error(
@@ -179,25 +258,26 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         exc: Exception, 
         request_id: str, 
         process_time: float,
-        client_info: Dict[str, Any]
+        client_info: Mapping[str, Any]
     ) -> None:
         """
         Log request errors and exceptions
         """
         
-        error_log = {
-            "request_id": request_id,
-            "error_type": type(exc).__name__,
-            "error_message": str(exc),
-            "process_time": f"{process_time:.3f}s",
-            "method": request.method,
-            "path": request.url.path,
-            "client_ip": client_info.get("ip"),
-            "user_agent": client_info.get("user_agent")
-        }
-        
         logger.error(f"REQUEST_ERROR: {request_id} {type(exc).__name__}: {str(exc)}")
-        logger.debug(f"ERROR_DETAILS: {error_log}")
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            error_log = {
+                "request_id": request_id,
+                "error_type": type(exc).__name__,
+                "error_message": str(exc),
+                "process_time": f"{process_time:.3f}s",
+                "method": request.method,
+                "path": request.url.path,
+                "client_ip": client_info.get("ip"),
+                "user_agent": client_info.get("user_agent")
+            }
+            logger.debug(f"ERROR_DETAILS: {error_log}")
     
     def get_client_info(self, request: Request) -> Dict[str, Any]:
         """
@@ -225,7 +305,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         }
 
 
-class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
+class PerformanceMonitoringMiddleware:
     """
     Performance monitoring and metrics collection middleware
     """
@@ -234,34 +314,45 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
     SLOW_REQUEST_THRESHOLD = 2.0  # seconds
     VERY_SLOW_REQUEST_THRESHOLD = 5.0  # seconds
     
-    def __init__(self, app, slow_threshold: float = None, very_slow_threshold: float = None):
-        super().__init__(app)
+    def __init__(
+        self, 
+        app: ASGIApp, 
+        slow_threshold: float = None, 
+        very_slow_threshold: float = None, 
+        profiles: Optional[RouteProfiles] = None
+    ):
+        self.app = app
+        self.profiles = profiles or get_route_profiles()
         if slow_threshold:
             self.SLOW_REQUEST_THRESHOLD = slow_threshold
         if very_slow_threshold:
             self.VERY_SLOW_REQUEST_THRESHOLD = very_slow_threshold
     
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Monitor request performance and collect metrics
         """
         
+        if scope["type"] != "http" or self.profiles.profile_for(scope["path"]) == PROFILE_NONE:
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
         start_time = time.time()
         
         # Add performance tracking to request state
         request.state.start_time = start_time
         
-        try:
-            response = await call_next(request)
-            
+        async def on_start(status_code: int, headers: MutableHeaders) -> None:
             # Calculate metrics
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = time.time() - start_time
             
             # Log performance metrics
-            await self.log_performance_metrics(request, response, duration)
-            
-            return response
+            await self.log_performance_metrics(request, status_code, headers, duration)
+        
+        http_requests_in_progress.inc()
+        try:
+            await self.app(scope, receive, on_response_start(send, on_start))
             
         except Exception as exc:
             # Log performance for failed requests
@@ -270,8 +361,16 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
             
             await self.log_error_performance(request, exc, duration)
             raise exc
+        finally:
+            http_requests_in_progress.dec()
     
-    async def log_performance_metrics(self, request: Request, response: Response, duration: float) -> None:
+    async def log_performance_metrics(
+        self, 
+        request: Request, 
+        status_code: int, 
+        headers: MutableHeaders, 
+        duration: float
+    ) -> None:
         """
         Log performance metrics for successful requests
         """
@@ -289,18 +388,22 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
             "endpoint": endpoint,
             "method": request.method,
             "path": request.url.path,
-            "status_code": response.status_code,
+            "route": self.get_route_template(request),
+            "status_code": status_code,
             "duration_ms": round(duration * 1000, 2),
             "duration_seconds": round(duration, 3),
             "timestamp": time.time(),
-            "client_ip": self.get_client_ip(request),
-            "user_agent": request.headers.get("user-agent"),
-            "content_length": response.headers.get("content-length"),
-            "content_type": response.headers.get("content-type")
         }
         
-        # Log structured metrics
-        logger.info(f"PERFORMANCE_METRICS: {metrics}")
+        # Log structured metrics; client details are only gathered if they will be written
+        if logger.isEnabledFor(logging.INFO):
+            metrics.update({
+                "client_ip": self.get_client_ip(request),
+                "user_agent": request.headers.get("user-agent"),
+                "content_length": headers.get("content-length"),
+                "content_type": headers.get("content-type")
+            })
+            logger.info(f"PERFORMANCE_METRICS: {metrics}")
         
         # Store metrics for analytics (in production, send to metrics service)
         await self.store_metrics(metrics)
@@ -316,6 +419,7 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
             "endpoint": endpoint,
             "method": request.method,
             "path": request.url.path,
+            "route": self.get_route_template(request),
             "error_type": type(exc).__name__,
             "error_message": str(exc),
             "duration_ms": round(duration * 1000, 2),
@@ -331,26 +435,30 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
     
     async def store_metrics(self, metrics: Dict[str, Any]) -> None:
         """
-        Store performance metrics (implement with your metrics service)
+        Record a finished request in the process metrics registry
         """
-        # In production, send to metrics collection service like:
-        # - Prometheus
-        # - DataDog
-        # - New Relic
-        # - CloudWatch
-        # - Custom analytics service
-        pass
+        record_http_request(
+            metrics["method"],
+            metrics["route"],
+            metrics["status_code"],
+            metrics["duration_ms"] / 1000
+        )
     
     async def store_error_metrics(self, metrics: Dict[str, Any]) -> None:
         """
-        Store error metrics (implement with your metrics service)
+        Record a request that raised; the client is answered with a 500
         """
-        # In production, send to error tracking service like:
-        # - Sentry
-        # - Rollbar
-        # - Bugsnag
-        # - Custom error tracking
-        pass
+        record_http_request(metrics["method"], metrics["route"], 500, metrics["duration_ms"] / 1000)
+    
+    def get_route_template(self, request: Request) -> str:
+        """
+        The matched route's path template, e.g. /api/v1/fraud/claim/{claim_id}/score
+        
+        Used as the metrics label instead of the raw path so the number of
+        series stays bounded by the number of routes.
+        """
+        route = request.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
     
     def get_client_ip(self, request: Request) -> str:
         """Extract client IP address from request"""
@@ -368,25 +476,34 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
         return "unknown"
 
 
-class SecurityAuditMiddleware(BaseHTTPMiddleware):
+class SecurityAuditMiddleware:
     """
     Security audit and compliance logging middleware
     """
     
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def __init__(self, app: ASGIApp, profiles: Optional[RouteProfiles] = None):
+        self.app = app
+        self.profiles = profiles or get_route_profiles()
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Audit security-relevant events and compliance
+        Audit security-relevant events and compliance on full-profile routes
         """
         
+        if scope["type"] != "http" or self.profiles.profile_for(scope["path"]) != PROFILE_FULL:
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
+        
         # Check for security-sensitive operations
         await self.audit_security_events(request)
         
-        response = await call_next(request)
-        
-        # Audit response for sensitive data
-        await self.audit_response_security(request, response)
+        async def on_start(status_code: int, headers: MutableHeaders) -> None:
+            # Audit response for sensitive data
+            await self.audit_response_security(request, status_code, headers)
         
-        return response
+        await self.app(scope, receive, on_response_start(send, on_start))
     
     async def audit_security_events(self, request: Request) -> None:
         """
@@ -423,15 +540,15 @@ class SecurityAuditMiddleware(BaseHTTPMiddleware):
             # Log to audit trail (in production, send to SIEM system)
             await self.log_audit_event(audit_log)
     
-    async def audit_response_security(self, request: Request, response: Response) -> None:
+    async def audit_response_security(self, request: Request, status_code: int, headers: MutableHeaders) -> None:
         """
         Audit response for security compliance
         """
         
         # Check for potential data exposure
-        content_type = response.headers.get("content-type", "")
+        content_type = headers.get("content-type", "")
         
-        if "application/json" in content_type and response.status_code == 200:
+        if "application/json" in content_type and status_code == 200:
             # Log successful data access for audit trail
             user_principal = request.headers.get("X-Principal-ID", "anonymous")
             
@@ -441,7 +558,7 @@ class SecurityAuditMiddleware(BaseHTTPMiddleware):
                     "endpoint": request.url.path,
                     "method": request.method,
                     "user_principal": user_principal,
-                    "status_code": response.status_code,
+                    "status_code": status_code,
                     "timestamp": time.time()
                 }
                 
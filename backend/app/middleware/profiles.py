@@ -0,0 +1,77 @@
+"""
+CorruptGuard Middleware Profiles
+Per-route choice of how much validation, logging and auditing a request gets
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.utils.exceptions import ConfigurationError
+
+# Security pattern scan, body validation, detailed logging and audit
+PROFILE_FULL = "full"
+# Header, size and rate-limit checks plus summary logging; no content scans or audit
+PROFILE_LIGHT = "light"
+# Middleware steps aside entirely
+PROFILE_NONE = "none"
+
+MIDDLEWARE_PROFILES = (PROFILE_FULL, PROFILE_LIGHT, PROFILE_NONE)
+
+
+class RouteProfiles:
+    """
+    Path → middleware profile lookup
+
+    Rules map path prefixes to profiles; the longest matching prefix wins and a
+    prefix only matches whole path segments. `resolve()` turns the rules into an
+    exact-path table for every static route once at startup, so most requests
+    cost one dictionary lookup. Paths with parameters fall back to the rules.
+    """
+
+    def __init__(self, rules: Dict[str, str], default: str = PROFILE_FULL):
+        for prefix, profile in {**rules, "<default>": default}.items():
+            if profile not in MIDDLEWARE_PROFILES:
+                raise ConfigurationError(
+                    f"Unknown middleware profile {profile!r} for {prefix}; expected one of {MIDDLEWARE_PROFILES}"
+                )
+        self.default = default
+        self._rules: List[Tuple[str, str]] = sorted(
+            ((prefix.rstrip("/") or "/", profile) for prefix, profile in rules.items()),
+            key=lambda rule: len(rule[0]),
+            reverse=True,
+        )
+        self._table: Dict[str, str] = {}
+
+    def match(self, path: str) -> str:
+        """Profile for `path` from the prefix rules"""
+        for prefix, profile in self._rules:
+            if path == prefix or path.startswith(prefix + "/") or prefix == "/":
+                return profile
+        return self.default
+
+    def resolve(self, routes: Iterable) -> Dict[str, str]:
+        """Precompute the profile of every static route path"""
+        table = {}
+        for route in routes:
+            path = getattr(route, "path", None)
+            if path and "{" not in path:
+                table[path] = self.match(path)
+        self._table = table
+        return dict(table)
+
+    def profile_for(self, path: str) -> str:
+        profile = self._table.get(path)
+        return profile if profile is not None else self.match(path)
+
+
+_route_profiles: Optional[RouteProfiles] = None
+
+
+def get_route_profiles() -> RouteProfiles:
+    """Process-wide route profiles configured from settings"""
+    global _route_profiles
+    if _route_profiles is None:
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        _route_profiles = RouteProfiles(settings.middleware_route_profiles, settings.middleware_default_profile)
+    return _route_profiles
@@ -0,0 +1,65 @@
+"""
+CorruptGuard Middleware Stack
+The application's middleware in the order it is mounted, kept in one place so
+tests exercise the same stack as production
+"""
+
+from typing import Awaitable, Callable, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+
+from app.config.settings import get_settings
+from app.middleware.logging import PerformanceMonitoringMiddleware, RequestLoggingMiddleware, SecurityAuditMiddleware
+from app.middleware.vaiidation import (
+    RateLimitMiddleware,
+    RequestBodyValidationMiddleware,
+    RequestSizeLimitMiddleware,
+    RequestValidationMiddleware,
+)
+
+settings = get_settings()
+
+
+def install_middleware(
+    app: FastAPI,
+    principal_resolver: Optional[Callable[[Request], Awaitable[Optional[str]]]] = None,
+    authentication_middleware: Optional[type] = None,
+) -> None:
+    """
+    Mount the request middleware on `app`, innermost first
+
+    `principal_resolver` feeds per-principal rate limits and
+    `authentication_middleware` is mounted between CORS and rate limiting;
+    both come from app.auth, which the caller imports.
+    """
+    app.add_middleware(
+        TrustedHostMiddleware,
+        allowed_hosts=settings.ALLOWED_HOSTS
+    )
+
+    # Validation, audit and logging, each scaled to the route's profile (innermost first)
+    app.add_middleware(RequestBodyValidationMiddleware)
+    # Per-IP limits are applied, with per-principal ones, by RateLimitMiddleware below
+    app.add_middleware(RequestValidationMiddleware, rate_limit=False)
+    app.add_middleware(SecurityAuditMiddleware)
+    app.add_middleware(PerformanceMonitoringMiddleware)
+    app.add_middleware(RequestLoggingMiddleware)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=settings.cors_allow_credentials,
+        allow_methods=settings.cors_allow_methods,
+        allow_headers=settings.cors_allow_headers,
+    )
+
+    if authentication_middleware is not None:
+        app.add_middleware(authentication_middleware)
+
+    # Per-IP and per-principal rate limiting; stamps X-Process-Time for the whole stack
+    app.add_middleware(RateLimitMiddleware, principal_resolver=principal_resolver)
+
+    # Added last so it runs first: oversize bodies are cut off before anything buffers them
+    app.add_middleware(RequestSizeLimitMiddleware)
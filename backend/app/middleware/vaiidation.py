@@ -5,18 +5,54 @@ Enhanced request validation and sanitization
 
 import re
 import json
-from typing import Any, Dict, List, Optional
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.utils.exceptions import ValidationError
+from app.config.settings import get_settings
+from app.middleware.asgi import on_response_start, replay_body, send_http_exception
+from app.middleware.profiles import PROFILE_FULL, PROFILE_NONE, RouteProfiles, get_route_profiles
+from app.utils.exceptions import CorruptGuardException, PayloadTooLargeError, RateLimitError, ValidationError
 from app.utils.logging import get_logger, log_security_event
+from app.utils.rate_limit import get_rate_limiter
+from app.utils.request_body import get_json_body
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
+class SecurityPatternMatcher:
+    """
+    Security patterns compiled once, behind a cheap prefilter
+
+    The prefilter is a single regex of the characters and keywords that every
+    pattern needs in order to match. Clean input, which is almost all traffic,
+    is rejected by that one pass; only input that hits the prefilter runs the
+    confirmatory patterns, in their declared order.
+    """
+    
+    def __init__(self, patterns: Dict[str, List[str]], prefilter: Optional[str] = None):
+        self._patterns = [
+            (threat_type, pattern, re.compile(pattern, re.IGNORECASE))
+            for threat_type, threat_patterns in patterns.items()
+            for pattern in threat_patterns
+        ]
+        self._prefilter = re.compile(prefilter, re.IGNORECASE) if prefilter else None
+    
+    def search(self, value: str) -> Optional[Tuple[str, str]]:
+        """(threat_type, pattern) of the first pattern matching `value`, or None"""
+        if self._prefilter is not None and not self._prefilter.search(value):
+            return None
+        for threat_type, pattern, regex in self._patterns:
+            if regex.search(value):
+                return threat_type, pattern
+        return None
+
+
+class RequestValidationMiddleware:
     """
     Request validation and sanitization middleware
     """
@@ -40,85 +76,118 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
             r'%2e%2e%2f|%2e%2e/',
             r'\.\.\\|\.\.%5c',
         ],
+        # Shell syntax, not bare metacharacters or words: "Smith & Sons",
+        # "a|b" and an "id" field are ordinary input
         'command_injection': [
-            r'[;&|`$]',
-            r'\b(cat|ls|pwd|whoami|id|ps|kill)\b',
+            r'`[^`]*`',
+            r'\$\([^)]*\)|\$\{[^}]*\}',
+            r'(;|&&|\|\|?)\s*(cat|ls|pwd|whoami|id|ps|kill|rm|sh|bash|curl|wget|nc)\b',
             r'>[>\s]*(/dev/null|/tmp)',
         ]
     }
     
+    # Something every pattern above needs in order to match; keep in sync
+    SECURITY_PREFILTER = (
+        r'[;&|`$\'"<>]|\.\.|%2e%2e|javascript:|on(load|error|click|mouseover)'
+        r'|\b(union|drop|delete|insert|update)\b'
+    )
+    
     # Suspicious user agents
     SUSPICIOUS_USER_AGENTS = [
         'sqlmap', 'nikto', 'nmap', 'dirb', 'burpsuite',
         'metasploit', 'havij', 'w3af', 'acunetix'
     ]
     
-    # Rate limiting (simple in-memory implementation)
-    request_counts = {}
+    # Compiled once at import; clean input is cleared in one pass
+    security_matcher = SecurityPatternMatcher(SECURITY_PATTERNS, SECURITY_PREFILTER)
+    suspicious_agent_regex = re.compile("|".join(map(re.escape, SUSPICIOUS_USER_AGENTS)), re.IGNORECASE)
     
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def __init__(self, app: ASGIApp, profiles: Optional[RouteProfiles] = None, rate_limit: bool = True):
+        self.app = app
+        self.profiles = profiles or get_route_profiles()
+        # Off when the app already rate-limits per IP, so requests are not counted twice
+        self.rate_limit = rate_limit
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Validate and sanitize incoming requests
-        """
         
-        # Perform security validations
-        await self.validate_request_security(request)
+        Light-profile routes skip the user agent and URL pattern scans; routes
+        with no profile are not touched.
+        """
         
-        # Validate content type for POST/PUT requests
-        if request.method in ["POST", "PUT", "PATCH"]:
-            await self.validate_content_type(request)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Validate request size
-        await self.validate_request_size(request)
+        profile = self.profiles.profile_for(scope["path"])
+        if profile == PROFILE_NONE:
+            await self.app(scope, receive, send)
+            return
         
-        # Check rate limiting
-        await self.check_rate_limiting(request)
+        request = Request(scope)
         
-        # Process the request
-        response = await call_next(request)
+        try:
+            # Perform security validations
+            if profile == PROFILE_FULL:
+                await self.validate_request_security(request)
+            else:
+                await self.validate_headers(request)
+            
+            # Validate content type for POST/PUT requests
+            if request.method in ["POST", "PUT", "PATCH"]:
+                await self.validate_content_type(request)
+            
+            # Validate request size
+            await self.validate_request_size(request)
+            
+            # Check rate limiting
+            if self.rate_limit:
+                await self.check_rate_limiting(request)
+        except CorruptGuardException as exc:
+            await send_http_exception(exc, scope, receive, send)
+            return
         
-        # Add security headers to response
-        self.add_security_headers(response)
+        async def on_start(status_code: int, headers: MutableHeaders) -> None:
+            # Add security headers to response
+            self.add_security_headers(headers)
         
-        return response
+        # Process the request
+        await self.app(scope, receive, on_response_start(send, on_start))
     
-    async def validate_email(email: str) -> bool:
-    """
-    Validate email format
-    """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}request_security(self, request: Request) -> None:
+    async def validate_request_security(self, request: Request) -> None:
         """
         Validate request for security threats
         """
         
-        client_ip = self.get_client_ip(request)
-        user_agent = request.headers.get("user-agent", "").lower()
+        user_agent = request.headers.get("user-agent", "")
         
         # Check for suspicious user agents
-        for suspicious_agent in self.SUSPICIOUS_USER_AGENTS:
-            if suspicious_agent in user_agent:
-                log_security_event(
-                    event_type="SUSPICIOUS_USER_AGENT",
-                    description=f"Suspicious user agent detected: {user_agent}",
-                    client_ip=client_ip,
-                    severity="high"
-                )
-                raise ValidationError("Invalid user agent")
-        
-        # Check URL path for malicious patterns
-        path = str(request.url.path)
-        query = str(request.url.query) if request.url.query else ""
-        
-        for threat_type, patterns in self.SECURITY_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, path + query, re.IGNORECASE):
-                    log_security_event(
-                        event_type=f"SECURITY_THREAT_{threat_type.upper()}",
-                        description=f"Malicious pattern detected in URL: {pattern}",
-                        client_ip=client_ip,
-                        severity="critical"
-                    )
-                    raise ValidationError(f"Invalid request: security violation detected")
+        if self.suspicious_agent_regex.search(user_agent):
+            log_security_event(
+                event_type="SUSPICIOUS_USER_AGENT",
+                description=f"Suspicious user agent detected: {user_agent.lower()}",
+                client_ip=self.get_client_ip(request),
+                severity="high"
+            )
+            raise ValidationError("Invalid user agent")
+        
+        # Check the path and each decoded query name and value; the raw query
+        # string would flag the "&" between parameters
+        threat = self.security_matcher.search(request.url.path)
+        for key, value in request.query_params.multi_items():
+            if threat:
+                break
+            threat = self.security_matcher.search(key) or self.security_matcher.search(value)
+        if threat:
+            threat_type, pattern = threat
+            log_security_event(
+                event_type=f"SECURITY_THREAT_{threat_type.upper()}",
+                description=f"Malicious pattern detected in URL: {pattern}",
+                client_ip=self.get_client_ip(request),
+                severity="critical"
+            )
+            raise ValidationError(f"Invalid request: security violation detected")
         
         # Validate headers
         await self.validate_headers(request)
@@ -129,14 +198,21 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
         """
         
         headers = request.headers
-        client_ip = self.get_client_ip(request)
         
-        # Check for oversized headers
+        # Check for oversized headers and header injection in one pass
         for name, value in headers.items():
             if len(name) > 100:
                 raise ValidationError(f"Header name too long: {name[:50]}...")
             if len(value) > 8192:  # 8KB limit
                 raise ValidationError(f"Header value too long: {name}")
+            if '\n' in value or '\r' in value:
+                log_security_event(
+                    event_type="HEADER_INJECTION",
+                    description=f"Header injection attempt in {name}",
+                    client_ip=self.get_client_ip(request),
+                    severity="high"
+                )
+                raise ValidationError("Invalid header format")
         
         # Validate Content-Length
         content_length = headers.get("content-length")
@@ -147,17 +223,6 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
                     raise ValidationError("Request body too large")
             except ValueError:
                 raise ValidationError("Invalid Content-Length header")
-        
-        # Check for potential header injection
-        for name, value in headers.items():
-            if '\n' in value or '\r' in value:
-                log_security_event(
-                    event_type="HEADER_INJECTION",
-                    description=f"Header injection attempt in {name}",
-                    client_ip=client_ip,
-                    severity="high"
-                )
-                raise ValidationError("Invalid header format")
     
     async def validate_content_type(self, request: Request) -> None:
         """
@@ -200,43 +265,22 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
     
     async def check_rate_limiting(self, request: Request) -> None:
         """
-        Simple rate limiting check
+        Per-IP rate limiting check against the shared limiter
         """
         
         client_ip = self.get_client_ip(request)
+        result = await get_rate_limiter().hit(f"ip:{client_ip}", settings.rate_limit_requests)
         
-        # Simple rate limiting (in production, use Redis or similar)
-        from datetime import datetime, timedelta
-        
-        now = datetime.utcnow()
-        window_start = now - timedelta(minutes=1)
-        
-        # Clean old entries
-        self.request_counts = {
-            ip: [(timestamp, count) for timestamp, count in requests 
-                 if timestamp > window_start]
-            for ip, requests in self.request_counts.items()
-        }
-        
-        # Count requests for this IP
-        if client_ip not in self.request_counts:
-            self.request_counts[client_ip] = []
-        
-        self.request_counts[client_ip].append((now, 1))
-        
-        # Check if rate limit exceeded
-        total_requests = sum(count for _, count in self.request_counts[client_ip])
-        
-        if total_requests > 100:  # 100 requests per minute
+        if not result.allowed:
             log_security_event(
                 event_type="RATE_LIMIT_EXCEEDED",
-                description=f"Rate limit exceeded: {total_requests} requests",
+                description=f"Rate limit exceeded: {settings.rate_limit_requests} requests per {settings.rate_limit_window}s",
                 client_ip=client_ip,
                 severity="medium"
             )
-            raise ValidationError("Rate limit exceeded. Please try again later.")
+            raise RateLimitError("Rate limit exceeded. Please try again later.", headers=result.headers())
     
-    def add_security_headers(self, response: Response) -> None:
+    def add_security_headers(self, headers: MutableHeaders) -> None:
         """
         Add security headers to response
         """
@@ -253,7 +297,7 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
         }
         
         for header, value in security_headers.items():
-            response.headers[header] = value
+            headers[header] = value
     
     def get_client_ip(self, request: Request) -> str:
         """
@@ -276,20 +320,44 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
         return "unknown"
 
 
-class RequestBodyValidationMiddleware(BaseHTTPMiddleware):
+class RequestBodyValidationMiddleware:
     """
     Request body validation middleware
     """
     
-    async def dispatch(self, request: Request, call_next) -> Response:
+    MAX_JSON_DEPTH = 32  # nested objects/arrays
+    MAX_JSON_VALUES = 100_000  # strings, numbers, objects and arrays in one body
+    
+    def __init__(self, app: ASGIApp, profiles: Optional[RouteProfiles] = None):
+        self.app = app
+        self.profiles = profiles or get_route_profiles()
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Validate request body content
+        Validate request body content on full-profile routes
+        
+        A body read for validation is replayed to the app through a wrapped
+        receive; bodies that are not inspected stream through untouched.
         """
         
+        if scope["type"] != "http" or self.profiles.profile_for(scope["path"]) != PROFILE_FULL:
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope, receive)
+        
         if request.method in ["POST", "PUT", "PATCH"]:
-            await self.validate_request_body(request)
+            try:
+                await self.validate_request_body(request)
+            except CorruptGuardException as exc:
+                await send_http_exception(exc, scope, receive, send)
+                return
+            
+            body = getattr(request.state, "raw_body", None)
+            if body is not None:
+                receive = replay_body(body, receive)
         
-        return await call_next(request)
+        await self.app(scope, receive, send)
     
     async def validate_request_body(self, request: Request) -> None:
         """
@@ -306,21 +374,28 @@ class RequestBodyValidationMiddleware(BaseHTTPMiddleware):
     async def validate_json_body(self, request: Request) -> None:
         """
         Validate JSON request body
+        
+        The parsed body is cached on request.state, so the endpoint (through
+        ParsedBodyRoute) does not decode it a second time.
         """
         
         try:
             # Try to read and parse the body
             body = await request.body()
+            request.state.raw_body = body
             
             if len(body) > 1024 * 1024:  # 1MB limit for JSON
                 raise ValidationError("JSON body too large")
             
             if body:
                 try:
-                    json_data = json.loads(body)
-                    await self.validate_json_content(json_data, request)
+                    json_data = await get_json_body(request)
                 except json.JSONDecodeError as e:
                     raise ValidationError(f"Invalid JSON format: {str(e)}")
+                except RecursionError:
+                    raise ValidationError("JSON nesting too deep")
+                
+                await self.validate_json_content(json_data, request)
         
         except Exception as e:
             if isinstance(e, ValidationError):
@@ -330,43 +405,60 @@ class RequestBodyValidationMiddleware(BaseHTTPMiddleware):
     async def validate_json_content(self, data: Any, request: Request) -> None:
         """
         Validate JSON content for security threats
+        
+        Walks the tree with an explicit stack, bounded in depth and in total
+        values visited, so hostile nesting cannot exhaust the Python stack.
         """
         
-        def check_value(value: Any, path: str = "") -> None:
+        matcher = RequestValidationMiddleware.security_matcher
+        visited = 0
+        # (value, path, depth); children are pushed in reverse to keep document order
+        stack = [(data, "", 0)]
+        
+        while stack:
+            value, path, depth = stack.pop()
+            
+            visited += 1
+            if visited > self.MAX_JSON_VALUES:
+                raise ValidationError("Too many values in JSON body")
+            
             if isinstance(value, str):
                 # Check for malicious patterns in string values
-                for threat_type, patterns in RequestValidationMiddleware.SECURITY_PATTERNS.items():
-                    for pattern in patterns:
-                        if re.search(pattern, value, re.IGNORECASE):
-                            log_security_event(
-                                event_type=f"JSON_THREAT_{threat_type.upper()}",
-                                description=f"Malicious pattern in JSON at {path}: {pattern}",
-                                client_ip=self.get_client_ip(request),
-                                severity="high"
-                            )
-                            raise ValidationError(f"Invalid content in field: {path}")
+                threat = matcher.search(value)
+                if threat:
+                    threat_type, pattern = threat
+                    log_security_event(
+                        event_type=f"JSON_THREAT_{threat_type.upper()}",
+                        description=f"Malicious pattern in JSON at {path}: {pattern}",
+                        client_ip=self.get_client_ip(request),
+                        severity="high"
+                    )
+                    raise ValidationError(f"Invalid content in field: {path}")
                 
                 # Check string length
                 if len(value) > 10000:  # 10KB string limit
                     raise ValidationError(f"String too long in field: {path}")
             
             elif isinstance(value, dict):
+                if depth >= self.MAX_JSON_DEPTH:
+                    raise ValidationError(f"JSON nesting too deep at: {path}")
                 if len(value) > 100:  # Max 100 keys per object
                     raise ValidationError(f"Too many keys in object: {path}")
                 
-                for key, val in value.items():
+                for key in value:
                     if len(str(key)) > 100:  # Max key length
                         raise ValidationError(f"Key too long: {path}.{str(key)[:50]}...")
-                    check_value(val, f"{path}.{key}" if path else key)
+                for key, val in reversed(value.items()):
+                    stack.append((val, f"{path}.{key}" if path else key, depth + 1))
             
             elif isinstance(value, list):
+                if depth >= self.MAX_JSON_DEPTH:
+                    raise ValidationError(f"JSON nesting too deep at: {path}")
                 if len(value) > 1000:  # Max 1000 items per array
                     raise ValidationError(f"Array too long: {path}")
                 
-                for i, item in enumerate(value):
-                    check_value(item, f"{path}[{i}]")
-        
-        check_value(data)
+                for i in range(len(value) - 1, -1, -1):
+                    stack.append((value[i], f"{path}[{i}]", depth + 1))
     
     async def validate_multipart_body(self, request: Request) -> None:
         """
@@ -399,6 +491,165 @@ class RequestBodyValidationMiddleware(BaseHTTPMiddleware):
         return "unknown"
 
 
+class RateLimitMiddleware:
+    """
+    Per-IP and per-principal sliding-window rate limiting for every request
+    
+    Registered near the outside of the stack, so the X-Process-Time it stamps
+    on each response covers the middleware inside it as well as the endpoint;
+    it is the only middleware that sets that header. `principal_resolver` maps
+    a request to its authenticated principal, or None; without one only the
+    per-IP limit applies. The IP is the socket peer unless
+    `trust_forwarded_for` (default: settings.rate_limit_trust_forwarded_for)
+    says a proxy's X-Forwarded-For can be believed.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        principal_resolver: Optional[Callable[[Request], Awaitable[Optional[str]]]] = None,
+        enabled: Optional[bool] = None,
+        trust_forwarded_for: Optional[bool] = None
+    ):
+        self.app = app
+        self.principal_resolver = principal_resolver
+        self.enabled = settings.rate_limit_enabled if enabled is None else enabled
+        self.trust_forwarded_for = (
+            settings.rate_limit_trust_forwarded_for if trust_forwarded_for is None else trust_forwarded_for
+        )
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.time()
+        if self.enabled:
+            request = Request(scope)
+            principal_id = await self.principal_resolver(request) if self.principal_resolver else None
+            result = await get_rate_limiter().check(
+                self.get_client_ip(request),
+                settings.rate_limit_requests,
+                principal_id=principal_id,
+                principal_limit=settings.rate_limit_principal_requests
+            )
+            if not result.allowed:
+                response = JSONResponse(status_code=429, content={"error": "Rate limit exceeded"}, headers=result.headers())
+                await response(scope, receive, send)
+                return
+        
+        async def on_start(status_code: int, headers: MutableHeaders) -> None:
+            headers["X-Process-Time"] = f"{time.time() - start_time:.4f}"
+        
+        await self.app(scope, receive, on_response_start(send, on_start))
+    
+    def get_client_ip(self, request: Request) -> str:
+        """Address the per-IP limit is keyed on"""
+        if self.trust_forwarded_for:
+            forwarded_for = request.headers.get("x-forwarded-for")
+            if forwarded_for:
+                return forwarded_for.split(",")[0].strip()
+            
+            real_ip = request.headers.get("x-real-ip")
+            if real_ip:
+                return real_ip
+        
+        if request.client:
+            return request.client.host
+        
+        return "unknown"
+
+
+class RequestSizeLimitMiddleware:
+    """
+    Per-route request body limits enforced while the body streams in
+    
+    A declared Content-Length over the limit is refused before anything is
+    read. Otherwise bytes are counted as they arrive from the ASGI receive
+    stream, so chunked and mislabelled bodies are cut off at the limit rather
+    than buffered: the client gets 413 at once and the app sees a disconnect.
+    """
+    
+    def __init__(
+        self, 
+        app: ASGIApp, 
+        default_limit: Optional[int] = None, 
+        route_limits: Optional[Dict[str, int]] = None
+    ):
+        self.app = app
+        self.default_limit = settings.max_request_body_size if default_limit is None else default_limit
+        route_limits = settings.request_size_limits if route_limits is None else route_limits
+        # Longest prefix first, so a specific route overrides its parent
+        self.route_limits = sorted(route_limits.items(), key=lambda item: len(item[0]), reverse=True)
+    
+    def limit_for(self, path: str) -> int:
+        """Byte limit for a request path; prefixes match whole path segments"""
+        for prefix, limit in self.route_limits:
+            if path == prefix or path.startswith(prefix + "/") or prefix == "/":
+                return limit
+        return self.default_limit
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            await self.app(scope, receive, send)
+            return
+        
+        limit = self.limit_for(scope["path"])
+        
+        # Refuse a declared oversize body without reading it; malformed values
+        # are left to RequestValidationMiddleware
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            await self.reject(scope, receive, send, limit)
+            return
+        
+        received = 0
+        rejected = False
+        response_started = False
+        
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    rejected = True
+                    if not response_started:
+                        await self.reject(scope, receive, send, limit)
+                    return {"type": "http.disconnect"}
+            return message
+        
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if rejected:
+                return  # the 413 has already been sent
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception as e:
+            if not rejected:
+                raise
+            # The app failed on the disconnect it was handed after the 413
+            logger.debug(f"Request aborted after exceeding size limit: {type(e).__name__}")
+    
+    async def reject(self, scope: Scope, receive: Receive, send: Send, limit: int) -> None:
+        """Send a 413 response for a body over `limit`"""
+        client = scope.get("client")
+        logger.warning(
+            f"REQUEST_TOO_LARGE: {scope['method']} {scope['path']} over {limit} bytes "
+            f"from {client[0] if client else 'unknown'}"
+        )
+        error = PayloadTooLargeError(limit)
+        error.headers = {"Connection": "close"}
+        await send_http_exception(error, scope, receive, send)
+
+
 # Validation utility functions
 def sanitize_string(value: str, max_length: int = 1000) -> str:
     """
@@ -417,7 +668,11 @@ def sanitize_string(value: str, max_length: int = 1000) -> str:
     return value.strip()
 
 
-def validate_
+def validate_email(email: str) -> bool:
+    """
+    Validate email format
+    """
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return bool(re.match(pattern, email))
 
 
@@ -426,347 +681,16 @@ def validate_phone(phone: str) -> bool:
     Validate phone number format
     """
     # Basic phone validation (can be enhanced)
-    pattern = r'^\+?[\d\s\-\(\)]{10,15}request_security(self, request: Request) -> None:
-        """
-        Validate request for security threats
-        """
-        
-        client_ip = self.get_client_ip(request)
-        user_agent = request.headers.get("user-agent", "").lower()
-        
-        # Check for suspicious user agents
-        for suspicious_agent in self.SUSPICIOUS_USER_AGENTS:
-            if suspicious_agent in user_agent:
-                log_security_event(
-                    event_type="SUSPICIOUS_USER_AGENT",
-                    description=f"Suspicious user agent detected: {user_agent}",
-                    client_ip=client_ip,
-                    severity="high"
-                )
-                raise ValidationError("Invalid user agent")
-        
-        # Check URL path for malicious patterns
-        path = str(request.url.path)
-        query = str(request.url.query) if request.url.query else ""
-        
-        for threat_type, patterns in self.SECURITY_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, path + query, re.IGNORECASE):
-                    log_security_event(
-                        event_type=f"SECURITY_THREAT_{threat_type.upper()}",
-                        description=f"Malicious pattern detected in URL: {pattern}",
-                        client_ip=client_ip,
-                        severity="critical"
-                    )
-                    raise ValidationError(f"Invalid request: security violation detected")
-        
-        # Validate headers
-        await self.validate_headers(request)
-    
-    async def validate_headers(self, request: Request) -> None:
-        """
-        Validate request headers
-        """
-        
-        headers = request.headers
-        client_ip = self.get_client_ip(request)
-        
-        # Check for oversized headers
-        for name, value in headers.items():
-            if len(name) > 100:
-                raise ValidationError(f"Header name too long: {name[:50]}...")
-            if len(value) > 8192:  # 8KB limit
-                raise ValidationError(f"Header value too long: {name}")
-        
-        # Validate Content-Length
-        content_length = headers.get("content-length")
-        if content_length:
-            try:
-                length = int(content_length)
-                if length > 10 * 1024 * 1024:  # 10MB limit
-                    raise ValidationError("Request body too large")
-            except ValueError:
-                raise ValidationError("Invalid Content-Length header")
-        
-        # Check for potential header injection
-        for name, value in headers.items():
-            if '\n' in value or '\r' in value:
-                log_security_event(
-                    event_type="HEADER_INJECTION",
-                    description=f"Header injection attempt in {name}",
-                    client_ip=client_ip,
-                    severity="high"
-                )
-                raise ValidationError("Invalid header format")
-    
-    async def validate_content_type(self, request: Request) -> None:
-        """
-        Validate content type for requests with body
-        """
-        
-        content_type = request.headers.get("content-type", "")
-        
-        # List of allowed content types
-        allowed_types = [
-            "application/json",
-            "application/x-www-form-urlencoded",
-            "multipart/form-data",
-            "text/plain"
-        ]
-        
-        # Check if content type is allowed
-        if not any(allowed in content_type for allowed in allowed_types):
-            raise ValidationError(f"Unsupported content type: {content_type}")
-    
-    async def validate_request_size(self, request: Request) -> None:
-        """
-        Validate request size limits
-        """
-        
-        # Check URL length
-        if len(str(request.url)) > 2048:  # 2KB URL limit
-            raise ValidationError("URL too long")
-        
-        # Check query parameter count
-        if len(request.query_params) > 50:
-            raise ValidationError("Too many query parameters")
-        
-        # Validate individual query parameters
-        for key, value in request.query_params.items():
-            if len(key) > 100:
-                raise ValidationError(f"Query parameter name too long: {key[:50]}...")
-            if len(value) > 1000:
-                raise ValidationError(f"Query parameter value too long: {key}")
-    
-    async def check_rate_limiting(self, request: Request) -> None:
-        """
-        Simple rate limiting check
-        """
-        
-        client_ip = self.get_client_ip(request)
-        
-        # Simple rate limiting (in production, use Redis or similar)
-        from datetime import datetime, timedelta
-        
-        now = datetime.utcnow()
-        window_start = now - timedelta(minutes=1)
-        
-        # Clean old entries
-        self.request_counts = {
-            ip: [(timestamp, count) for timestamp, count in requests 
-                 if timestamp > window_start]
-            for ip, requests in self.request_counts.items()
-        }
-        
-        # Count requests for this IP
-        if client_ip not in self.request_counts:
-            self.request_counts[client_ip] = []
-        
-        self.request_counts[client_ip].append((now, 1))
-        
-        # Check if rate limit exceeded
-        total_requests = sum(count for _, count in self.request_counts[client_ip])
-        
-        if total_requests > 100:  # 100 requests per minute
-            log_security_event(
-                event_type="RATE_LIMIT_EXCEEDED",
-                description=f"Rate limit exceeded: {total_requests} requests",
-                client_ip=client_ip,
-                severity="medium"
-            )
-            raise ValidationError("Rate limit exceeded. Please try again later.")
-    
-    def add_security_headers(self, response: Response) -> None:
-        """
-        Add security headers to response
-        """
-        
-        security_headers = {
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "X-XSS-Protection": "1; mode=block",
-            "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
-            "Content-Security-Policy": "default-src 'self'",
-            "Referrer-Policy": "strict-origin-when-cross-origin",
-            "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
-            "X-Permitted-Cross-Domain-Policies": "none"
-        }
-        
-        for header, value in security_headers.items():
-            response.headers[header] = value
-    
-    def get_client_ip(self, request: Request) -> str:
-        """
-        Extract client IP address from request
-        """
-        # Check for forwarded IP first
-        forwarded_for = request.headers.get("x-forwarded-for")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        # Check for real IP
-        real_ip = request.headers.get("x-real-ip")
-        if real_ip:
-            return real_ip
-        
-        # Fall back to client host
-        if request.client:
-            return request.client.host
-        
-        return "unknown"
+    pattern = r'^\+?[\d\s\-\(\)]{10,15}$'
+    return bool(re.match(pattern, phone))
 
 
-class RequestBodyValidationMiddleware(BaseHTTPMiddleware):
+def validate_principal_id_format(principal_id: str) -> bool:
     """
-    Request body validation middleware
+    Validate ICP Principal ID format
     """
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """
-        Validate request body content
-        """
-        
-        if request.method in ["POST", "PUT", "PATCH"]:
-            await self.validate_request_body(request)
-        
-        return await call_next(request)
-    
-    async def validate_request_body(self, request: Request) -> None:
-        """
-        Validate request body for security and format
-        """
-        
-        content_type = request.headers.get("content-type", "")
-        
-        if "application/json" in content_type:
-            await self.validate_json_body(request)
-        elif "multipart/form-data" in content_type:
-            await self.validate_multipart_body(request)
-    
-    async def validate_json_body(self, request: Request) -> None:
-        """
-        Validate JSON request body
-        """
-        
-        try:
-            # Try to read and parse the body
-            body = await request.body()
-            
-            if len(body) > 1024 * 1024:  # 1MB limit for JSON
-                raise ValidationError("JSON body too large")
-            
-            if body:
-                try:
-                    json_data = json.loads(body)
-                    await self.validate_json_content(json_data, request)
-                except json.JSONDecodeError as e:
-                    raise ValidationError(f"Invalid JSON format: {str(e)}")
-        
-        except Exception as e:
-            if isinstance(e, ValidationError):
-                raise
-            logger.error(f"Error validating JSON body: {str(e)}")
-    
-    async def validate_json_content(self, data: Any, request: Request) -> None:
-        """
-        Validate JSON content for security threats
-        """
-        
-        def check_value(value: Any, path: str = "") -> None:
-            if isinstance(value, str):
-                # Check for malicious patterns in string values
-                for threat_type, patterns in RequestValidationMiddleware.SECURITY_PATTERNS.items():
-                    for pattern in patterns:
-                        if re.search(pattern, value, re.IGNORECASE):
-                            log_security_event(
-                                event_type=f"JSON_THREAT_{threat_type.upper()}",
-                                description=f"Malicious pattern in JSON at {path}: {pattern}",
-                                client_ip=self.get_client_ip(request),
-                                severity="high"
-                            )
-                            raise ValidationError(f"Invalid content in field: {path}")
-                
-                # Check string length
-                if len(value) > 10000:  # 10KB string limit
-                    raise ValidationError(f"String too long in field: {path}")
-            
-            elif isinstance(value, dict):
-                if len(value) > 100:  # Max 100 keys per object
-                    raise ValidationError(f"Too many keys in object: {path}")
-                
-                for key, val in value.items():
-                    if len(str(key)) > 100:  # Max key length
-                        raise ValidationError(f"Key too long: {path}.{str(key)[:50]}...")
-                    check_value(val, f"{path}.{key}" if path else key)
-            
-            elif isinstance(value, list):
-                if len(value) > 1000:  # Max 1000 items per array
-                    raise ValidationError(f"Array too long: {path}")
-                
-                for i, item in enumerate(value):
-                    check_value(item, f"{path}[{i}]")
-        
-        check_value(data)
-    
-    async def validate_multipart_body(self, request: Request) -> None:
-        """
-        Validate multipart form data
-        """
-        
-        # Basic validation for multipart data
-        content_length = request.headers.get("content-length")
-        if content_length:
-            try:
-                length = int(content_length)
-                if length > 50 * 1024 * 1024:  # 50MB limit for multipart
-                    raise ValidationError("Multipart body too large")
-            except ValueError:
-                raise ValidationError("Invalid Content-Length for multipart")
-    
-    def get_client_ip(self, request: Request) -> str:
-        """Extract client IP address from request"""
-        forwarded_for = request.headers.get("x-forwarded-for")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("x-real-ip")
-        if real_ip:
-            return real_ip
-        
-        if request.client:
-            return request.client.host
-        
-        return "unknown"
-
-
-# Validation utility functions
-def sanitize_string(value: str, max_length: int = 1000) -> str:
-    """
-    Sanitize string input
-    """
-    if not isinstance(value, str):
-        return str(value)
-    
-    # Remove potential XSS characters
-    value = re.sub(r'[<>&"\']', '', value)
-    
-    # Limit length
-    if len(value) > max_length:
-        value = value[:max_length]
-    
-    return value.strip()
-
-
-def validate_
-    return bool(re.match(pattern, phone))
-
-
-def validate_principal_id_format(principal_id: str) -> bool:
-    """
-    Validate ICP Principal ID format
-    """
-    if not principal_id or not isinstance(principal_id, str):
-        return False
+    if not principal_id or not isinstance(principal_id, str):
+        return False
     
     if len(principal_id) < 10 or len(principal_id) > 100:
         return False
@@ -776,335 +700,4 @@ def validate_principal_id_format(principal_id: str) -> bool:
     
     # Check valid characters
     valid_chars = set("abcdefghijklmnopqrstuvwxyz234567-")
-    return all(c.lower() in valid_chars for c in principal_id)request_security(self, request: Request) -> None:
-        """
-        Validate request for security threats
-        """
-        
-        client_ip = self.get_client_ip(request)
-        user_agent = request.headers.get("user-agent", "").lower()
-        
-        # Check for suspicious user agents
-        for suspicious_agent in self.SUSPICIOUS_USER_AGENTS:
-            if suspicious_agent in user_agent:
-                log_security_event(
-                    event_type="SUSPICIOUS_USER_AGENT",
-                    description=f"Suspicious user agent detected: {user_agent}",
-                    client_ip=client_ip,
-                    severity="high"
-                )
-                raise ValidationError("Invalid user agent")
-        
-        # Check URL path for malicious patterns
-        path = str(request.url.path)
-        query = str(request.url.query) if request.url.query else ""
-        
-        for threat_type, patterns in self.SECURITY_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, path + query, re.IGNORECASE):
-                    log_security_event(
-                        event_type=f"SECURITY_THREAT_{threat_type.upper()}",
-                        description=f"Malicious pattern detected in URL: {pattern}",
-                        client_ip=client_ip,
-                        severity="critical"
-                    )
-                    raise ValidationError(f"Invalid request: security violation detected")
-        
-        # Validate headers
-        await self.validate_headers(request)
-    
-    async def validate_headers(self, request: Request) -> None:
-        """
-        Validate request headers
-        """
-        
-        headers = request.headers
-        client_ip = self.get_client_ip(request)
-        
-        # Check for oversized headers
-        for name, value in headers.items():
-            if len(name) > 100:
-                raise ValidationError(f"Header name too long: {name[:50]}...")
-            if len(value) > 8192:  # 8KB limit
-                raise ValidationError(f"Header value too long: {name}")
-        
-        # Validate Content-Length
-        content_length = headers.get("content-length")
-        if content_length:
-            try:
-                length = int(content_length)
-                if length > 10 * 1024 * 1024:  # 10MB limit
-                    raise ValidationError("Request body too large")
-            except ValueError:
-                raise ValidationError("Invalid Content-Length header")
-        
-        # Check for potential header injection
-        for name, value in headers.items():
-            if '\n' in value or '\r' in value:
-                log_security_event(
-                    event_type="HEADER_INJECTION",
-                    description=f"Header injection attempt in {name}",
-                    client_ip=client_ip,
-                    severity="high"
-                )
-                raise ValidationError("Invalid header format")
-    
-    async def validate_content_type(self, request: Request) -> None:
-        """
-        Validate content type for requests with body
-        """
-        
-        content_type = request.headers.get("content-type", "")
-        
-        # List of allowed content types
-        allowed_types = [
-            "application/json",
-            "application/x-www-form-urlencoded",
-            "multipart/form-data",
-            "text/plain"
-        ]
-        
-        # Check if content type is allowed
-        if not any(allowed in content_type for allowed in allowed_types):
-            raise ValidationError(f"Unsupported content type: {content_type}")
-    
-    async def validate_request_size(self, request: Request) -> None:
-        """
-        Validate request size limits
-        """
-        
-        # Check URL length
-        if len(str(request.url)) > 2048:  # 2KB URL limit
-            raise ValidationError("URL too long")
-        
-        # Check query parameter count
-        if len(request.query_params) > 50:
-            raise ValidationError("Too many query parameters")
-        
-        # Validate individual query parameters
-        for key, value in request.query_params.items():
-            if len(key) > 100:
-                raise ValidationError(f"Query parameter name too long: {key[:50]}...")
-            if len(value) > 1000:
-                raise ValidationError(f"Query parameter value too long: {key}")
-    
-    async def check_rate_limiting(self, request: Request) -> None:
-        """
-        Simple rate limiting check
-        """
-        
-        client_ip = self.get_client_ip(request)
-        
-        # Simple rate limiting (in production, use Redis or similar)
-        from datetime import datetime, timedelta
-        
-        now = datetime.utcnow()
-        window_start = now - timedelta(minutes=1)
-        
-        # Clean old entries
-        self.request_counts = {
-            ip: [(timestamp, count) for timestamp, count in requests 
-                 if timestamp > window_start]
-            for ip, requests in self.request_counts.items()
-        }
-        
-        # Count requests for this IP
-        if client_ip not in self.request_counts:
-            self.request_counts[client_ip] = []
-        
-        self.request_counts[client_ip].append((now, 1))
-        
-        # Check if rate limit exceeded
-        total_requests = sum(count for _, count in self.request_counts[client_ip])
-        
-        if total_requests > 100:  # 100 requests per minute
-            log_security_event(
-                event_type="RATE_LIMIT_EXCEEDED",
-                description=f"Rate limit exceeded: {total_requests} requests",
-                client_ip=client_ip,
-                severity="medium"
-            )
-            raise ValidationError("Rate limit exceeded. Please try again later.")
-    
-    def add_security_headers(self, response: Response) -> None:
-        """
-        Add security headers to response
-        """
-        
-        security_headers = {
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "X-XSS-Protection": "1; mode=block",
-            "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
-            "Content-Security-Policy": "default-src 'self'",
-            "Referrer-Policy": "strict-origin-when-cross-origin",
-            "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
-            "X-Permitted-Cross-Domain-Policies": "none"
-        }
-        
-        for header, value in security_headers.items():
-            response.headers[header] = value
-    
-    def get_client_ip(self, request: Request) -> str:
-        """
-        Extract client IP address from request
-        """
-        # Check for forwarded IP first
-        forwarded_for = request.headers.get("x-forwarded-for")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        # Check for real IP
-        real_ip = request.headers.get("x-real-ip")
-        if real_ip:
-            return real_ip
-        
-        # Fall back to client host
-        if request.client:
-            return request.client.host
-        
-        return "unknown"
-
-
-class RequestBodyValidationMiddleware(BaseHTTPMiddleware):
-    """
-    Request body validation middleware
-    """
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """
-        Validate request body content
-        """
-        
-        if request.method in ["POST", "PUT", "PATCH"]:
-            await self.validate_request_body(request)
-        
-        return await call_next(request)
-    
-    async def validate_request_body(self, request: Request) -> None:
-        """
-        Validate request body for security and format
-        """
-        
-        content_type = request.headers.get("content-type", "")
-        
-        if "application/json" in content_type:
-            await self.validate_json_body(request)
-        elif "multipart/form-data" in content_type:
-            await self.validate_multipart_body(request)
-    
-    async def validate_json_body(self, request: Request) -> None:
-        """
-        Validate JSON request body
-        """
-        
-        try:
-            # Try to read and parse the body
-            body = await request.body()
-            
-            if len(body) > 1024 * 1024:  # 1MB limit for JSON
-                raise ValidationError("JSON body too large")
-            
-            if body:
-                try:
-                    json_data = json.loads(body)
-                    await self.validate_json_content(json_data, request)
-                except json.JSONDecodeError as e:
-                    raise ValidationError(f"Invalid JSON format: {str(e)}")
-        
-        except Exception as e:
-            if isinstance(e, ValidationError):
-                raise
-            logger.error(f"Error validating JSON body: {str(e)}")
-    
-    async def validate_json_content(self, data: Any, request: Request) -> None:
-        """
-        Validate JSON content for security threats
-        """
-        
-        def check_value(value: Any, path: str = "") -> None:
-            if isinstance(value, str):
-                # Check for malicious patterns in string values
-                for threat_type, patterns in RequestValidationMiddleware.SECURITY_PATTERNS.items():
-                    for pattern in patterns:
-                        if re.search(pattern, value, re.IGNORECASE):
-                            log_security_event(
-                                event_type=f"JSON_THREAT_{threat_type.upper()}",
-                                description=f"Malicious pattern in JSON at {path}: {pattern}",
-                                client_ip=self.get_client_ip(request),
-                                severity="high"
-                            )
-                            raise ValidationError(f"Invalid content in field: {path}")
-                
-                # Check string length
-                if len(value) > 10000:  # 10KB string limit
-                    raise ValidationError(f"String too long in field: {path}")
-            
-            elif isinstance(value, dict):
-                if len(value) > 100:  # Max 100 keys per object
-                    raise ValidationError(f"Too many keys in object: {path}")
-                
-                for key, val in value.items():
-                    if len(str(key)) > 100:  # Max key length
-                        raise ValidationError(f"Key too long: {path}.{str(key)[:50]}...")
-                    check_value(val, f"{path}.{key}" if path else key)
-            
-            elif isinstance(value, list):
-                if len(value) > 1000:  # Max 1000 items per array
-                    raise ValidationError(f"Array too long: {path}")
-                
-                for i, item in enumerate(value):
-                    check_value(item, f"{path}[{i}]")
-        
-        check_value(data)
-    
-    async def validate_multipart_body(self, request: Request) -> None:
-        """
-        Validate multipart form data
-        """
-        
-        # Basic validation for multipart data
-        content_length = request.headers.get("content-length")
-        if content_length:
-            try:
-                length = int(content_length)
-                if length > 50 * 1024 * 1024:  # 50MB limit for multipart
-                    raise ValidationError("Multipart body too large")
-            except ValueError:
-                raise ValidationError("Invalid Content-Length for multipart")
-    
-    def get_client_ip(self, request: Request) -> str:
-        """Extract client IP address from request"""
-        forwarded_for = request.headers.get("x-forwarded-for")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("x-real-ip")
-        if real_ip:
-            return real_ip
-        
-        if request.client:
-            return request.client.host
-        
-        return "unknown"
-
-
-# Validation utility functions
-def sanitize_string(value: str, max_length: int = 1000) -> str:
-    """
-    Sanitize string input
-    """
-    if not isinstance(value, str):
-        return str(value)
-    
-    # Remove potential XSS characters
-    value = re.sub(r'[<>&"\']', '', value)
-    
-    # Limit length
-    if len(value) > max_length:
-        value = value[:max_length]
-    
-    return value.strip()
-
-
-def validate_
\ No newline at end of file
+    return all(c.lower() in valid_chars for c in principal_id)
@@ -1,13 +1,16 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, Index, literal_column
 from sqlalchemy.sql import func
 from app.database import Base
 
+# Risk levels surfaced as active alerts; kept in sync with the partial index below
+ALERT_RISK_LEVELS = ("high", "critical")
+
 
 class FraudResult(Base):
     __tablename__ = "fraud_results"
 
     id = Column(Integer, primary_key=True, index=True)
-    claim_id = Column(Integer, index=True, nullable=False)
+    claim_id = Column(Integer, nullable=False)
     score = Column(Integer, nullable=False)
     risk_level = Column(String(20), nullable=False)
     flags = Column(Text, nullable=True)
@@ -15,6 +18,25 @@ class FraudResult(Base):
     confidence = Column(Float, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Latest score per claim: equality on claim_id, newest first
+        Index("ix_fraud_results_claim_id_created_at", claim_id, created_at.desc()),
+        # Active alerts only ever scan the high/critical slice of the table
+        Index(
+            "ix_fraud_results_alerts_created_at",
+            created_at.desc(),
+            sqlite_where=risk_level.in_(ALERT_RISK_LEVELS),
+            postgresql_where=risk_level.in_(ALERT_RISK_LEVELS),
+        ),
+    )
+
+
+# Inlined as literals: SQLite only picks a partial index when the query repeats its
+# WHERE clause verbatim, which bound parameters can't do
+ALERT_RISK_FILTER = FraudResult.risk_level.in_(
+    [literal_column(f"'{level}'") for level in ALERT_RISK_LEVELS]
+)
+
 
 class FraudAuditLog(Base):
     __tablename__ = "fraud_audit_logs"
@@ -27,3 +49,6 @@ class FraudAuditLog(Base):
     severity = Column(String(20), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_fraud_audit_logs_claim_id_created_at", claim_id, created_at.desc()),
+    )
@@ -1,41 +1,75 @@
 import os
-from hedera import (
-    Client,
-    AccountId,
-    PrivateKey,
-    TopicCreateTransaction,
-    TopicMessageSubmitTransaction,
-    FileCreateTransaction,
-    FileAppendTransaction,
-    Hbar
-)
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
 
 class HederaService:
+    """
+    Hedera client wrapper
+
+    The SDK is imported and the client connected on first use (or by an
+    explicit connect() from the startup warm-up), not at import time.
+    """
+
     def __init__(self):
+        self.account_id = None
+        self.private_key = None
+        self._client = None
+        self._connect_attempted = False
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if not self._connect_attempted:
+            self.connect()
+        return self._client
+
+    @property
+    def connect_attempted(self) -> bool:
+        return self._connect_attempted
+
+    @property
+    def is_connected(self) -> bool:
+        """True once connected; never triggers a connection itself"""
+        return self._client is not None
+
+    def connect(self):
+        """Import the SDK and initialize the client once; returns the client or None"""
+        with self._lock:
+            if self._connect_attempted:
+                return self._client
+            self._client = self._create_client()
+            self._connect_attempted = True
+            return self._client
+
+    def _create_client(self):
         try:
+            from hedera import AccountId, Client, PrivateKey
+
             self.account_id = AccountId.fromString(os.getenv("HEDERA_ACCOUNT_ID"))
             self.private_key = PrivateKey.fromString(os.getenv("HEDERA_PRIVATE_KEY"))
             
             network = os.getenv("HEDERA_NETWORK", "testnet")
             if network == "mainnet":
-                self.client = Client.forMainnet()
+                client = Client.forMainnet()
             else:
-                self.client = Client.forTestnet()
+                client = Client.forTestnet()
                 
-            self.client.setOperator(self.account_id, self.private_key)
+            client.setOperator(self.account_id, self.private_key)
             print(f"Hedera Client Initialized on {network}")
+            return client
         except Exception as e:
             print(f"Failed to initialize Hedera Client: {e}")
-            self.client = None
+            return None
 
     def create_topic(self, memo: str = "Helix Log"):
         if not self.client:
             return None
         
         try:
+            from hedera import TopicCreateTransaction
+
             transaction = TopicCreateTransaction()
             transaction.setSubmitKey(self.private_key.getPublicKey())
             transaction.setTopicMemo(memo)
@@ -54,6 +88,8 @@ class HederaService:
             return False
             
         try:
+            from hedera import TopicMessageSubmitTransaction
+
             transaction = TopicMessageSubmitTransaction()
             transaction.setTopicId(topic_id)
             transaction.setMessage(message)
@@ -71,6 +107,8 @@ class HederaService:
             return None
             
         try:
+            from hedera import FileCreateTransaction
+
             # Create file
             transaction = FileCreateTransaction()
             transaction.setKeys([self.private_key.getPublicKey()])
@@ -92,4 +130,5 @@ class HederaService:
             print(f"Error storing file: {e}")
             return None
 
+# Cheap to construct: nothing is imported or connected until first use
 hedera_service = HederaService()
@@ -3,7 +3,7 @@ CorruptGuard Custom Exception Classes
 Professional error handling for government-grade software
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from fastapi import HTTPException
 
 class CorruptGuardException(HTTPException):
@@ -106,14 +106,72 @@ class DatabaseError(CorruptGuardException):
 class RateLimitError(CorruptGuardException):
     """Rate limiting errors"""
     
-    def __init__(self, detail: str = "Rate limit exceeded"):
+    def __init__(self, detail: str = "Rate limit exceeded", headers: Optional[Dict[str, Any]] = None):
         super().__init__(
             status_code=429,
             detail=detail,
+            headers=headers,
             error_code="RATE_LIMIT_ERROR"
         )
 
 
+class PayloadTooLargeError(CorruptGuardException):
+    """Request body over the size limit for its route"""
+    
+    def __init__(self, limit: int):
+        super().__init__(
+            status_code=413,
+            detail=f"Request body exceeds the {limit} byte limit for this endpoint",
+            error_code="PAYLOAD_TOO_LARGE"
+        )
+        self.limit = limit
+
+
+class ScoringCapacityError(CorruptGuardException):
+    """Fraud scoring pool is saturated"""
+    
+    def __init__(self, detail: str = "Fraud scoring capacity exceeded, retry shortly"):
+        super().__init__(
+            status_code=503,
+            detail=detail,
+            headers={"Retry-After": "1"},
+            error_code="SCORING_OVERLOADED"
+        )
+
+class WriteBufferFullError(CorruptGuardException):
+    """Write-behind buffer is at capacity, typically because the database is down"""
+    
+    def __init__(self, detail: str = "Result storage is backed up, retry shortly"):
+        super().__init__(
+            status_code=503,
+            detail=detail,
+            headers={"Retry-After": "5"},
+            error_code="WRITE_BUFFER_FULL"
+        )
+
+class ServiceWarmingUpError(CorruptGuardException):
+    """Request needs a component that has not finished loading"""
+    
+    def __init__(self, components: List[str]):
+        super().__init__(
+            status_code=503,
+            detail=f"Service is still warming up ({', '.join(components)}), retry shortly",
+            headers={"Retry-After": "2"},
+            error_code="WARMING_UP"
+        )
+        self.components = components
+
+class ScoringTimeoutError(CorruptGuardException):
+    """Fraud scoring did not finish in time"""
+    
+    def __init__(self, detail: str = "Fraud scoring timed out"):
+        super().__init__(
+            status_code=504,
+            detail=detail,
+            error_code="SCORING_TIMEOUT"
+        )
+
+
 class ConfigurationError(CorruptGuardException):
     """Configuration and setup errors"""
     
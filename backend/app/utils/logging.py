@@ -3,11 +3,15 @@ CorruptGuard Logging Configuration
 Government-grade logging with security and audit trail support
 """
 
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import queue
 import sys
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 import structlog
 from datetime import datetime
 
@@ -95,9 +99,14 @@ def setup_logging(log_file: Optional[str] = None) -> None:
             logging_config["loggers"][logger_name]["handlers"].append("file")
         logging_config["root"]["handlers"].append("file")
     
-    # Apply logging configuration
+    # Apply logging configuration; a running listener is drained first so no records are lost
+    stop_queued_logging()
     logging.config.dictConfig(logging_config)
     
+    # Move every handler behind the queue so request paths never wait on I/O
+    if settings.log_queue_enabled:
+        start_queued_logging(["", *logging_config["loggers"]])
+    
     # Configure structured logging for production
     if getattr(settings, 'is_production', False):
         structlog.configure(
@@ -118,6 +127,144 @@ def setup_logging(log_file: Optional[str] = None) -> None:
             cache_logger_on_first_use=True,
         )
 
+class QueuedLogHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the background log listener instead of writing them
+
+    The queue is bounded. With the "drop" policy a full queue discards the new
+    record at once; with "block" the caller waits up to `block_timeout` for
+    room and then drops. Either way the drop is counted, never raised.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, route: str, policy: str = "drop", block_timeout: float = 0.05):
+        super().__init__(log_queue)
+        self.route = route
+        self.policy = policy
+        self.block_timeout = block_timeout
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        # The listener delivers the record to this logger's own handlers
+        record.log_route = self.route
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            _count_log_record(dropped=True)
+            return
+        _count_log_record(depth=self.queue.qsize())
+
+
+class RoutingQueueListener(logging.handlers.QueueListener):
+    """Background listener that writes each record to the handlers of the logger it came from"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.routes: Dict[str, List[logging.Handler]] = {}
+    
+    def handle(self, record: logging.LogRecord) -> None:
+        record = self.prepare(record)
+        for handler in self.routes.get(getattr(record, "log_route", None), ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+    
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full; wait for room rather than fail to stop
+        self.queue.put(self._sentinel)
+
+
+_log_listener: Optional[RoutingQueueListener] = None
+_log_listener_lock = threading.Lock()
+_log_queue_stats: Dict[str, int] = {"queued": 0, "dropped": 0, "max_depth": 0}
+# Records are counted from every logging thread at once
+_log_queue_stats_lock = threading.Lock()
+
+
+def _count_log_record(dropped: bool = False, depth: int = 0) -> None:
+    with _log_queue_stats_lock:
+        if dropped:
+            _log_queue_stats["dropped"] += 1
+            return
+        _log_queue_stats["queued"] += 1
+        if depth > _log_queue_stats["max_depth"]:
+            _log_queue_stats["max_depth"] = depth
+
+
+def _queue_logger_handlers(logger: logging.Logger) -> None:
+    """Replace a logger's handlers with one queue handler routed back to them"""
+    listener = _log_listener
+    if listener is None or not logger.handlers:
+        return
+    if any(isinstance(handler, QueuedLogHandler) for handler in logger.handlers):
+        return
+    
+    route = logger.name
+    listener.routes[route] = list(logger.handlers)
+    logger.handlers = [QueuedLogHandler(
+        listener.queue,
+        route,
+        policy=settings.log_queue_policy,
+        block_timeout=settings.log_queue_block_timeout
+    )]
+
+
+def start_queued_logging(logger_names: List[str]) -> None:
+    """
+    Route the named loggers ("" for root) through one bounded queue
+
+    A single background thread then does all formatting and I/O for them.
+    Loggers given handlers later (audit, fraud, ICP) join when created.
+    """
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is not None:
+            return
+        if settings.log_queue_policy not in ("drop", "block"):
+            raise ValueError(f"log_queue_policy must be 'drop' or 'block', not {settings.log_queue_policy!r}")
+        
+        _log_listener = RoutingQueueListener(queue.Queue(maxsize=settings.log_queue_size))
+        for name in logger_names:
+            _queue_logger_handlers(logging.getLogger(name))
+        _log_listener.start()
+
+
+def stop_queued_logging() -> None:
+    """Write out everything still queued, stop the listener and restore direct handlers"""
+    global _log_listener
+    with _log_listener_lock:
+        listener = _log_listener
+        if listener is None:
+            return
+        listener.stop()
+        _log_listener = None
+        
+        for route, handlers in listener.routes.items():
+            logging.getLogger(route).handlers = handlers
+
+
+# Flush whatever is still queued when the process exits
+atexit.register(stop_queued_logging)
+
+
+def get_log_queue_stats() -> Dict[str, Any]:
+    """Queue depth and drop counters for the queued log pipeline"""
+    listener = _log_listener
+    stats = {
+        "enabled": listener is not None,
+        "policy": settings.log_queue_policy,
+        "capacity": settings.log_queue_size,
+        "depth": listener.queue.qsize() if listener else 0,
+    }
+    with _log_queue_stats_lock:
+        stats.update(_log_queue_stats)
+    return stats
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a configured logger instance
@@ -151,6 +298,7 @@ def get_audit_logger() -> logging.Logger:
         audit_logger.addHandler(audit_handler)
         audit_logger.setLevel(logging.INFO)
     
+    _queue_logger_handlers(audit_logger)
     return audit_logger
 
 # Fraud detection logger for corruption analysis
@@ -178,6 +326,7 @@ def get_fraud_logger() -> logging.Logger:
         fraud_logger.addHandler(fraud_handler)
         fraud_logger.setLevel(logging.INFO)
     
+    _queue_logger_handlers(fraud_logger)
     return fraud_logger
 
 # ICP transaction logger for blockchain operations
@@ -205,6 +354,7 @@ def get_icp_logger() -> logging.Logger:
         icp_logger.addHandler(icp_handler)
         icp_logger.setLevel(logging.INFO)
     
+    _queue_logger_handlers(icp_logger)
     return icp_logger
 
 # Utility functions for structured logging
@@ -304,4 +454,66 @@ def log_icp_transaction(
         level,
         f"ICP transaction: {transaction_type} - {method} ({'SUCCESS' if success else 'FAILED'})",
         extra=log_data
-    )
\ No newline at end of file
+    )
+
+
+def log_security_event(
+    event_type: str,
+    description: str,
+    client_ip: Optional[str] = None,
+    severity: str = "medium",
+    details: Optional[dict] = None
+):
+    """
+    Log security events (blocked requests, injection attempts, abuse)
+    
+    Args:
+        event_type: Event type (e.g. SECURITY_THREAT_XSS)
+        description: Human-readable description
+        client_ip: Originating client IP
+        severity: low, medium, high or critical
+        details: Additional event details
+    """
+    audit_logger = get_audit_logger()
+    
+    log_data = {
+        "event_type": event_type,
+        "client_ip": client_ip,
+        "severity": severity,
+        "timestamp": datetime.utcnow().isoformat(),
+        "details": details or {}
+    }
+    
+    level = logging.ERROR if severity in ("high", "critical") else logging.WARNING
+    audit_logger.log(level, f"Security event: {event_type} - {description}", extra=log_data)
+
+def performance_metrics_enabled() -> bool:
+    """Whether log_performance_metric records anything; check before building its details"""
+    return logging.getLogger("app.performance").isEnabledFor(logging.DEBUG)
+
+def log_performance_metric(
+    operation: str,
+    duration_ms: float,
+    success: bool = True,
+    details: Optional[dict] = None
+):
+    """
+    Log timing for an operation
+    
+    Args:
+        operation: Operation name (e.g. "GET /health")
+        duration_ms: Duration in milliseconds
+        success: Whether the operation succeeded
+        details: Additional metric details
+    """
+    if not performance_metrics_enabled():
+        return
+    logger = logging.getLogger("app.performance")
+    
+    log_data = {
+        "operation": operation,
+        "duration_ms": round(duration_ms, 2),
+        "success": success,
+        "details": details or {}
+    }
+    logger.debug(f"Performance: {operation} {duration_ms:.2f}ms ({'ok' if success else 'failed'})", extra=log_data)
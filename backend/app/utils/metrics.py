@@ -0,0 +1,408 @@
+"""
+CorruptGuard Metrics Registry
+In-process counters, gauges and fixed-bucket histograms, exported in the
+Prometheus text exposition format
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; covers sub-millisecond handlers up to slow report exports
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """
+    One metric family; a series per distinct set of label values
+
+    Each series takes its own lock, so concurrent updates only contend when
+    they hit the same series. The family lock is only taken to create a
+    series the first time its labels are seen.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str, **labels: str):
+        """The series for these label values, created on first use"""
+        if labels:
+            values = tuple(str(labels[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+
+        series = self._series.get(values)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+    def series(self) -> List[Tuple[LabelValues, object]]:
+        return list(self._series.items())
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+        for values, series in sorted(self.series()):
+            lines.extend(self._expose_series(values, series))
+        return lines
+
+    def _expose_series(self, values: LabelValues, series) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(series.get())}"]
+
+
+class _Value:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def get(self) -> float:
+        return self._value
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    type_name = "counter"
+
+    def _new_series(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self.labels(**labels).inc(amount)
+
+    def total(self) -> float:
+        return sum(series.get() for _, series in self.series())
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type_name = "gauge"
+
+    def _new_series(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        self.labels(**labels).inc(amount)
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.labels(**labels).dec(amount)
+
+    def set(self, value: float, **labels: str) -> None:
+        self.labels(**labels).set(value)
+
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed buckets, with their sum and count"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self) -> _Buckets:
+        return _Buckets(self.buckets)
+
+    def observe(self, value: float, **labels: str) -> None:
+        self.labels(**labels).observe(value)
+
+    def merged(self) -> Tuple[List[int], float, int]:
+        """Bucket counts, sum and count across every series"""
+        counts = [0] * (len(self.buckets) + 1)
+        total_sum, total_count = 0.0, 0
+        for _, series in self.series():
+            series_counts, series_sum, series_count = series.snapshot()
+            counts = [a + b for a, b in zip(counts, series_counts)]
+            total_sum += series_sum
+            total_count += series_count
+        return counts, total_sum, total_count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the q-quantile over every series, like PromQL's histogram_quantile
+
+        Interpolates linearly inside the bucket holding the target rank; ranks
+        in the +Inf bucket report the highest finite bound.
+        """
+        counts, _, total = self.merged()
+        if total == 0:
+            return None
+
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if count and cumulative + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def _expose_series(self, values: LabelValues, series: _Buckets) -> List[str]:
+        counts, total_sum, total_count = series.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total_sum)}")
+        lines.append(f"{self.name}_count{labels} {total_count}")
+        return lines
+
+
+class RateMeter:
+    """
+    Events per second over a sliding window of one-second slots
+
+    Memory is one slot per second of window, whatever the event rate.
+    """
+
+    def __init__(self, window_seconds: int = 60):
+        self.window_seconds = window_seconds
+        self._slots = [0] * window_seconds
+        self._seconds = [0] * window_seconds
+        self._lock = threading.Lock()
+
+    def mark(self, count: int = 1, now: Optional[float] = None) -> None:
+        second = int(now if now is not None else time.time())
+        index = second % self.window_seconds
+        with self._lock:
+            if self._seconds[index] != second:
+                self._seconds[index] = second
+                self._slots[index] = 0
+            self._slots[index] += count
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Mean events per second over the last `window_seconds` seconds, this one included"""
+        second = int(now if now is not None else time.time())
+        oldest = second - self.window_seconds
+        with self._lock:
+            events = sum(
+                count for count, slot_second in zip(self._slots, self._seconds)
+                if oldest < slot_second <= second
+            )
+        return events / self.window_seconds
+
+
+class MetricsRegistry:
+    """Named metric families, exposed together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered with a different type or labels")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def expose(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].expose())
+        return "\n".join(lines) + "\n"
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_registry = MetricsRegistry()
+
+# Application metrics
+http_requests_total = _registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code", ("method", "route", "status")
+)
+http_request_duration_seconds = _registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response starts", ("method", "route")
+)
+http_requests_in_progress = _registry.gauge("http_requests_in_progress", "HTTP requests being handled")
+http_request_rate = RateMeter(window_seconds=60)
+fraud_claims_scored_total = _registry.counter(
+    "fraud_claims_scored_total", "Claims scored for fraud by risk level", ("risk_level",)
+)
+dependency_requests_total = _registry.counter(
+    "dependency_requests_total", "Calls to downstream dependencies by outcome", ("dependency", "outcome")
+)
+dependency_request_duration_seconds = _registry.histogram(
+    "dependency_request_duration_seconds", "Latency of calls to downstream dependencies", ("dependency",)
+)
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Process-wide metrics registry"""
+    return _registry
+
+
+def record_http_request(method: str, route: str, status_code: int, duration_seconds: float) -> None:
+    """Count one finished HTTP request and its latency"""
+    http_requests_total.labels(method, route, str(status_code)).inc()
+    http_request_duration_seconds.labels(method, route).observe(duration_seconds)
+    http_request_rate.mark()
+
+
+def record_fraud_score(risk_level: str) -> None:
+    fraud_claims_scored_total.labels(risk_level).inc()
+
+
+@contextmanager
+def track_dependency(dependency: str) -> Iterator[None]:
+    """Time a call to a downstream dependency and count whether it succeeded"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        dependency_requests_total.labels(dependency, outcome).inc()
+        dependency_request_duration_seconds.labels(dependency).observe(time.perf_counter() - started)
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def get_realtime_stats() -> Dict[str, object]:
+    """Throughput, latency percentiles, fraud scoring and dependency health from the registry"""
+    uptime = time.time() - _registry.started_at
+    requests = http_requests_total.total()
+
+    by_status: Dict[str, float] = {}
+    for (_, _, status), series in http_requests_total.series():
+        by_status[status] = by_status.get(status, 0) + series.get()
+    server_errors = sum(count for status, count in by_status.items() if status.startswith("5"))
+
+    dependencies: Dict[str, Dict[str, object]] = {}
+    for (dependency, outcome), series in dependency_requests_total.series():
+        entry = dependencies.setdefault(dependency, {"calls": 0, "errors": 0})
+        entry["calls"] += int(series.get())
+        if outcome != "success":
+            entry["errors"] += int(series.get())
+    for (dependency,), series in dependency_request_duration_seconds.series():
+        _, total_sum, count = series.snapshot()
+        if dependency in dependencies and count:
+            dependencies[dependency]["mean_latency_ms"] = _ms(total_sum / count)
+
+    return {
+        "uptime_seconds": round(uptime, 1),
+        "throughput": {
+            "requests_total": int(requests),
+            "requests_per_second_1m": round(http_request_rate.rate(), 2),
+            "requests_per_second_lifetime": round(requests / uptime, 2) if uptime > 0 else 0.0,
+            "in_progress": int(http_requests_in_progress.labels().get()),
+        },
+        "latency_ms": {
+            "p50": _ms(http_request_duration_seconds.quantile(0.5)),
+            "p95": _ms(http_request_duration_seconds.quantile(0.95)),
+            "p99": _ms(http_request_duration_seconds.quantile(0.99)),
+        },
+        "responses_by_status": {status: int(count) for status, count in sorted(by_status.items())},
+        "error_rate": round(server_errors / requests, 4) if requests else 0.0,
+        "claims_scored_by_risk_level": {
+            risk_level: int(series.get()) for (risk_level,), series in sorted(fraud_claims_scored_total.series())
+        },
+        "dependencies": dependencies,
+    }
@@ -0,0 +1,204 @@
+"""
+CorruptGuard Rate Limiting
+Sliding-window-counter limiter shared by the API middleware and dependencies
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one rate limit check"""
+    allowed: bool
+    key: str
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, int(self.retry_after + 0.999)))
+        return headers
+
+
+class RateLimitBackend(ABC):
+    """Stores per-key counters for the current and previous window"""
+
+    @abstractmethod
+    async def hit(self, key: str, window_index: int, window_seconds: int) -> Tuple[int, int]:
+        """Count one request for `key`; returns (current_window_count, previous_window_count)"""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process counters with bounded memory
+
+    Keys are kept in least-recently-used order. Each hit evicts expired keys
+    from the cold end, and the oldest key is dropped once `max_keys` is
+    reached, so memory stays O(max_keys) however many clients appear.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> [window_index, current_count, previous_count, expires_at]
+        self._counters: "OrderedDict[str, list]" = OrderedDict()
+        self.evicted = 0
+
+    async def hit(self, key: str, window_index: int, window_seconds: int) -> Tuple[int, int]:
+        now = time.time()
+        self._evict_expired(now)
+
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = [window_index, 0, 0, 0.0]
+            self._counters[key] = counter
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._counters.move_to_end(key)
+            if counter[0] != window_index:
+                counter[2] = counter[1] if counter[0] == window_index - 1 else 0
+                counter[1] = 0
+                counter[0] = window_index
+
+        counter[1] += 1
+        # Needed until the next window no longer looks back at this one
+        counter[3] = (window_index + 2) * window_seconds
+        return counter[1], counter[2]
+
+    def _evict_expired(self, now: float) -> None:
+        while self._counters:
+            key, counter = next(iter(self._counters.items()))
+            if counter[3] > now:
+                break
+            del self._counters[key]
+            self.evicted += 1
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Counters in a Redis-protocol store, shared by every worker and replica
+
+    Uses one INCR + EXPIRE per request on a per-window key, plus a GET of the
+    previous window, pipelined into a single round trip.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit"):
+        from redis import asyncio as aioredis
+
+        self.prefix = prefix
+        self._redis = aioredis.from_url(url)
+
+    async def hit(self, key: str, window_index: int, window_seconds: int) -> Tuple[int, int]:
+        current_key = f"{self.prefix}:{key}:{window_index}"
+        previous_key = f"{self.prefix}:{key}:{window_index - 1}"
+
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.incr(current_key)
+        pipe.expire(current_key, window_seconds * 2)
+        pipe.get(previous_key)
+        current, _, previous = await pipe.execute()
+        return int(current), int(previous or 0)
+
+    def __len__(self) -> int:
+        return 0
+
+
+class RateLimiter:
+    """
+    Sliding-window-counter rate limiter
+
+    Approximates a true sliding window by weighting the previous fixed
+    window's count by how much of it still overlaps the sliding window.
+    Needs two integers per key instead of a timestamp per request.
+    """
+
+    def __init__(self, backend: RateLimitBackend, window_seconds: int = 60):
+        self.backend = backend
+        self.window_seconds = window_seconds
+        self.allowed = 0
+        self.rejected = 0
+        self.backend_errors = 0
+
+    async def hit(self, key: str, limit: int) -> RateLimitResult:
+        """Count one request against `key` and report whether it is within `limit`"""
+        now = time.time()
+        window_index = int(now // self.window_seconds)
+        elapsed = (now % self.window_seconds) / self.window_seconds
+
+        try:
+            current, previous = await self.backend.hit(key, window_index, self.window_seconds)
+        except Exception as e:
+            # A shared store outage must not take the API down with it
+            self.backend_errors += 1
+            logger.warning(f"Rate limit backend unavailable, allowing request: {e}")
+            return RateLimitResult(allowed=True, key=key, limit=limit, remaining=limit)
+
+        estimated = previous * (1 - elapsed) + current
+        allowed = estimated <= limit
+
+        if allowed:
+            self.allowed += 1
+            return RateLimitResult(True, key, limit, max(0, int(limit - estimated)))
+
+        self.rejected += 1
+        # Time until the previous window's weight has decayed enough to admit one more request
+        if previous:
+            retry_after = (estimated - limit) / previous * self.window_seconds
+        else:
+            retry_after = (1 - elapsed) * self.window_seconds
+        return RateLimitResult(False, key, limit, 0, min(retry_after, self.window_seconds))
+
+    async def check(
+        self,
+        client_ip: str,
+        ip_limit: int,
+        principal_id: Optional[str] = None,
+        principal_limit: Optional[int] = None,
+    ) -> RateLimitResult:
+        """Apply the per-IP limit and, for authenticated callers, the per-principal limit"""
+        result = await self.hit(f"ip:{client_ip}", ip_limit)
+        if result.allowed and principal_id and principal_limit:
+            result = await self.hit(f"principal:{principal_id}", principal_limit)
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "tracked_keys": len(self.backend),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "backend_errors": self.backend_errors,
+        }
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter configured from settings"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        if settings.rate_limit_backend == "redis":
+            backend: RateLimitBackend = RedisRateLimitBackend(settings.rate_limit_redis_url)
+        else:
+            backend = InMemoryRateLimitBackend(max_keys=settings.rate_limit_max_keys)
+        _rate_limiter = RateLimiter(backend, window_seconds=settings.rate_limit_window)
+    return _rate_limiter
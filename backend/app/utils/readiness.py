@@ -0,0 +1,105 @@
+"""
+CorruptGuard Startup Readiness
+Tracks the background warm-up, answers the readiness probe and lets request
+handlers wait for the components they need
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from fastapi.responses import JSONResponse
+
+from app.utils.exceptions import ServiceWarmingUpError
+
+logger = logging.getLogger(__name__)
+
+WarmupStep = Tuple[str, Callable[[], Awaitable[Any]]]
+
+
+class WarmupState:
+    """
+    Progress of the startup warm-up, one flag per component
+
+    `run` performs the steps in order and marks each component as it
+    finishes. Handlers call `wait_for` with the components they depend on,
+    so a request that arrives during warm-up waits briefly and is then
+    rejected instead of being served by a half-loaded service.
+    """
+
+    def __init__(self, components: Iterable[str]):
+        self.components: Dict[str, bool] = {name: False for name in components}
+        self.ready = False
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        self._events: Dict[str, asyncio.Event] = {name: asyncio.Event() for name in self.components}
+        self._finished = asyncio.Event()
+
+    def mark_ready(self, component: str) -> None:
+        self.components[component] = True
+        self._events[component].set()
+
+    async def run(self, steps: Sequence[WarmupStep]) -> bool:
+        """Run each (component, step) in order; a failing step ends the warm-up"""
+        started = time.perf_counter()
+        try:
+            for component, step in steps:
+                await step()
+                self.mark_ready(component)
+            self.ready = True
+            logger.info(f"Warm-up complete in {(time.perf_counter() - started) * 1000:.0f}ms")
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Warm-up failed: {e}")
+        finally:
+            self.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            self._finished.set()
+        return self.ready
+
+    async def wait_for(self, *components: str, timeout: float = 5.0) -> None:
+        """
+        Wait until the named components are warm
+
+        Raises:
+            ServiceWarmingUpError: If they are not warm within `timeout`, or
+                warm-up has already failed before reaching them
+        """
+        missing = [name for name in components if not self.components[name]]
+        if not missing:
+            return
+
+        async def all_ready():
+            for name in missing:
+                await self._events[name].wait()
+
+        waiter = asyncio.ensure_future(all_ready())
+        finished = asyncio.ensure_future(self._finished.wait())
+        try:
+            await asyncio.wait({waiter, finished}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+            finished.cancel()
+
+        missing = [name for name in components if not self.components[name]]
+        if missing:
+            raise ServiceWarmingUpError(missing)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "components": dict(self.components),
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+        }
+
+    def readiness_response(self):
+        """Readiness probe body: 200 once every component is warm, 503 until then"""
+        body = {
+            "status": "ready" if self.ready else "warming_up",
+            "timestamp": time.time(),
+            **self.status(),
+        }
+        if not self.ready:
+            return JSONResponse(status_code=503, content=body)
+        return body
@@ -0,0 +1,70 @@
+"""
+CorruptGuard Request Body Cache
+Parses a JSON request body once per request and shares the result between
+middleware, dependencies and FastAPI's own body handling
+"""
+
+import json
+from typing import Any, Callable
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+
+_NOT_PARSED = object()
+
+
+async def get_json_body(request: Request) -> Any:
+    """
+    The request's decoded JSON body, parsed on first use
+
+    Raw bytes and the parsed value live on `request.state`, which is shared by
+    every Request object built for the same ASGI scope, so middleware and the
+    endpoint see one parse. A body that fails to parse is not cached, and the
+    JSONDecodeError reaches the caller each time.
+    """
+    parsed = getattr(request.state, "json_body", _NOT_PARSED)
+    if parsed is not _NOT_PARSED:
+        return parsed
+
+    body = getattr(request.state, "raw_body", None)
+    if body is None:
+        body = await request.body()
+        request.state.raw_body = body
+
+    parsed = json.loads(body)
+    request.state.json_body = parsed
+    return parsed
+
+
+class ParsedBodyRequest(Request):
+    """Request whose body()/json() reuse what middleware already read and parsed"""
+
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            cached = getattr(self.state, "raw_body", None)
+            self._body = cached if cached is not None else await super().body()
+            self.state.raw_body = self._body
+        return self._body
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = await get_json_body(self)
+        return self._json
+
+
+class ParsedBodyRoute(APIRoute):
+    """
+    Route class that hands endpoints a ParsedBodyRequest
+
+    Set it as `route_class` on routers (and on `app.router`) whose endpoints
+    take JSON bodies, so pydantic validation reuses the middleware's parse.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def parsed_body_route_handler(request: Request) -> Response:
+            return await handler(ParsedBodyRequest(request.scope, request.receive))
+
+        return parsed_body_route_handler
@@ -0,0 +1,67 @@
+"""
+CorruptGuard Streaming Responses
+Serializes report records to NDJSON or CSV as they are produced, so large
+reports are sent incrementally instead of being built in memory first
+"""
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+
+REPORT_FORMATS = ("ndjson", "csv")
+REPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+async def ndjson_lines(records: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[str]:
+    """One JSON document per line"""
+    async for record in records:
+        yield json.dumps(record, default=str) + "\n"
+
+
+async def csv_lines(records: AsyncIterable[Dict[str, Any]], fieldnames: Sequence[str]) -> AsyncIterator[str]:
+    """
+    A header row, then one row per record
+
+    Fields not in `fieldnames` are dropped, so records may carry extra keys
+    (such as NDJSON-only summary records, which are skipped entirely).
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+
+    writer.writeheader()
+    async for record in records:
+        if record.get("type") == "summary":
+            continue
+        writer.writerow(record)
+        # Hand each row over as soon as it is written, keeping the buffer tiny
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_report(
+    records: AsyncIterable[Dict[str, Any]],
+    report_format: str,
+    filename: str,
+    fieldnames: Optional[Sequence[str]] = None,
+) -> StreamingResponse:
+    """Wrap an async record iterator in a StreamingResponse of the requested format"""
+    if report_format == "csv":
+        body = csv_lines(records, fieldnames or [])
+    else:
+        body = ndjson_lines(records)
+
+    return StreamingResponse(
+        body,
+        media_type=REPORT_MEDIA_TYPES[report_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{report_format}"'},
+    )
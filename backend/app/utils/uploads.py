@@ -0,0 +1,49 @@
+"""
+CorruptGuard Upload Handling
+Reads uploaded files in fixed-size chunks, hashing as they go
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import UploadFile
+
+from app.config.settings import get_settings
+from app.utils.exceptions import PayloadTooLargeError
+
+
+@dataclass
+class UploadDigest:
+    """Size and content hash of an upload"""
+    size: int
+    sha256: str
+
+
+async def hash_upload(
+    file: UploadFile,
+    max_bytes: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> UploadDigest:
+    """
+    Hash an upload one chunk at a time, without copying it
+
+    Starlette has already spooled the upload to a temporary file, so this only
+    reads it back; at most one chunk is held in memory. Going over `max_bytes`
+    raises PayloadTooLargeError. The file is rewound afterwards so it can
+    still be stored.
+    """
+    settings = get_settings()
+    max_bytes = settings.max_upload_size if max_bytes is None else max_bytes
+    chunk_size = chunk_size or settings.upload_chunk_size
+
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := await file.read(chunk_size):
+        size += len(chunk)
+        if size > max_bytes:
+            raise PayloadTooLargeError(max_bytes)
+        digest.update(chunk)
+
+    await file.seek(0)
+    return UploadDigest(size=size, sha256=digest.hexdigest())
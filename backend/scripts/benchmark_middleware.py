@@ -0,0 +1,152 @@
+"""
+Measure per-request overhead of the full ASGI middleware stack
+
+Usage (from backend/):
+    python scripts/benchmark_middleware.py --requests 5000 --max-overhead-ms 1.0
+
+Drives a bare ASGI endpoint and the same endpoint wrapped in the rate limit,
+size limit, logging, performance, audit and validation middleware directly
+through the ASGI interface (no server, no HTTP client), for GETs and small JSON
+POSTs on routes with full, light and no middleware profiles from settings.
+Prints the mean time per request for each and the difference, and exits
+non-zero if the stack adds more than --max-overhead-ms.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.middleware.logging import (  # noqa: E402
+    PerformanceMonitoringMiddleware,
+    RequestLoggingMiddleware,
+    SecurityAuditMiddleware,
+)
+from app.middleware.profiles import get_route_profiles  # noqa: E402
+from app.middleware.vaiidation import (  # noqa: E402
+    RateLimitMiddleware,
+    RequestBodyValidationMiddleware,
+    RequestSizeLimitMiddleware,
+    RequestValidationMiddleware,
+)
+
+RESPONSE_BODY = json.dumps({"status": "ok"}).encode()
+CLAIM_BODY = json.dumps({
+    "claim_id": 1042,
+    "vendor": "vendor-17",
+    "area": "roads",
+    "amount": 125000.0,
+    "description": "Road resurfacing, Ward 12 - phase 2 (materials and labour)",
+    "items": [{"name": "asphalt", "quantity": 40}, {"name": "labour", "quantity": 120}],
+}).encode()
+
+
+async def endpoint(scope, receive, send):
+    """Minimal ASGI app: drain the request body, answer with a small JSON document"""
+    more_body = scope["method"] in ("POST", "PUT", "PATCH")
+    while more_body:
+        message = await receive()
+        more_body = message.get("more_body", False)
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(RESPONSE_BODY)).encode())],
+    })
+    await send({"type": "http.response.body", "body": RESPONSE_BODY})
+
+
+def full_stack(app):
+    # Innermost first, as main.py registers them; the request passes through them in reverse
+    app = RequestBodyValidationMiddleware(app)
+    app = RequestValidationMiddleware(app, rate_limit=False)
+    app = SecurityAuditMiddleware(app)
+    app = PerformanceMonitoringMiddleware(app)
+    app = RequestLoggingMiddleware(app)
+    # main.py resolves the principal from the bearer token; these requests carry none
+    app = RateLimitMiddleware(app, enabled=True)
+    return RequestSizeLimitMiddleware(app)
+
+
+def make_scope(method: str, path: str, body: bytes, n: int) -> dict:
+    headers = [(b"host", b"testserver"), (b"user-agent", b"benchmark/1.0"), (b"accept", b"application/json")]
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        # A distinct client per request keeps the per-IP rate limiter out of the way
+        "client": (f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+async def run(app, method: str, path: str, body: bytes, requests: int) -> float:
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    start = time.perf_counter()
+    for n in range(requests):
+        delivered = False
+
+        async def receive():
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return {"type": "http.disconnect"}
+
+        await app(make_scope(method, path, body, n), receive, send)
+    return (time.perf_counter() - start) / requests * 1000
+
+
+async def main_async(args) -> bool:
+    stack = full_stack(endpoint)
+    within_budget = True
+    profiles = get_route_profiles()
+    cases = (
+        ("GET  /api/v1/fraud/stats", "GET", "/api/v1/fraud/stats", b""),
+        ("POST /api/v1/vendor/claim/submit", "POST", "/api/v1/vendor/claim/submit", CLAIM_BODY),
+        ("POST /api/v1/fraud/analyze-claim", "POST", "/api/v1/fraud/analyze-claim", CLAIM_BODY),
+        ("GET  /health", "GET", "/health", b""),
+    )
+    for title, method, path, body in cases:
+        # Warm up both paths so imports and caches are not timed
+        await run(endpoint, method, path, body, 100)
+        await run(stack, method, path, body, 100)
+
+        bare_ms = await run(endpoint, method, path, body, args.requests)
+        stack_ms = await run(stack, method, path, body, args.requests)
+        overhead_ms = stack_ms - bare_ms
+        within_budget &= overhead_ms < args.max_overhead_ms
+        print(f"{title} ({profiles.profile_for(path)} profile):")
+        print(f"  bare endpoint: {bare_ms * 1000:8.1f}us per request")
+        print(f"  full stack:    {stack_ms * 1000:8.1f}us per request")
+        print(f"  overhead:      {overhead_ms * 1000:8.1f}us per request (budget {args.max_overhead_ms * 1000:.0f}us)")
+    return within_budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--max-overhead-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    if not asyncio.run(main_async(args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
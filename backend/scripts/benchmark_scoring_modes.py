@@ -0,0 +1,143 @@
+"""
+Compare claim scoring latency: AI fraud engine in-process vs over HTTP
+
+Usage (from backend/):
+    python scripts/benchmark_scoring_modes.py --claims 200
+    python scripts/benchmark_scoring_modes.py --endpoint http://localhost:8080/analyze-claim
+
+Without --endpoint the engine is started on a free local port with uvicorn.
+Both modes score the same claims, so the difference is the HTTP hop and
+JSON round trip. Requires the AI engine's dependencies (AI/fraud_engine/requirements.txt).
+"""
+
+import argparse
+import asyncio
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pydantic import BaseModel  # noqa: E402
+
+from app.fraud.executor import ScoringExecutor  # noqa: E402
+from app.fraud.scoring import DEFAULT_ENGINE_PATH, HttpEngineScorer, InProcessEngineScorer  # noqa: E402
+
+
+class BenchmarkClaim(BaseModel):
+    claim_id: int
+    vendor_id: str
+    amount: float
+    budget_id: int
+    allocation_id: int
+    invoice_hash: str
+    deputy_id: str
+    area: str
+    timestamp: datetime
+
+
+def make_claims(count: int):
+    rng = random.Random(7)
+    areas = ["Road Construction", "School Building", "Hospital Equipment", "IT Infrastructure"]
+    return [
+        BenchmarkClaim(
+            claim_id=100_000 + i,
+            vendor_id=f"vendor_{rng.randint(0, 24)}",
+            amount=rng.uniform(50_000, 5_000_000),
+            budget_id=rng.randint(1, 10),
+            allocation_id=rng.randint(0, 5),
+            invoice_hash=f"bench_{i}_{rng.randint(1000, 9999)}",
+            deputy_id=f"deputy_{rng.randint(1, 15)}",
+            area=rng.choice(areas),
+            timestamp=datetime.now() - timedelta(days=rng.randint(0, 30)),
+        )
+        for i in range(count)
+    ]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_engine(port: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=DEFAULT_ENGINE_PATH,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.25)
+    process.terminate()
+    raise RuntimeError("AI fraud engine did not become healthy within 60s")
+
+
+async def time_scorer(scorer, claims):
+    latencies = []
+    for claim in claims:
+        start = time.perf_counter()
+        await scorer.score(claim)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{name:<10} n={len(latencies):<5} mean={statistics.mean(latencies):8.2f}ms "
+        f"p50={statistics.median(latencies):8.2f}ms p95={p95:8.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=200)
+    parser.add_argument("--endpoint", help="Use an already running engine instead of starting one")
+    args = parser.parse_args()
+
+    claims = make_claims(args.claims)
+
+    executor = ScoringExecutor(max_workers=1)
+    inprocess = InProcessEngineScorer(executor)
+    await time_scorer(inprocess, claims[:5])  # warm up
+    inprocess_latencies = await time_scorer(inprocess, claims)
+    executor.shutdown()
+
+    engine = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        port = free_port()
+        engine = start_engine(port)
+        endpoint = f"http://127.0.0.1:{port}/analyze-claim"
+
+    try:
+        http = HttpEngineScorer(endpoint, timeout_seconds=60)
+        await time_scorer(http, claims[:5])
+        http_latencies = await time_scorer(http, claims)
+        await http.close()
+    finally:
+        if engine is not None:
+            engine.terminate()
+            engine.wait()
+
+    report("inprocess", inprocess_latencies)
+    report("http", http_latencies)
+    saved = statistics.mean(http_latencies) - statistics.mean(inprocess_latencies)
+    print(f"in-process saves {saved:.2f}ms per claim on average")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
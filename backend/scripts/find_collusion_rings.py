@@ -0,0 +1,59 @@
+"""
+Discover collusion rings across stored claim history
+
+Usage (from backend/):
+    python scripts/find_collusion_rings.py claims.jsonl
+    python scripts/find_collusion_rings.py claims.json --output ./data/collusion_rings.json --min-vendors 2 --min-shared-bids 3
+
+Reads a JSON array or JSON Lines export of claims (vendor/vendor_id or
+vendor_principal, deputy/deputy_id, area, amount), links vendors whose bids
+match within 5% under the same deputy and area, and writes ring membership
+to the file the fraud detection engine loads (fraud_collusion_rings_path).
+Schedule it nightly or after bulk imports.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.config.settings import get_settings  # noqa: E402
+from app.fraud.rings import CollusionRingIndex, find_collusion_rings  # noqa: E402
+
+
+def load_claims(path: Path):
+    text = path.read_text(encoding="utf-8").strip()
+    records = json.loads(text) if text.startswith("[") else [json.loads(line) for line in text.splitlines() if line]
+    for record in records:
+        yield {
+            "vendor": record.get("vendor") or record.get("vendor_id") or record.get("vendor_principal"),
+            "deputy": record.get("deputy") or record.get("deputy_id"),
+            "area": record.get("area"),
+            "amount": record.get("amount", 0),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("claims", type=Path)
+    parser.add_argument("--output", default=get_settings().fraud_collusion_rings_path)
+    parser.add_argument("--min-vendors", type=int, default=3)
+    parser.add_argument("--min-shared-bids", type=int, default=2, help="Matching bids needed to link two vendors")
+    args = parser.parse_args()
+
+    claims = list(load_claims(args.claims))
+    started = time.perf_counter()
+    rings = find_collusion_rings(claims, min_shared_bids=args.min_shared_bids, min_vendors=args.min_vendors)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    CollusionRingIndex(rings).save(args.output)
+    print(f"{len(rings)} rings over {len(claims)} claims in {elapsed_ms:.1f}ms -> {args.output}")
+    for ring in sorted(rings, key=lambda r: r.risk_score, reverse=True)[:10]:
+        print(f"  ring {ring.ring_id}: {len(ring.vendors)} vendors, {ring.linked_bids} linked bids, risk {ring.risk_score}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Record an import-time profile of the API
+
+Usage (from backend/):
+    python scripts/profile_imports.py                     # profiles `import app.main`
+    python scripts/profile_imports.py app.fraud.scoring --top 15 --output importtime.log
+
+Runs the import in a fresh interpreter with `-X importtime`, optionally saves
+the raw profile, and prints the slowest modules by cumulative and self time.
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def parse_importtime(stderr: str):
+    """Yield (self_us, cumulative_us, module) rows from -X importtime output"""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        yield int(self_us), int(cumulative_us), module.rstrip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("module", nargs="?", default="app.main")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--output", help="Write the raw -X importtime profile to this file")
+    args = parser.parse_args()
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {args.module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+
+    if args.output:
+        Path(args.output).write_text(result.stderr, encoding="utf-8")
+
+    rows = list(parse_importtime(result.stderr))
+    if result.returncode != 0:
+        print(f"import {args.module} failed; profile covers modules loaded before the error:")
+        print(result.stderr.strip().splitlines()[-1])
+
+    total_us = sum(self_us for self_us, _, _ in rows)
+    print(f"\n{len(rows)} modules imported in {total_us / 1000:.1f}ms\n")
+
+    for title, key in (("cumulative", 1), ("self", 0)):
+        print(f"Top {args.top} by {title} time:")
+        for row in sorted(rows, key=lambda r: r[key], reverse=True)[:args.top]:
+            print(f"  {row[key] / 1000:9.1f}ms  {row[2]}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Tests for the pure-ASGI logging, audit and validation middleware stack
+"""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.responses import StreamingResponse
+
+from app.middleware.logging import (
+    PerformanceMonitoringMiddleware,
+    RequestLoggingMiddleware,
+    SecurityAuditMiddleware,
+)
+from app.middleware.vaiidation import RequestBodyValidationMiddleware, RequestValidationMiddleware
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    # Added innermost first, as Starlette wraps each new middleware around the last
+    app.add_middleware(RequestBodyValidationMiddleware)
+    app.add_middleware(RequestValidationMiddleware)
+    app.add_middleware(SecurityAuditMiddleware)
+    app.add_middleware(PerformanceMonitoringMiddleware)
+    app.add_middleware(RequestLoggingMiddleware)
+
+    @app.get("/api/v1/fraud/stats")
+    async def stats(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.post("/api/v1/fraud/echo")
+    async def echo(request: Request):
+        return {"raw": (await request.body()).decode(), "json": await request.json()}
+
+    @app.get("/api/v1/fraud/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"{i}\n"
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    return app
+
+
+def test_response_headers_are_added_by_each_layer():
+    response = TestClient(make_app()).get("/api/v1/fraud/stats")
+
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == response.json()["request_id"]
+    assert "X-Process-Time" not in response.headers  # stamped once, by RateLimitMiddleware
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+
+def test_validated_json_body_is_replayed_to_the_endpoint():
+    payload = {"claim_id": 7, "items": [{"name": "asphalt"}]}
+    response = TestClient(make_app()).post("/api/v1/fraud/echo", json=payload)
+
+    assert response.status_code == 200
+    assert response.json()["json"] == payload
+    assert response.json()["raw"].startswith("{")
+
+
+def test_streaming_responses_pass_through_chunk_by_chunk():
+    with TestClient(make_app()).stream("GET", "/api/v1/fraud/stream") as response:
+        lines = list(response.iter_lines())
+
+    assert lines == ["0", "1", "2"]
+    assert "X-Request-ID" in response.headers
+
+
+def test_validation_errors_are_answered_by_the_middleware():
+    client = TestClient(make_app())
+
+    response = client.get("/api/v1/fraud/stats", headers={"user-agent": "sqlmap/1.7"})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Invalid user agent"}
+
+    response = client.post("/api/v1/fraud/echo", json={"note": "<script>alert(1)</script>"})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Invalid content in field: note"}
+
+
+@pytest.mark.asyncio
+async def test_non_http_scopes_are_passed_through():
+    seen = []
+
+    async def inner(scope, receive, send):
+        seen.append(scope["type"])
+
+    for middleware in (
+        RequestLoggingMiddleware,
+        PerformanceMonitoringMiddleware,
+        SecurityAuditMiddleware,
+        RequestValidationMiddleware,
+        RequestBodyValidationMiddleware,
+    ):
+        await middleware(inner)({"type": "lifespan"}, None, None)
+
+    assert seen == ["lifespan"] * 5
@@ -0,0 +1,110 @@
+"""
+Tests for the in-process metrics registry and its Prometheus exposition
+"""
+
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.logging import PerformanceMonitoringMiddleware
+from app.middleware.profiles import RouteProfiles
+from app.utils import metrics
+from app.utils.metrics import MetricsRegistry, RateMeter
+
+
+def test_exposition_follows_the_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("route", "status"))
+    in_flight = registry.gauge("in_flight", "In flight")
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+
+    requests.labels("/claims/{id}", "200").inc()
+    requests.inc(2, route='say "hi"\n', status="500")
+    in_flight.set(3)
+    latency.observe(0.05, route="/claims/{id}")
+    latency.observe(0.5, route="/claims/{id}")
+    latency.observe(7, route="/claims/{id}")
+
+    assert registry.expose().splitlines() == [
+        "# HELP in_flight In flight",
+        "# TYPE in_flight gauge",
+        "in_flight 3",
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/claims/{id}",le="0.1"} 1',
+        'latency_seconds_bucket{route="/claims/{id}",le="1"} 2',
+        'latency_seconds_bucket{route="/claims/{id}",le="+Inf"} 3',
+        'latency_seconds_sum{route="/claims/{id}"} 7.55',
+        'latency_seconds_count{route="/claims/{id}"} 3',
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{route="/claims/{id}",status="200"} 1',
+        'requests_total{route="say \\"hi\\"\\n",status="500"} 2',
+    ]
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.01, 0.1, 1.0))
+
+    assert latency.quantile(0.5) is None
+    for _ in range(90):
+        latency.observe(0.005)
+    for _ in range(10):
+        latency.observe(0.5)
+
+    assert abs(latency.quantile(0.5) - 0.01 * 50 / 90) < 1e-9
+    assert 0.1 < latency.quantile(0.95) < 1.0
+
+
+def test_concurrent_updates_are_not_lost():
+    registry = MetricsRegistry()
+    counter = registry.counter("hits_total", "Hits")
+
+    def hammer():
+        for _ in range(10_000):
+            counter.inc()
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.total() == 80_000
+
+
+def test_rate_meter_averages_over_its_window():
+    meter = RateMeter(window_seconds=10)
+    for second in range(1000, 1010):
+        meter.mark(5, now=second + 0.5)
+
+    assert meter.rate(now=1009.9) == 5.0
+    assert meter.rate(now=1014) == 2.5  # half the window has aged out
+
+
+def test_middleware_records_route_templates_and_feeds_realtime_stats():
+    app = FastAPI()
+    app.add_middleware(PerformanceMonitoringMiddleware, profiles=RouteProfiles({}))
+
+    @app.get("/api/v1/fraud/claim/{claim_id}/score")
+    async def score(claim_id: int):
+        return {"claim_id": claim_id}
+
+    series = metrics.http_requests_total.labels("GET", "/api/v1/fraud/claim/{claim_id}/score", "200")
+    before = series.get()
+    client = TestClient(app)
+    for claim_id in range(5):
+        client.get(f"/api/v1/fraud/claim/{claim_id}/score")
+    client.get("/nowhere")
+
+    assert series.get() - before == 5
+    assert metrics.http_requests_total.labels("GET", "unmatched", "404").get() >= 1
+
+    metrics.record_fraud_score("high")
+    stats = metrics.get_realtime_stats()
+    assert stats["throughput"]["requests_total"] >= 6
+    assert stats["latency_ms"]["p50"] is not None
+    assert stats["claims_scored_by_risk_level"]["high"] >= 1
+    assert "http_request_duration_seconds_bucket" in metrics.get_metrics_registry().expose()
@@ -0,0 +1,92 @@
+"""
+Tests for per-route full/light/none middleware profiles
+"""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.middleware.logging import RequestLoggingMiddleware, SecurityAuditMiddleware
+from app.middleware.profiles import PROFILE_FULL, PROFILE_LIGHT, PROFILE_NONE, RouteProfiles
+from app.middleware.vaiidation import RequestBodyValidationMiddleware, RequestValidationMiddleware
+from app.utils.exceptions import ConfigurationError
+
+RULES = {
+    "/health": PROFILE_NONE,
+    "/api/v1/fraud/analyze": PROFILE_LIGHT,
+    "/api/v1/fraud/analyze/secure": PROFILE_FULL,
+}
+
+
+def test_longest_whole_segment_prefix_wins():
+    profiles = RouteProfiles(RULES)
+
+    assert profiles.profile_for("/health") == PROFILE_NONE
+    assert profiles.profile_for("/healthz") == PROFILE_FULL
+    assert profiles.profile_for("/api/v1/fraud/analyze/claim") == PROFILE_LIGHT
+    assert profiles.profile_for("/api/v1/fraud/analyze/secure/1") == PROFILE_FULL
+    assert profiles.profile_for("/api/v1/citizen/projects") == PROFILE_FULL
+
+
+def test_resolve_builds_a_table_of_static_routes():
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {}
+
+    @app.post("/api/v1/fraud/analyze/claim")
+    async def analyze():
+        return {}
+
+    @app.get("/api/v1/fraud/claim/{claim_id}/score")
+    async def score(claim_id: int):
+        return {}
+
+    profiles = RouteProfiles(RULES)
+    table = profiles.resolve(app.routes)
+
+    assert table["/health"] == PROFILE_NONE
+    assert table["/api/v1/fraud/analyze/claim"] == PROFILE_LIGHT
+    assert "/api/v1/fraud/claim/{claim_id}/score" not in table
+    assert profiles.profile_for("/api/v1/fraud/claim/7/score") == PROFILE_FULL
+
+
+def test_unknown_profile_is_a_configuration_error():
+    with pytest.raises(ConfigurationError):
+        RouteProfiles({"/health": "skip"})
+
+
+def make_app(profiles: RouteProfiles) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestBodyValidationMiddleware, profiles=profiles)
+    app.add_middleware(RequestValidationMiddleware, profiles=profiles, rate_limit=False)
+    app.add_middleware(SecurityAuditMiddleware, profiles=profiles)
+    app.add_middleware(RequestLoggingMiddleware, profiles=profiles)
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def echo(request: Request):
+        return {"ok": True}
+
+    return app
+
+
+def test_profiles_scale_the_checks_each_route_gets():
+    client = TestClient(make_app(RouteProfiles(RULES)))
+    attack = {"note": "<script>alert(1)</script>"}
+
+    # Full inspection on public routes
+    assert client.post("/api/v1/citizen/report", json=attack).status_code == 422
+    assert client.get("/api/v1/citizen/projects", headers={"user-agent": "sqlmap"}).status_code == 422
+
+    # Light routes skip content scans but keep header checks and summary logging
+    light = client.post("/api/v1/fraud/analyze/claim", json=attack, headers={"user-agent": "sqlmap"})
+    assert light.status_code == 200
+    assert "X-Request-ID" in light.headers
+    assert client.post("/api/v1/fraud/analyze/claim", json=attack, headers={"x-bad": "a" * 9000}).status_code == 422
+
+    # No middleware at all on health checks
+    health = client.get("/health", headers={"user-agent": "sqlmap"})
+    assert health.status_code == 200
+    assert "X-Request-ID" not in health.headers
+    assert "X-Frame-Options" not in health.headers
@@ -0,0 +1,55 @@
+"""
+Tests for ordinary traffic through the application's full middleware stack
+"""
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.middleware.stack import install_middleware
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    install_middleware(app)
+
+    @app.get("/api/v1/fraud/reports/export")
+    async def export(request: Request):
+        return dict(request.query_params)
+
+    @app.post("/api/v1/vendor/profile")
+    async def profile(request: Request):
+        return await request.json()
+
+    return TestClient(app, base_url="http://localhost")
+
+
+def test_multi_parameter_queries_pass():
+    response = make_client().get(
+        "/api/v1/fraud/reports/export",
+        params={"format": "csv", "since": "2026-01-01T00:00:00", "until": "2026-02-01T00:00:00"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["since"] == "2026-01-01T00:00:00"
+
+
+def test_json_bodies_with_ampersands_and_short_words_pass():
+    payload = {"vendor": "Smith & Sons", "id": "ps-42", "notes": "cat 5 cabling, ls series relays; R&D | QA"}
+    response = make_client().post("/api/v1/vendor/profile", json=payload)
+
+    assert response.status_code == 200
+    assert response.json() == payload
+
+
+def test_injection_is_still_rejected_in_queries_and_bodies():
+    client = make_client()
+
+    response = client.get("/api/v1/fraud/reports/export", params={"format": "csv; cat /etc/passwd"})
+    assert response.status_code == 422
+
+    response = client.get("/api/v1/fraud/reports/export", params={"q": "1' OR '1'='1"})
+    assert response.status_code == 422
+
+    response = client.post("/api/v1/vendor/profile", json={"vendor": "$(whoami)"})
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Invalid content in field: vendor"
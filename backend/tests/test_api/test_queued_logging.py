@@ -0,0 +1,137 @@
+"""
+Tests for the bounded, queued logging pipeline
+"""
+
+import logging
+import threading
+import time
+
+import pytest
+
+from app.utils import logging as app_logging
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self, delay: float = 0.0, gate: threading.Event = None):
+        super().__init__()
+        self.delay = delay
+        self.gate = gate
+        self.messages = []
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(self.delay)
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def queued_logger(monkeypatch):
+    """A fresh logger with the given handler, routed through the queue"""
+    created = []
+
+    def make(handler, name="test.queued", size=1000, policy="drop"):
+        monkeypatch.setattr(app_logging.settings, "log_queue_size", size)
+        monkeypatch.setattr(app_logging.settings, "log_queue_policy", policy)
+        monkeypatch.setattr(app_logging.settings, "log_queue_block_timeout", 0.01)
+        logger = logging.getLogger(name)
+        logger.handlers = [handler]
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        created.append(logger)
+        app_logging.start_queued_logging([name])
+        return logger
+
+    yield make
+    app_logging.stop_queued_logging()
+    for logger in created:
+        logger.handlers = []
+
+
+def test_slow_handlers_do_not_delay_the_caller(queued_logger):
+    handler = RecordingHandler(delay=0.02)
+    logger = queued_logger(handler)
+
+    started = time.perf_counter()
+    for i in range(20):
+        logger.info("claim %d scored", i)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.1  # writing them directly would take 0.4s
+    app_logging.stop_queued_logging()
+    assert handler.messages == [f"claim {i} scored" for i in range(20)]
+
+
+def test_full_queue_drops_and_counts(queued_logger):
+    gate = threading.Event()
+    handler = RecordingHandler(gate=gate)
+    logger = queued_logger(handler, size=2)
+    dropped_before = app_logging.get_log_queue_stats()["dropped"]
+
+    for i in range(10):
+        logger.info("event %d", i)
+
+    stats = app_logging.get_log_queue_stats()
+    assert stats["enabled"] and stats["capacity"] == 2
+    # One record may already be held by the listener thread, two more fill the queue
+    assert stats["dropped"] - dropped_before >= 7
+
+    gate.set()
+    app_logging.stop_queued_logging()
+    assert 2 <= len(handler.messages) <= 3
+    assert handler.messages[0] == "event 0"
+
+
+def test_block_policy_waits_then_drops(queued_logger):
+    gate = threading.Event()
+    logger = queued_logger(RecordingHandler(gate=gate), size=1, policy="block")
+    dropped_before = app_logging.get_log_queue_stats()["dropped"]
+
+    started = time.perf_counter()
+    for i in range(5):
+        logger.info("event %d", i)
+
+    assert time.perf_counter() - started >= 0.02  # waited for room at least twice
+    assert app_logging.get_log_queue_stats()["dropped"] > dropped_before
+    gate.set()
+
+
+def test_records_reach_only_their_own_loggers_handlers(queued_logger):
+    audit_handler = RecordingHandler()
+    fraud_handler = RecordingHandler()
+    audit = queued_logger(audit_handler, name="test.audit")
+    app_logging.stop_queued_logging()
+
+    fraud = logging.getLogger("test.fraud")
+    fraud.handlers = [fraud_handler]
+    fraud.propagate = False
+    fraud.setLevel(logging.INFO)
+    app_logging.start_queued_logging(["test.audit", "test.fraud"])
+
+    audit.info("user action")
+    fraud.warning("claim flagged")
+    app_logging.stop_queued_logging()
+    fraud.handlers = []
+
+    assert audit_handler.messages == ["user action"]
+    assert fraud_handler.messages == ["claim flagged"]
+    assert audit.handlers == [audit_handler]  # direct handlers are restored on stop
+
+
+def test_concurrent_loggers_are_all_counted(queued_logger):
+    logger = queued_logger(RecordingHandler(), size=50)
+    before = app_logging.get_log_queue_stats()
+
+    def hammer():
+        for i in range(2_000):
+            logger.info("event %d", i)
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = app_logging.get_log_queue_stats()
+    counted = (stats["queued"] - before["queued"]) + (stats["dropped"] - before["dropped"])
+    assert counted == 16_000
@@ -0,0 +1,179 @@
+"""
+Tests for the shared sliding-window rate limiter
+"""
+
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import StreamingResponse
+
+from app.middleware import vaiidation
+from app.middleware.logging import RequestLoggingMiddleware
+from app.middleware.vaiidation import RateLimitMiddleware
+from app.utils.rate_limit import InMemoryRateLimitBackend, RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_rejects_past_limit_with_retry_after():
+    limiter = RateLimiter(InMemoryRateLimitBackend(), window_seconds=60)
+
+    results = [await limiter.hit("ip:1.2.3.4", 5) for _ in range(6)]
+
+    assert all(r.allowed for r in results[:5])
+    assert not results[5].allowed
+    assert int(results[5].headers()["Retry-After"]) >= 1
+    assert limiter.get_stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_are_limited_independently():
+    limiter = RateLimiter(InMemoryRateLimitBackend(), window_seconds=60)
+
+    for _ in range(3):
+        await limiter.hit("ip:a", 3)
+
+    assert not (await limiter.hit("ip:a", 3)).allowed
+    assert (await limiter.hit("ip:b", 3)).allowed
+
+
+@pytest.mark.asyncio
+async def test_principal_limit_applies_across_ips():
+    limiter = RateLimiter(InMemoryRateLimitBackend(), window_seconds=60)
+
+    for i in range(2):
+        assert (await limiter.check(f"10.0.0.{i}", 100, principal_id="p1", principal_limit=2)).allowed
+
+    result = await limiter.check("10.0.0.9", 100, principal_id="p1", principal_limit=2)
+    assert not result.allowed
+    assert result.key == "principal:p1"
+
+
+@pytest.mark.asyncio
+async def test_memory_is_bounded():
+    backend = InMemoryRateLimitBackend(max_keys=100)
+    limiter = RateLimiter(backend, window_seconds=60)
+
+    for i in range(1000):
+        await limiter.hit(f"ip:{i}", 10)
+
+    assert len(backend) == 100
+
+
+@pytest.mark.asyncio
+async def test_previous_window_is_weighted(monkeypatch):
+    backend = InMemoryRateLimitBackend()
+    limiter = RateLimiter(backend, window_seconds=60)
+    clock = [6000.0]
+    monkeypatch.setattr("app.utils.rate_limit.time.time", lambda: clock[0])
+
+    for _ in range(10):
+        await limiter.hit("ip:a", 10)
+
+    # Halfway through the next window half of the previous window still counts
+    clock[0] = 6090.0
+    results = [await limiter.hit("ip:a", 10) for _ in range(6)]
+    assert [r.allowed for r in results] == [True] * 5 + [False]
+
+
+@pytest.mark.asyncio
+async def test_expired_keys_are_evicted(monkeypatch):
+    backend = InMemoryRateLimitBackend()
+    limiter = RateLimiter(backend, window_seconds=60)
+    clock = [6000.0]
+    monkeypatch.setattr("app.utils.rate_limit.time.time", lambda: clock[0])
+
+    await limiter.hit("ip:old", 10)
+    clock[0] = 6200.0
+    await limiter.hit("ip:new", 10)
+
+    assert len(backend) == 1
+
+
+@pytest.fixture
+def limited_app(monkeypatch):
+    limiter = RateLimiter(InMemoryRateLimitBackend(), window_seconds=60)
+    monkeypatch.setattr(vaiidation, "get_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(vaiidation.settings, "rate_limit_requests", 100)
+    monkeypatch.setattr(vaiidation.settings, "rate_limit_principal_requests", 2)
+    resolved = []
+
+    async def resolve_principal(request):
+        principal = request.headers.get("X-Test-Principal")
+        resolved.append(principal)
+        return principal
+
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, principal_resolver=resolve_principal, enabled=True)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"{i}\n"
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    return TestClient(app), resolved
+
+
+def test_middleware_stamps_process_time_and_streams(limited_app):
+    client, _ = limited_app
+
+    with client.stream("GET", "/stream") as response:
+        assert list(response.iter_lines()) == ["0", "1", "2"]
+
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+
+def test_middleware_limits_principals_across_requests(limited_app):
+    client, resolved = limited_app
+    headers = {"X-Test-Principal": "p1"}
+
+    assert [client.get("/stream", headers=headers).status_code for _ in range(2)] == [200, 200]
+    response = client.get("/stream", headers=headers)
+
+    assert response.status_code == 429
+    assert response.json() == {"error": "Rate limit exceeded"}
+    assert response.headers["X-RateLimit-Limit"] == "2"
+    assert "X-Process-Time" not in response.headers
+    assert client.get("/stream").status_code == 200  # anonymous callers only face the IP limit
+    assert resolved == ["p1", "p1", "p1", None]
+
+
+def test_process_time_is_stamped_once_in_one_format(monkeypatch):
+    monkeypatch.setattr(vaiidation, "get_rate_limiter", lambda: RateLimiter(InMemoryRateLimitBackend(), 60))
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(RateLimitMiddleware, enabled=True)
+
+    @app.get("/api/v1/fraud/stats")
+    async def stats():
+        return {}
+
+    response = TestClient(app).get("/api/v1/fraud/stats")
+
+    assert response.headers.get_list("X-Process-Time") == [response.headers["X-Process-Time"]]
+    assert re.fullmatch(r"\d+\.\d{4}", response.headers["X-Process-Time"])
+
+
+@pytest.mark.parametrize("trusted, expected", [(False, "testclient"), (True, "203.0.113.9")])
+def test_forwarded_for_is_only_used_when_trusted(monkeypatch, trusted, expected):
+    keys = []
+
+    class RecordingLimiter(RateLimiter):
+        async def hit(self, key, limit):
+            keys.append(key)
+            return await super().hit(key, limit)
+
+    monkeypatch.setattr(vaiidation, "get_rate_limiter", lambda: RecordingLimiter(InMemoryRateLimitBackend(), 60))
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, enabled=True, trust_forwarded_for=trusted)
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    TestClient(app).get("/ping", headers={"X-Forwarded-For": "203.0.113.9, 10.0.0.1"})
+
+    assert keys == [f"ip:{expected}"]
@@ -0,0 +1,93 @@
+"""
+Tests for the startup warm-up state and readiness probe
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.exceptions import ServiceWarmingUpError
+from app.utils.readiness import WarmupState
+
+
+def make_app(warmup: WarmupState) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ready")
+    async def ready():
+        return warmup.readiness_response()
+
+    @app.post("/score")
+    async def score():
+        await warmup.wait_for("ml_model", timeout=0.05)
+        return {"scored": True}
+
+    return app
+
+
+def test_ready_is_503_until_warm_up_finishes_then_200():
+    warmup = WarmupState(("ml_model", "hedera"))
+    client = TestClient(make_app(warmup))
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+    assert response.json()["components"] == {"ml_model": False, "hedera": False}
+
+    response = client.post("/score")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "2"
+
+    async def loaded():
+        pass
+
+    assert asyncio.run(warmup.run([("ml_model", loaded), ("hedera", loaded)]))
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["duration_ms"] is not None
+    assert client.post("/score").json() == {"scored": True}
+
+
+@pytest.mark.asyncio
+async def test_requests_wait_for_the_components_they_need():
+    warmup = WarmupState(("ml_model", "hedera"))
+    release_hedera = asyncio.Event()
+
+    async def load_model():
+        await asyncio.sleep(0.02)
+
+    running = asyncio.create_task(warmup.run([("ml_model", load_model), ("hedera", release_hedera.wait)]))
+
+    # Scoring only needs the model, so it proceeds while Hedera is still connecting
+    await warmup.wait_for("ml_model", timeout=1.0)
+    assert not warmup.ready
+
+    with pytest.raises(ServiceWarmingUpError):
+        await warmup.wait_for("hedera", timeout=0.02)
+
+    release_hedera.set()
+    await running
+    assert warmup.ready
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_rejects_without_waiting_out_the_timeout():
+    warmup = WarmupState(("ml_model",))
+
+    async def broken():
+        raise RuntimeError("model artifact unreadable")
+
+    assert not await warmup.run([("ml_model", broken)])
+    assert warmup.status()["error"] == "model artifact unreadable"
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    with pytest.raises(ServiceWarmingUpError) as excinfo:
+        await warmup.wait_for("ml_model", timeout=5.0)
+    assert loop.time() - started < 1.0
+    assert excinfo.value.components == ["ml_model"]
+    assert warmup.readiness_response().status_code == 503
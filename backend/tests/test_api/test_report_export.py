@@ -0,0 +1,61 @@
+"""
+Tests for the fraud report export endpoint behind the application's middleware
+"""
+
+import asyncio
+import csv
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+pytest.importorskip("jwt")
+
+from app.api import reports  # noqa: E402
+from app.auth.middleware import get_current_user  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.middleware.stack import install_middleware  # noqa: E402
+from app.schemas import FraudResult  # noqa: E402
+
+START = datetime(2026, 1, 1)
+
+
+async def seed(url):
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine)() as session:
+        session.add_all(
+            FraudResult(claim_id=i, score=i * 10, risk_level="low", flags="", reasoning="",
+                        confidence=0.9, created_at=START + timedelta(days=i))
+            for i in range(1, 8)
+        )
+        await session.commit()
+    await engine.dispose()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'export.db'}"
+    asyncio.run(seed(url))
+    monkeypatch.setattr(reports, "AsyncSessionLocal", async_sessionmaker(create_async_engine(url)))
+
+    app = FastAPI()
+    install_middleware(app)
+    app.include_router(reports.router, prefix="/api/v1/fraud")
+    app.dependency_overrides[get_current_user] = lambda: {"principal_id": "auditor-1", "role": "main_government"}
+    return TestClient(app, base_url="http://localhost")
+
+
+def test_export_filters_by_window_through_the_middleware_stack(client):
+    response = client.get(
+        "/api/v1/fraud/reports/export?format=csv&since=2026-01-03T00:00:00&until=2026-01-06T00:00:00"
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["claim_id"]) for row in rows] == [2, 3, 4]  # created 2026-01-03 .. 2026-01-05
@@ -0,0 +1,93 @@
+"""
+Tests for parsing JSON request bodies once and validating them iteratively
+"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from app.middleware.vaiidation import RequestBodyValidationMiddleware
+from app.utils import request_body
+from app.utils.exceptions import ValidationError
+from app.utils.request_body import ParsedBodyRoute
+
+
+class Claim(BaseModel):
+    claim_id: int
+    area: str
+
+
+@pytest.fixture
+def json_loads_calls(monkeypatch):
+    calls = []
+    real_loads = json.loads
+
+    def counting_loads(*args, **kwargs):
+        calls.append(1)
+        return real_loads(*args, **kwargs)
+
+    monkeypatch.setattr(request_body.json, "loads", counting_loads)
+    return calls
+
+
+def test_body_is_decoded_once_for_middleware_and_endpoint(json_loads_calls):
+    app = FastAPI()
+    app.router.route_class = ParsedBodyRoute
+    app.add_middleware(RequestBodyValidationMiddleware)
+
+    @app.post("/claims")
+    async def create_claim(claim: Claim):
+        return {"claim_id": claim.claim_id, "area": claim.area}
+
+    response = TestClient(app).post("/claims", json={"claim_id": 7, "area": "roads"})
+
+    assert len(json_loads_calls) == 1  # before response.json() adds its own call
+    assert response.status_code == 200
+    assert response.json() == {"claim_id": 7, "area": "roads"}
+
+
+def test_endpoint_parses_on_its_own_without_middleware(json_loads_calls):
+    app = FastAPI()
+    app.router.route_class = ParsedBodyRoute
+
+    @app.post("/claims")
+    async def create_claim(claim: Claim):
+        return {"claim_id": claim.claim_id}
+
+    client = TestClient(app)
+    assert client.post("/claims", json={"claim_id": 3, "area": "roads"}).json() == {"claim_id": 3}
+    assert client.post("/claims", content=b"{not json", headers={"content-type": "application/json"}).status_code == 422
+
+
+def make_request():
+    return Request({"type": "http", "method": "POST", "headers": [], "client": ("127.0.0.1", 1)})
+
+
+@pytest.mark.asyncio
+async def test_walker_bounds_depth_without_recursion():
+    middleware = RequestBodyValidationMiddleware(app=None)
+    deep = current = {}
+    for _ in range(10_000):
+        current["a"] = {}
+        current = current["a"]
+
+    with pytest.raises(ValidationError):
+        await middleware.validate_json_content(deep, make_request())
+
+    shallow = {"a": [{"b": ["x"] * 10}] * 10}
+    await middleware.validate_json_content(shallow, make_request())
+
+
+@pytest.mark.asyncio
+async def test_walker_reports_first_bad_field_in_document_order():
+    middleware = RequestBodyValidationMiddleware(app=None)
+    data = {"items": [{"note": "fine"}, {"note": "x" * 10_001}], "later": "y" * 10_001}
+
+    with pytest.raises(ValidationError) as exc_info:
+        await middleware.validate_json_content(data, make_request())
+
+    assert "items[1].note" in str(exc_info.value.detail)
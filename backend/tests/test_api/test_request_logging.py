@@ -0,0 +1,90 @@
+"""
+Tests for level-gated, sampled request logging
+"""
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.logging import RequestLoggingMiddleware
+from app.middleware.profiles import RouteProfiles
+
+LOGGER = "app.middleware.logging"
+
+
+def make_client(sample_rate=1.0, slow_seconds=5.0) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(
+        RequestLoggingMiddleware,
+        profiles=RouteProfiles({}),
+        sample_rate=sample_rate,
+        slow_seconds=slow_seconds,
+    )
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @app.get("/fail")
+    async def fail():
+        return JSONResponse({"detail": "boom"}, status_code=500)
+
+    return TestClient(app)
+
+
+def messages(caplog):
+    return [record.getMessage().split(":")[0] for record in caplog.records if record.name == LOGGER]
+
+
+@pytest.fixture
+def client_info_calls(monkeypatch):
+    calls = []
+    real = RequestLoggingMiddleware.get_client_info
+
+    def counting(self, request):
+        calls.append(1)
+        return real(self, request)
+
+    monkeypatch.setattr(RequestLoggingMiddleware, "get_client_info", counting)
+    return calls
+
+
+def test_nothing_is_built_when_the_level_is_disabled(caplog, client_info_calls):
+    caplog.set_level(logging.WARNING, logger=LOGGER)
+
+    response = make_client().get("/ok")
+
+    assert response.status_code == 200
+    assert "X-Request-ID" in response.headers
+    assert messages(caplog) == []
+    assert client_info_calls == []
+
+
+def test_debug_level_adds_request_and_response_details(caplog):
+    caplog.set_level(logging.DEBUG, logger=LOGGER)
+
+    make_client().get("/ok")
+
+    assert messages(caplog) == ["REQUEST", "REQUEST_DETAILS", "RESPONSE_SUCCESS", "RESPONSE_DETAILS"]
+
+
+def test_sampled_out_successes_are_skipped_but_errors_are_logged_in_full(caplog):
+    caplog.set_level(logging.INFO, logger=LOGGER)
+    client = make_client(sample_rate=0.0)
+
+    client.get("/ok")
+    assert messages(caplog) == []
+
+    client.get("/fail")
+    assert messages(caplog) == ["REQUEST", "RESPONSE_ERROR"]
+
+
+def test_slow_requests_are_always_logged(caplog):
+    caplog.set_level(logging.INFO, logger=LOGGER)
+
+    make_client(sample_rate=0.0, slow_seconds=-1).get("/ok")
+
+    assert messages(caplog) == ["REQUEST", "RESPONSE_SUCCESS", "SLOW_REQUEST"]
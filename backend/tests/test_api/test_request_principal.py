@@ -0,0 +1,57 @@
+"""
+Tests for sharing one token verification between rate limiting and auth
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+pytest.importorskip("jwt")
+
+from app.auth import middleware as auth  # noqa: E402
+from app.middleware.vaiidation import RateLimitMiddleware  # noqa: E402
+
+
+@pytest.fixture
+def verify_calls(monkeypatch):
+    calls = []
+
+    async def verify_token(token):
+        calls.append(token)
+        if token != "good-token":
+            raise ValueError("bad signature")
+        return {"principal_id": "principal-1", "role": "deputy"}
+
+    monkeypatch.setattr(auth.principal_auth_service, "verify_token", verify_token)
+    return calls
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, principal_resolver=auth.get_request_principal, enabled=True)
+
+    @app.get("/me")
+    async def me(user: dict = Depends(auth.get_current_user)):
+        return user
+
+    return TestClient(app)
+
+
+def test_token_is_verified_once_per_request(verify_calls):
+    client = make_client()
+
+    response = client.get("/me", headers={"Authorization": "Bearer good-token"})
+    assert response.status_code == 200
+    assert response.json()["principal_id"] == "principal-1"
+    assert verify_calls == ["good-token"]
+
+    # The cache lives on the request, not across requests
+    client.get("/me", headers={"Authorization": "Bearer good-token"})
+    assert verify_calls == ["good-token", "good-token"]
+
+
+def test_invalid_tokens_are_not_cached(verify_calls):
+    response = make_client().get("/me", headers={"Authorization": "Bearer forged"})
+
+    assert response.status_code == 401
+    assert verify_calls == ["forged", "forged"]
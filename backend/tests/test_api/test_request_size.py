@@ -0,0 +1,126 @@
+"""
+Tests for streaming request-size limits and chunked upload hashing
+"""
+
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import FastAPI, Request, UploadFile
+from fastapi.testclient import TestClient
+
+from app.middleware.vaiidation import RequestSizeLimitMiddleware
+from app.utils.exceptions import PayloadTooLargeError
+from app.utils.uploads import hash_upload
+
+
+def make_app(calls):
+    app = FastAPI()
+    app.add_middleware(
+        RequestSizeLimitMiddleware,
+        default_limit=100,
+        route_limits={"/upload": 1000, "/upload/small": 10},
+    )
+
+    @app.post("/{path:path}")
+    async def consume(request: Request):
+        calls.append(1)
+        return {"size": len(await request.body())}
+
+    return app
+
+
+def test_declared_oversize_body_is_refused_before_the_app_runs():
+    calls = []
+    response = TestClient(make_app(calls)).post("/claims", content=b"x" * 101)
+
+    assert response.status_code == 413
+    assert "100 byte limit" in response.json()["detail"]
+    assert calls == []
+
+
+def test_chunked_body_is_cut_off_at_the_limit():
+    calls = []
+
+    def chunks():
+        for _ in range(50):
+            yield b"x" * 30
+
+    response = TestClient(make_app(calls)).post("/claims", content=chunks())
+
+    assert response.status_code == 413
+
+
+def test_longest_matching_route_prefix_sets_the_limit():
+    client = TestClient(make_app([]))
+
+    assert client.post("/claims", content=b"x" * 100).json() == {"size": 100}
+    assert client.post("/upload", content=b"x" * 500).json() == {"size": 500}
+    assert client.post("/upload/small", content=b"x" * 11).status_code == 413
+
+
+def test_route_prefixes_match_whole_segments():
+    middleware = RequestSizeLimitMiddleware(None, default_limit=100, route_limits={"/upload": 1000})
+
+    assert middleware.limit_for("/upload") == 1000
+    assert middleware.limit_for("/upload/files/1") == 1000
+    assert middleware.limit_for("/uploadX") == 100
+    assert middleware.limit_for("/uploads/1") == 100
+
+
+@pytest.mark.asyncio
+async def test_receive_stream_is_not_read_past_the_limit():
+    pulled = []
+    sent = []
+
+    async def receive():
+        pulled.append(1)
+        return {"type": "http.request", "body": b"x" * 40, "more_body": True}
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send):
+        while (await receive())["type"] == "http.request":
+            pass
+        raise RuntimeError("client disconnected")
+
+    scope = {"type": "http", "method": "POST", "path": "/claims", "headers": []}
+    await RequestSizeLimitMiddleware(app, default_limit=100, route_limits={})(scope, receive, send)
+
+    assert len(pulled) == 3  # 120 bytes crosses the 100 byte limit
+    assert sent[0]["status"] == 413
+
+
+@pytest.mark.asyncio
+async def test_hash_upload_reads_in_chunks_without_copying(tmp_path, monkeypatch):
+    content = os.urandom(300_000)
+    upload = UploadFile(file=io.BytesIO(content), filename="invoice.pdf")
+    reads = []
+    real_read = upload.read
+
+    async def counting_read(size=-1):
+        reads.append(size)
+        return await real_read(size)
+
+    monkeypatch.setattr(upload, "read", counting_read)
+    monkeypatch.chdir(tmp_path)
+
+    digest = await hash_upload(upload, max_bytes=1_000_000, chunk_size=4096)
+
+    assert digest.size == len(content)
+    assert digest.sha256 == hashlib.sha256(content).hexdigest()
+    assert set(reads) == {4096}
+    assert list(tmp_path.iterdir()) == []  # nothing written to disk
+    assert await real_read() == content  # rewound for whoever stores it
+
+
+@pytest.mark.asyncio
+async def test_hash_upload_stops_over_the_limit():
+    upload = UploadFile(file=io.BytesIO(b"x" * 10_000), filename="big.pdf")
+
+    with pytest.raises(PayloadTooLargeError):
+        await hash_upload(upload, max_bytes=5_000, chunk_size=1024)
+
+    assert upload.file.tell() == 5_120  # stopped at the first chunk past the limit
@@ -0,0 +1,39 @@
+"""
+Tests for the prefiltered security pattern matcher
+"""
+
+import random
+import re
+
+from app.middleware.vaiidation import RequestValidationMiddleware
+
+TOKENS = [
+    "/api/v1/", "claim", "42", "?", "=", "&", ";", "'", '"', " or ", " and ", "union", " select ",
+    "DROP TABLE", "<script>", "</script>", "javascript:", "onload =", "<iframe>", "</iframe>",
+    "../", "..%2f", "%2e%2e/", "..\\", "cat", "catalog", "ids", " id ", "> /dev/null", "|", "`",
+    "$", "like", "Road Works", "-", "_", "Ward 12", "identity", "ONERROR=", "Update from",
+]
+
+
+def legacy_search(value):
+    for threat_type, patterns in RequestValidationMiddleware.SECURITY_PATTERNS.items():
+        for pattern in patterns:
+            if re.search(pattern, value, re.IGNORECASE):
+                return threat_type, pattern
+    return None
+
+
+def test_matcher_agrees_with_per_pattern_loop():
+    rng = random.Random(17)
+    matcher = RequestValidationMiddleware.security_matcher
+
+    for _ in range(5000):
+        value = "".join(rng.choice(TOKENS) for _ in range(rng.randint(1, 6)))
+        assert matcher.search(value) == legacy_search(value), value
+
+
+def test_clean_input_skips_confirmatory_patterns():
+    matcher = RequestValidationMiddleware.security_matcher
+
+    assert matcher.search("/api/v1/fraud/claim/1042/score") is None
+    assert matcher.search("<script>alert(1)</script>") == ("xss", r'<script[^>]*>.*?</script>')
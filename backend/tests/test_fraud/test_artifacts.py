@@ -0,0 +1,60 @@
+"""
+Tests for ML model artifact persistence
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from app.fraud.artifacts import load_model_artifact, save_model_artifact
+from app.fraud.retraining import ModelBundle, fit_anomaly_model
+
+FEATURES = ["amount", "vendor_submissions_count", "time_since_last_submission",
+            "amount_vs_avg", "approval_speed", "weekend_submission"]
+
+
+def _bundle() -> ModelBundle:
+    scaler, model, duration_ms = fit_anomaly_model(np.random.RandomState(0).rand(40, len(FEATURES)))
+    return ModelBundle(
+        version=4,
+        scaler=scaler,
+        model=model,
+        trained_at=datetime.now(),
+        training_duration_ms=duration_ms,
+        training_samples=40
+    )
+
+
+def test_artifact_round_trip(tmp_path):
+    path = str(tmp_path / "models" / "fraud_detector.pkl")
+    bundle = _bundle()
+
+    content_hash = save_model_artifact(bundle, FEATURES, path)
+    scaler, model, metadata = load_model_artifact(path, FEATURES)
+
+    assert metadata["content_sha256"] == content_hash
+    assert metadata["version"] == 4
+    sample = np.ones((1, len(FEATURES)))
+    assert model.decision_function(scaler.transform(sample))[0] == \
+        bundle.model.decision_function(bundle.scaler.transform(sample))[0]
+
+
+def test_stale_feature_schema_is_ignored(tmp_path):
+    path = str(tmp_path / "fraud_detector.pkl")
+    save_model_artifact(_bundle(), FEATURES, path)
+
+    assert load_model_artifact(path, FEATURES[:-1] + ["new_feature"]) is None
+
+
+def test_tampered_artifact_is_ignored(tmp_path):
+    path = tmp_path / "fraud_detector.pkl"
+    save_model_artifact(_bundle(), FEATURES, str(path))
+
+    with open(path, "ab") as f:
+        f.write(b"\x00")
+
+    assert load_model_artifact(str(path), FEATURES) is None
+
+
+def test_missing_artifact(tmp_path):
+    assert load_model_artifact(str(tmp_path / "absent.pkl"), FEATURES) is None
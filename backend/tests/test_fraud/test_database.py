@@ -0,0 +1,86 @@
+"""
+Tests for the async database engine, session dependency and schema setup
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import app.database as database
+from app.schemas import FraudResult
+
+
+@pytest_asyncio.fixture
+async def sqlite_db(tmp_path, monkeypatch):
+    """Point the module's engine and session factory at a temporary SQLite file"""
+    engine = database.create_engine_for(f"sqlite+aiosqlite:///{tmp_path / 'fraud.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(
+        database, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    )
+    await database.init_db()
+    yield engine
+    await database.close_db()
+
+
+@pytest.mark.asyncio
+async def test_connections_use_wal_and_the_tuned_pragmas(sqlite_db):
+    async with sqlite_db.connect() as conn:
+        assert await conn.scalar(text("PRAGMA journal_mode")) == "wal"
+        assert await conn.scalar(text("PRAGMA synchronous")) == 1  # NORMAL
+        assert await conn.scalar(text("PRAGMA foreign_keys")) == 1
+        assert await conn.scalar(text("PRAGMA busy_timeout")) == database.settings.sqlite_busy_timeout_ms
+
+
+@pytest.mark.asyncio
+async def test_get_db_session_round_trip(sqlite_db):
+    sessions = database.get_db()
+    db = await anext(sessions)
+    db.add(FraudResult(claim_id=7, score=82, risk_level="critical", confidence=0.8))
+    await db.commit()
+    await sessions.aclose()
+
+    sessions = database.get_db()
+    db = await anext(sessions)
+    stored = (await db.execute(select(FraudResult).where(FraudResult.claim_id == 7))).scalar_one()
+    await sessions.aclose()
+
+    assert (stored.score, stored.risk_level) == (82, "critical")
+    assert stored.created_at is not None
+
+
+@pytest.mark.asyncio
+async def test_close_db_releases_pooled_connections(sqlite_db):
+    async with database.AsyncSessionLocal() as db:
+        await db.execute(text("SELECT 1"))
+    assert sqlite_db.pool.checkedin() == 1
+
+    await database.close_db()
+
+    assert sqlite_db.pool.checkedin() == 0
+
+
+@pytest.mark.asyncio
+async def test_init_db_upgrades_indexes_on_existing_tables(tmp_path, monkeypatch):
+    engine = database.create_engine_for(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    # The fraud_results table as created before the composite and partial indexes
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TABLE fraud_results (id INTEGER PRIMARY KEY, claim_id INTEGER NOT NULL, "
+            "score INTEGER NOT NULL, risk_level VARCHAR(20) NOT NULL, flags TEXT, reasoning TEXT, "
+            "confidence FLOAT NOT NULL, created_at DATETIME DEFAULT (CURRENT_TIMESTAMP))"
+        ))
+        await conn.execute(text("CREATE INDEX ix_fraud_results_claim_id ON fraud_results (claim_id)"))
+
+    await database.init_db()
+    await database.init_db()  # idempotent on an up-to-date database
+
+    async with engine.connect() as conn:
+        rows = await conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'fraud_results'"))
+        indexes = {name for (name,) in rows}
+    await database.close_db()
+
+    assert {"ix_fraud_results_claim_id_created_at", "ix_fraud_results_alerts_created_at"} <= indexes
+    assert "ix_fraud_results_claim_id" not in indexes
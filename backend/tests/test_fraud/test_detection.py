@@ -0,0 +1,244 @@
+"""
+Tests for the fraud detection engine's incremental history indexes
+"""
+
+import random
+import statistics
+from datetime import datetime
+
+import pytest
+
+from app.fraud.detection import FraudAlert, FraudDetectionEngine
+from app.fraud.detectors import DetectorRegistry
+from app.fraud.history import ClaimHistoryIndex, RunningMedian
+
+AREAS = ["Road Construction", "School Building", "Hospital Equipment"]
+
+
+def make_history(count, seed=11):
+    rng = random.Random(seed)
+    return [
+        {
+            "vendor": f"vendor_{rng.randint(0, 9)}",
+            "amount": rng.choice([0, rng.randint(10_000, 5_000_000)]),
+            "area": rng.choice(AREAS),
+            "deputy": f"deputy_{rng.randint(0, 4)}",
+            "timestamp": 1_700_000_000 + rng.randint(0, 90 * 86400),
+        }
+        for _ in range(count)
+    ]
+
+
+def test_running_median_matches_statistics():
+    rng = random.Random(3)
+    median = RunningMedian()
+    values = []
+    for _ in range(500):
+        value = rng.uniform(-100, 100)
+        median.add(value)
+        values.append(value)
+        assert median.median == pytest.approx(statistics.median(values))
+    assert len(median) == 500
+
+
+def test_area_stats_match_full_scan():
+    history = make_history(400)
+    index = ClaimHistoryIndex(history)
+
+    for area in AREAS:
+        amounts = [h["amount"] for h in history if h["area"] == area and h["amount"] > 0]
+        stats = index.area_stats(area)
+        assert stats.count == len(amounts)
+        assert stats.mean == pytest.approx(statistics.mean(amounts))
+        assert stats.median == pytest.approx(statistics.median(amounts))
+
+    assert index.area_stats("Bridge Repair") is None
+
+
+@pytest.mark.asyncio
+async def test_engine_indexes_only_new_history_entries():
+    engine = FraudDetectionEngine()
+    history = make_history(50)
+    claim = {"claim_id": 1, "vendor_principal": "vendor_1", "amount": 100_000, "area": AREAS[0]}
+
+    await engine.analyze_claim(claim, history)
+    assert engine.history.count == 50
+
+    history.extend(make_history(10, seed=12))
+    await engine.analyze_claim(claim, history)
+    assert engine.history.count == 60
+
+    # A different history list replaces the index rather than adding to it
+    await engine.analyze_claim(claim, make_history(5, seed=13))
+    assert engine.history.count == 5
+
+
+@pytest.mark.asyncio
+async def test_cost_anomaly_uses_recorded_claims():
+    engine = FraudDetectionEngine()
+    for amount in (100_000, 110_000, 90_000):
+        engine.record_claim({"vendor": "vendor_1", "amount": amount, "area": AREAS[0]})
+
+    alerts = await engine._detect_cost_anomalies({"amount": 300_000, "area": AREAS[0]})
+
+    assert alerts[0].alert_type == "critical_cost_inflation"
+    assert alerts[0].evidence["typical_amount"] == 100_000
+    assert alerts[0].evidence["similar_projects_count"] == 3
+
+
+def test_vendor_and_market_aggregates_match_full_scan():
+    history = make_history(400)
+    rng = random.Random(5)
+    rng.shuffle(history)  # recent amounts must follow timestamps, not arrival order
+    index = ClaimHistoryIndex(history)
+
+    for vendor in {h["vendor"] for h in history}:
+        own = [h for h in history if h["vendor"] == vendor]
+        others = [h["amount"] for h in history if h["vendor"] != vendor]
+        latest = sorted(own, key=lambda h: h["timestamp"])[-5:]
+
+        stats = index.vendor_stats(vendor)
+        assert stats.count == len(own)
+        assert stats.mean == pytest.approx(statistics.mean(h["amount"] for h in own))
+        assert stats.recent_amounts == [h["amount"] for h in latest]
+        assert index.market_average_excluding(vendor) == pytest.approx(statistics.mean(others))
+
+    assert index.vendor_stats("vendor_unknown") is None
+    assert index.market_average_excluding("vendor_unknown") == pytest.approx(
+        statistics.mean(h["amount"] for h in history)
+    )
+
+
+def test_similar_amount_count_matches_full_scan():
+    history = make_history(400)
+    index = ClaimHistoryIndex(history)
+
+    for claim in history[:50]:
+        amount = claim["amount"] or 250_000
+        expected = sum(
+            1 for h in history
+            if abs(h["amount"] - amount) / amount < 0.05 and h["vendor"] != claim["vendor"]
+        )
+        assert index.count_similar_amounts(amount, exclude_vendor=claim["vendor"]) == expected
+
+
+def test_collusion_scan_caches_vendor_membership():
+    engine = FraudDetectionEngine()
+    history = [
+        {"vendor": "vendor_a", "amount": 1_000_000},
+        {"vendor": "vendor_b", "amount": 1_020_000},
+        {"vendor": "vendor_c", "amount": 1_040_000},
+        {"vendor": "vendor_d", "amount": 3_000_000},
+        {"vendor": "vendor_d", "amount": 3_010_000},
+        {"vendor": "vendor_d", "amount": 3_020_000},
+    ]
+
+    clusters = engine.scan_collusion_clusters(history)
+
+    # The single-vendor band is not collusion
+    assert len(clusters) == 1
+    assert clusters[0].vendors == {"vendor_a", "vendor_b", "vendor_c"}
+    assert engine.collusion_clusters_for("vendor_b", 1_030_000) == clusters
+    assert engine.collusion_clusters_for("vendor_b", 2_000_000) == []
+    assert engine.collusion_clusters_for("vendor_d") == []
+
+
+@pytest.mark.asyncio
+async def test_bid_collusion_alert_reports_known_clusters():
+    engine = FraudDetectionEngine()
+    history = [
+        {"vendor": "vendor_a", "amount": 1_000_000},
+        {"vendor": "vendor_b", "amount": 1_020_000},
+        {"vendor": "vendor_c", "amount": 1_040_000},
+    ]
+    engine.scan_collusion_clusters(history)
+    for claim in history:
+        engine.record_claim(claim)
+
+    alerts = await engine._detect_vendor_fraud_patterns({"vendor_principal": "vendor_a", "amount": 1_010_000})
+
+    collusion = next(a for a in alerts if a.alert_type == "potential_bid_collusion")
+    assert collusion.evidence["similar_claims"] == 2
+    assert collusion.evidence["collusion_clusters"] == [0]
+
+
+def test_time_windows_match_full_scan():
+    history = make_history(400)
+    random.Random(9).shuffle(history)
+    index = ClaimHistoryIndex(history)
+    now = 1_700_000_000 + 45 * 86400
+
+    for seconds in (7200, 86400 * 30):
+        expected = sorted(h["amount"] for h in history if abs(h["timestamp"] - now) < seconds)
+        assert sorted(index.amounts_near(now, seconds)) == expected
+
+        expected = sorted(
+            h["amount"] for h in history
+            if h["deputy"] == "deputy_2" and abs(h["timestamp"] - now) < seconds
+        )
+        assert sorted(index.amounts_near(now, seconds, deputy="deputy_2")) == expected
+
+    assert index.amounts_near(now, 7200, deputy="deputy_missing") == []
+
+
+@pytest.mark.asyncio
+async def test_contract_splitting_uses_deputy_window():
+    engine = FraudDetectionEngine()
+    now = datetime.now().timestamp()
+    for days_ago in range(5):
+        engine.record_claim({"vendor": "vendor_1", "amount": 4_500_000, "deputy": "deputy_1",
+                             "timestamp": now - days_ago * 86400})
+    # Outside the 30-day window, and another deputy's claim
+    engine.record_claim({"vendor": "vendor_1", "amount": 9_000_000, "deputy": "deputy_1",
+                         "timestamp": now - 40 * 86400})
+    engine.record_claim({"vendor": "vendor_2", "amount": 9_000_000, "deputy": "deputy_2", "timestamp": now})
+
+    alerts = await engine._detect_process_violations({"amount": 4_000_000, "deputy": "deputy_1"})
+
+    splitting = next(a for a in alerts if a.alert_type == "contract_splitting_pattern")
+    assert splitting.evidence == {"contracts_count": 5, "total_amount": 22_500_000, "individual_max": 4_500_000}
+
+
+@pytest.mark.asyncio
+async def test_stop_on_block_skips_remaining_detectors():
+    claim = {"claim_id": 7, "vendor_principal": "vendor_1", "amount": 60_000_000, "area": AREAS[0]}
+
+    full = await FraudDetectionEngine(disabled_detectors=[], stop_on_block=False).analyze_claim(claim, [])
+    early = await FraudDetectionEngine(disabled_detectors=[], stop_on_block=True).analyze_claim(claim, [])
+
+    assert full.recommendation == early.recommendation == "BLOCK"
+    assert "tender_threshold_violation" in [a.alert_type for a in early.alerts]
+    assert early.skipped_detectors == ["timeline_anomalies", "vendor_fraud_patterns"]
+    assert early.truncated and not full.truncated
+    assert set(full.detector_timings_ms) == {
+        "cost_anomalies", "collusion_rings", "invoice_fraud", "process_violations", "timeline_anomalies",
+        "vendor_fraud_patterns"
+    }
+
+
+@pytest.mark.asyncio
+async def test_stop_on_block_also_stops_at_the_block_score_threshold():
+    calls = []
+
+    def high_alert(name, risk_score):
+        async def detect(claim_data):
+            calls.append(name)
+            return [FraudAlert(name, "high", 0.9, name, {}, risk_score, "review")]
+        return detect
+
+    engine = FraudDetectionEngine(disabled_detectors=[], stop_on_block=True)
+    engine.detectors = DetectorRegistry()
+    engine.detectors.register("first", high_alert("first", 45), cost=1)
+    engine.detectors.register("second", high_alert("second", 45), cost=2)
+    engine.detectors.register("third", high_alert("third", 45), cost=3)
+
+    analysis = await engine.analyze_claim({"claim_id": 8, "vendor_principal": "vendor_1", "amount": 1}, [])
+
+    # No alert is critical, but 90 >= CRITICAL_RISK_SCORE already means BLOCK
+    assert calls == ["first", "second"]
+    assert analysis.recommendation == "BLOCK"
+    assert analysis.total_risk_score == 90
+    assert analysis.truncated
+    assert analysis.skipped_detectors == ["third"]
+    assert "1 detector(s) not run" in analysis.reasoning
+    assert (await engine.generate_fraud_report(analysis))["truncated"] is True
@@ -0,0 +1,74 @@
+"""
+Tests for the fraud detector registry
+"""
+
+import pytest
+
+from app.fraud.detectors import DetectorRegistry
+from app.utils.exceptions import ConfigurationError
+
+
+def make_detector(name, calls, alerts=()):
+    async def detect(claim_data):
+        calls.append(name)
+        return list(alerts)
+    return detect
+
+
+def test_orders_by_dependencies_then_cost():
+    calls = []
+    registry = DetectorRegistry()
+    registry.register("expensive", make_detector("expensive", calls), cost=5)
+    registry.register("needs_expensive", make_detector("needs_expensive", calls), cost=0, depends_on=["expensive"])
+    registry.register("cheap", make_detector("cheap", calls), cost=1)
+    registry.register("also_cheap", make_detector("also_cheap", calls), cost=1)
+
+    assert [d.name for d in registry.plan()] == ["cheap", "also_cheap", "expensive", "needs_expensive"]
+
+
+def test_rejects_unknown_dependencies_and_cycles():
+    registry = DetectorRegistry()
+    registry.register("a", make_detector("a", []), depends_on=["missing"])
+    with pytest.raises(ConfigurationError):
+        registry.plan()
+
+    registry = DetectorRegistry()
+    registry.register("a", make_detector("a", []), depends_on=["b"])
+    registry.register("b", make_detector("b", []), depends_on=["a"])
+    with pytest.raises(ConfigurationError):
+        registry.plan()
+
+    with pytest.raises(ConfigurationError):
+        registry.configure(["nope"])
+
+
+@pytest.mark.asyncio
+async def test_disabled_detectors_and_their_dependents_are_skipped():
+    calls = []
+    registry = DetectorRegistry()
+    registry.register("base", make_detector("base", calls))
+    registry.register("derived", make_detector("derived", calls), depends_on=["base"])
+    registry.register("other", make_detector("other", calls))
+    registry.configure(["base"])
+
+    run = await registry.run({})
+
+    assert calls == ["other"]
+    assert run.skipped == ["base", "derived"]
+    assert set(run.timings_ms) == {"other"}
+    assert registry.get_stats()["other"]["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stops_once_outcome_is_decided():
+    calls = []
+    registry = DetectorRegistry()
+    registry.register("blocker", make_detector("blocker", calls, alerts=["block"]), cost=1)
+    registry.register("slow", make_detector("slow", calls), cost=10)
+
+    run = await registry.run({}, stop_when=lambda alerts: "block" in alerts)
+
+    assert calls == ["blocker"]
+    assert run.stopped_early
+    assert run.alerts == ["block"]
+    assert run.skipped == ["slow"]
@@ -0,0 +1,67 @@
+"""
+Tests for the bounded fraud scoring pool
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.fraud.executor import ScoringExecutor
+from app.utils.exceptions import ScoringCapacityError, ScoringTimeoutError
+
+
+@pytest.mark.asyncio
+async def test_runs_work_off_the_event_loop():
+    executor = ScoringExecutor(max_workers=2, max_queue=2)
+    loop_thread = threading.get_ident()
+
+    worker_thread = await executor.run(threading.get_ident)
+
+    assert worker_thread != loop_thread
+    assert executor.get_metrics()["completed"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full():
+    executor = ScoringExecutor(max_workers=1, max_queue=1, timeout_seconds=5)
+    release = threading.Event()
+
+    running = asyncio.ensure_future(executor.run(release.wait))
+    queued = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0.05)
+
+    metrics = executor.get_metrics()
+    assert metrics["busy_workers"] == 1
+    assert metrics["queued"] == 1
+    assert metrics["utilization"] == 1.0
+
+    with pytest.raises(ScoringCapacityError):
+        await executor.run(release.wait)
+
+    release.set()
+    await asyncio.gather(running, queued)
+    assert executor.get_metrics()["rejected"] == 1
+    assert executor.get_metrics()["in_flight"] == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_keeps_slot_until_work_finishes():
+    executor = ScoringExecutor(max_workers=1, max_queue=0, timeout_seconds=0.05)
+    release = threading.Event()
+
+    with pytest.raises(ScoringTimeoutError):
+        await executor.run(release.wait)
+
+    # The worker is still busy, so the pool is still full
+    assert executor.get_metrics()["in_flight"] == 1
+    with pytest.raises(ScoringCapacityError):
+        await executor.run(release.wait)
+
+    release.set()
+    await asyncio.sleep(0.05)
+    assert executor.get_metrics()["in_flight"] == 0
+    assert executor.get_metrics()["timed_out"] == 1
+    executor.shutdown()
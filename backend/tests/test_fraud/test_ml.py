@@ -0,0 +1,67 @@
+"""
+Tests for the ML detector's vectorized batch path
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.fraud.ml import MLFraudDetector
+
+
+def claim(vendor_id: str, amount: float, timestamp: datetime):
+    return SimpleNamespace(vendor_id=vendor_id, amount=amount, timestamp=timestamp)
+
+
+def make_history():
+    rng = np.random.RandomState(1)
+    start = datetime(2026, 3, 2)
+    history = [
+        claim(f"vendor-{i % 4}", float(rng.uniform(5_000, 120_000)), start + timedelta(days=i, hours=i % 7))
+        for i in range(40)
+    ]
+    # A vendor whose average amount is zero takes the ratio fallback
+    history.append(claim("vendor-free", 0.0, start))
+    return history
+
+
+def mixed_batch():
+    return [
+        claim("vendor-0", 50_000.0, datetime(2026, 4, 20, 9)),      # known vendor, weekday
+        claim("vendor-2", 250_000.0, datetime(2026, 4, 25, 14)),    # known vendor, Saturday
+        claim("vendor-new", 10_000.0, datetime(2026, 4, 21)),       # no history
+        claim("vendor-free", 1_000.0, datetime(2026, 4, 26)),       # zero average, Sunday
+        claim("vendor-1", 75_000.0, datetime(2027, 9, 1)),          # gap capped at a year
+        claim("vendor-3", 0.0, datetime(2026, 2, 1)),               # earlier than its history
+    ]
+
+
+def test_feature_matrix_matches_per_claim_features():
+    detector = MLFraudDetector()
+    history, batch = make_history(), mixed_batch()
+
+    matrix = detector.prepare_feature_matrix(batch, history)
+    rows = np.vstack([detector.prepare_features(c, history) for c in batch])
+
+    assert matrix.shape == (len(batch), len(detector.feature_columns))
+    np.testing.assert_allclose(matrix, rows)
+
+
+def test_predict_many_matches_per_claim_predictions():
+    detector = MLFraudDetector()
+    history, batch = make_history(), mixed_batch()
+    detector.train(history, [False] * len(history))
+
+    batched = detector.predict_many(batch, history)
+    one_by_one = [detector.predict_fraud_probability(c, history) for c in batch]
+
+    np.testing.assert_allclose(batched, one_by_one)
+
+
+def test_untrained_and_empty_batches():
+    detector = MLFraudDetector()
+    assert detector.predict_many(mixed_batch(), make_history()) == [0.5] * 6
+
+    detector.train(make_history(), [False] * 41)
+    assert detector.predict_many([], make_history()) == []
@@ -0,0 +1,87 @@
+"""
+Tests for streaming, keyset-paginated fraud reports
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.fraud.reports import FRAUD_REPORT_FIELDS, fraud_report_records, iter_fraud_results
+from app.schemas import FraudResult
+from app.utils.streaming import csv_lines, ndjson_lines
+
+START = datetime(2024, 4, 1, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'reports.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all(
+            FraudResult(
+                claim_id=i,
+                score=i * 10,
+                risk_level="high" if i >= 7 else "low",
+                flags="cost_variance" if i % 2 else "",
+                reasoning="",
+                confidence=0.9,
+                created_at=START + timedelta(days=i),
+            )
+            for i in range(1, 11)
+        )
+        await session.commit()
+
+    yield factory
+    await engine.dispose()
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_every_row_once(session_factory):
+    results = await collect(iter_fraud_results(session_factory, chunk_size=3))
+    assert [r.claim_id for r in results] == list(range(1, 11))
+
+    windowed = await collect(iter_fraud_results(
+        session_factory, chunk_size=3, since=START + timedelta(days=4), until=START + timedelta(days=8)
+    ))
+    assert [r.claim_id for r in windowed] == [4, 5, 6, 7]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_report_ends_with_running_summary(session_factory):
+    records = fraud_report_records(iter_fraud_results(session_factory, chunk_size=4))
+    lines = [json.loads(line) for line in await collect(ndjson_lines(records))]
+
+    assert [line["type"] for line in lines] == ["claim"] * 10 + ["summary"]
+    summary = lines[-1]
+    assert summary["results"] == 10
+    assert summary["average_score"] == 55.0
+    assert summary["max_score"] == 100
+    assert summary["flagged"] == 4
+    assert summary["by_risk_level"] == {"low": 6, "high": 4}
+    assert summary["top_flags"] == {"cost_variance": 5}
+
+
+@pytest.mark.asyncio
+async def test_csv_report_streams_one_row_per_chunk(session_factory):
+    records = fraud_report_records(iter_fraud_results(session_factory, chunk_size=4))
+    chunks = await collect(csv_lines(records, FRAUD_REPORT_FIELDS))
+
+    assert len(chunks) == 10  # header goes out with the first row; no summary row
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert [int(row["claim_id"]) for row in rows] == list(range(1, 11))
+    assert list(rows[0]) == list(FRAUD_REPORT_FIELDS)
+
@@ -0,0 +1,104 @@
+"""
+Tests for background retraining, model hot-swap and rollback
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.fraud.ml import MLFraudDetector
+from app.fraud.retraining import ModelRetrainer
+
+
+def make_history(n: int = 60):
+    rng = np.random.RandomState(0)
+    start = datetime(2026, 1, 5)
+    return [
+        SimpleNamespace(
+            vendor_id=f"vendor-{i % 6}",
+            amount=float(rng.uniform(10_000, 90_000)),
+            timestamp=start + timedelta(days=i),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_retrain_installs_a_new_version():
+    history = make_history()
+    detector = MLFraudDetector()
+    detector.train(history, [False] * len(history))
+    installed = []
+    retrainer = ModelRetrainer(
+        detector,
+        lambda: history,
+        min_new_claims=5,
+        on_model_installed=installed.append,
+    )
+    retrainer.notify_new_claims(5)
+
+    await retrainer.start()
+    try:
+        bundle = await retrainer.retrain_now()
+    finally:
+        await retrainer.stop()
+
+    assert bundle.version == 2
+    assert installed == [bundle]
+    info = detector.get_model_info()
+    assert info["version"] == 2
+    assert info["rollback_version"] == 1
+    assert info["training_samples"] == len(history)
+    assert retrainer.new_claims_since_fit == 0
+    assert retrainer.get_status()["retrain_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retrain_needs_a_started_retrainer_and_enough_history():
+    detector = MLFraudDetector()
+    retrainer = ModelRetrainer(detector, lambda: make_history(5), min_training_samples=10)
+
+    with pytest.raises(RuntimeError):
+        await retrainer.retrain_now()
+
+    await retrainer.start()
+    try:
+        assert await retrainer.retrain_now() is None
+    finally:
+        await retrainer.stop()
+    assert not detector.is_trained
+
+
+def test_rollback_restores_the_previous_bundle():
+    history = make_history()
+    detector = MLFraudDetector()
+    assert detector.rollback() is False
+
+    detector.train(history, [False] * len(history))
+    first = detector._active
+    detector.train(history[:30], [False] * 30)
+    second = detector._active
+    assert second.version == 2
+
+    assert detector.rollback() is True
+    assert detector._active is first
+    assert detector.model is first.model and detector.scaler is first.scaler
+    assert detector.get_model_info()["rollback_version"] == 2
+
+    # Rolling back again undoes the rollback
+    assert detector.rollback() is True
+    assert detector._active is second
+
+
+def test_a_new_version_after_rollback_keeps_counting_up():
+    history = make_history()
+    detector = MLFraudDetector()
+    detector.train(history, [False] * len(history))
+    detector.train(history, [False] * len(history))
+    detector.rollback()
+
+    detector.train(history, [False] * len(history))
+
+    assert detector.get_model_info()["version"] == 3
@@ -0,0 +1,93 @@
+"""
+Tests for offline collusion ring discovery
+"""
+
+import random
+
+import pytest
+
+from app.fraud.detection import FraudDetectionEngine
+from app.fraud.rings import CollusionRingIndex, UnionFind, find_collusion_rings
+
+
+def brute_force_vendor_groups(claims, tolerance=0.05):
+    """Connected vendors by comparing every pair of bids"""
+    uf = UnionFind()
+    for claim in claims:
+        uf.add(claim["vendor"])
+    for i, a in enumerate(claims):
+        for b in claims[i + 1:]:
+            if a["vendor"] == b["vendor"] or (a["deputy"], a["area"]) != (b["deputy"], b["area"]):
+                continue
+            low, high = sorted((a["amount"], b["amount"]))
+            if high - low < tolerance * low:
+                uf.union(a["vendor"], b["vendor"])
+    return {frozenset(group) for group in uf.groups().values()}
+
+
+def test_rings_match_pairwise_comparison():
+    rng = random.Random(21)
+    claims = [
+        {
+            "vendor": f"vendor_{rng.randint(0, 40)}",
+            "deputy": f"deputy_{rng.randint(0, 3)}",
+            "area": rng.choice(["roads", "schools"]),
+            "amount": rng.choice([1_000_000, 2_000_000, 5_000_000]) * rng.uniform(0.97, 1.03),
+        }
+        for _ in range(300)
+    ]
+
+    rings = find_collusion_rings(claims, min_shared_bids=1, min_vendors=2)
+
+    expected = {group for group in brute_force_vendor_groups(claims) if len(group) >= 2}
+    assert {frozenset(ring.vendors) for ring in rings} == expected
+
+
+def test_ring_needs_repeated_matching_bids():
+    claims = []
+    for base in (1_000_000, 3_000_000):
+        claims += [
+            {"vendor": "a", "deputy": "d1", "area": "roads", "amount": base},
+            {"vendor": "b", "deputy": "d1", "area": "roads", "amount": base * 1.01},
+            {"vendor": "c", "deputy": "d2", "area": "schools", "amount": base},
+            {"vendor": "b", "deputy": "d2", "area": "schools", "amount": base * 1.02},
+        ]
+    claims += [
+        # One coincidental match is not enough
+        {"vendor": "x", "deputy": "d1", "area": "roads", "amount": 7_000_000},
+        {"vendor": "a", "deputy": "d1", "area": "roads", "amount": 7_010_000},
+        # Same amounts under different deputies are not linked
+        {"vendor": "y", "deputy": "d3", "area": "roads", "amount": 1_000_000},
+        {"vendor": "z", "deputy": "d4", "area": "roads", "amount": 1_000_000},
+    ]
+
+    rings = find_collusion_rings(claims)
+
+    assert len(rings) == 1
+    assert rings[0].vendors == ["a", "b", "c"]
+    assert rings[0].deputies == ["d1", "d2"]
+    assert rings[0].areas == ["roads", "schools"]
+    assert rings[0].linked_bids == 4
+
+
+@pytest.mark.asyncio
+async def test_persisted_rings_feed_online_detector(tmp_path):
+    rings_path = str(tmp_path / "rings.json")
+    claims = [
+        {"vendor": vendor, "deputy": "d1", "area": "roads", "amount": base * factor}
+        for base in (1_000_000, 2_000_000)
+        for vendor, factor in (("a", 1.0), ("b", 1.01), ("c", 1.02))
+    ]
+    FraudDetectionEngine(disabled_detectors=[], stop_on_block=False, rings_path=rings_path).discover_collusion_rings(claims)
+
+    # A fresh engine (another worker) picks the rings up from disk
+    engine = FraudDetectionEngine(disabled_detectors=[], stop_on_block=False, rings_path=rings_path)
+    alerts = await engine._detect_collusion_ring_membership({"vendor_principal": "b"})
+
+    assert alerts[0].alert_type == "collusion_ring_member"
+    assert alerts[0].evidence["ring_vendors"] == 3
+    assert await engine._detect_collusion_ring_membership({"vendor_principal": "z"}) == []
+
+
+def test_missing_ring_file_gives_empty_index(tmp_path):
+    assert len(CollusionRingIndex.load(str(tmp_path / "missing.json"))) == 0
@@ -0,0 +1,85 @@
+"""
+Tests for the claim score read-through cache and its supporting indexes
+"""
+
+import asyncio
+
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import Base
+from app.database.cache import ReadThroughCache
+from app.schemas import ALERT_RISK_FILTER, FraudResult
+
+
+@pytest.mark.asyncio
+async def test_serves_hits_until_invalidated():
+    cache = ReadThroughCache(ttl_seconds=60)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return len(loads)
+
+    assert await cache.get_or_load("claim", loader) == 1
+    assert await cache.get_or_load("claim", loader) == 1
+
+    cache.invalidate("claim")
+    assert await cache.get_or_load("claim", loader) == 2
+    assert cache.get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = ReadThroughCache(ttl_seconds=60)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return "score"
+
+    results = await asyncio.gather(*(cache.get_or_load("claim", loader) for _ in range(10)))
+
+    assert results == ["score"] * 10
+    assert len(loads) == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_cached():
+    cache = ReadThroughCache(ttl_seconds=60)
+
+    async def loader():
+        cache.invalidate("claim")
+        return "stale"
+
+    assert await cache.get_or_load("claim", loader) == "stale"
+    assert cache.get_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queries_use_score_indexes(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        latest_plan = (await conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM fraud_results WHERE claim_id = 1 "
+            "ORDER BY created_at DESC LIMIT 1"
+        ))).all()
+        alerts_query = (
+            select(FraudResult)
+            .where(ALERT_RISK_FILTER, FraudResult.created_at >= datetime.now(timezone.utc) - timedelta(hours=24))
+            .order_by(FraudResult.created_at.desc())
+            .limit(100)
+        )
+        compiled = alerts_query.compile(conn.sync_connection)
+        alerts_plan = (await conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params[name] for name in compiled.positiontup)
+        )).all()
+    await engine.dispose()
+
+    assert "ix_fraud_results_claim_id_created_at" in str(latest_plan)
+    assert "ix_fraud_results_alerts_created_at" in str(alerts_plan)
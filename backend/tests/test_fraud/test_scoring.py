@@ -0,0 +1,85 @@
+"""
+Tests for the configurable claim scorers
+"""
+
+from datetime import datetime
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from app.fraud.executor import ScoringExecutor
+from app.fraud.scoring import HttpEngineScorer, LocalScorer, create_claim_scorer
+from app.utils.exceptions import ConfigurationError, FraudDetectionError
+
+
+class Claim(BaseModel):
+    claim_id: int
+    amount: float
+    timestamp: datetime
+
+
+class Score(BaseModel):
+    claim_id: int
+    score: int
+    risk_level: str
+    flags: list
+    reasoning: str
+    confidence: float
+    analysis_time_ms: float = 0.0
+
+
+CLAIM = Claim(claim_id=7, amount=1000.0, timestamp=datetime(2025, 1, 1))
+
+
+@pytest.mark.asyncio
+async def test_local_scorer_returns_common_fields():
+    async def analyze(claim):
+        return Score(claim_id=claim.claim_id, score=42, risk_level="medium", flags=[], reasoning="r", confidence=0.8)
+
+    result = await LocalScorer(analyze).score(CLAIM)
+
+    assert result == {
+        "claim_id": 7, "score": 42, "risk_level": "medium", "flags": [], "reasoning": "r", "confidence": 0.8
+    }
+
+
+@pytest.mark.asyncio
+async def test_http_scorer_posts_claim_json():
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = request.read().decode()
+        assert '"timestamp":"2025-01-01T00:00:00"' in body.replace(" ", "")
+        return httpx.Response(200, json={"success": True, "fraud_analysis": {
+            "claim_id": 7, "score": 90, "risk_level": "critical", "flags": ["SHELL_COMPANY"],
+            "reasoning": "r", "confidence": 0.9, "analysis_time_ms": 1.5
+        }})
+
+    scorer = HttpEngineScorer("http://engine/analyze-claim")
+    scorer.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    result = await scorer.score(CLAIM)
+    await scorer.close()
+
+    assert result["score"] == 90
+    assert "analysis_time_ms" not in result
+
+
+@pytest.mark.asyncio
+async def test_http_scorer_wraps_engine_errors():
+    scorer = HttpEngineScorer("http://engine/analyze-claim")
+    scorer.client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+
+    with pytest.raises(FraudDetectionError):
+        await scorer.score(CLAIM)
+    await scorer.close()
+
+
+def test_factory_validates_configuration():
+    executor = ScoringExecutor()
+
+    with pytest.raises(ConfigurationError):
+        create_claim_scorer("http", None, executor)
+    with pytest.raises(ConfigurationError):
+        create_claim_scorer("remote", None, executor)
+    with pytest.raises(ConfigurationError):
+        create_claim_scorer("inprocess", None, executor, engine_path="/nonexistent")
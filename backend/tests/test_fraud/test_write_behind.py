@@ -0,0 +1,163 @@
+"""
+Tests for the write-behind fraud result buffer
+"""
+
+import asyncio
+import os
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.database.write_behind import WriteBehindBuffer
+from app.schemas import FraudAuditLog, FraudResult
+from app.utils.exceptions import WriteBufferFullError
+
+
+def _result(claim_id: int) -> dict:
+    return {
+        "claim_id": claim_id,
+        "score": 40,
+        "risk_level": "medium",
+        "flags": "",
+        "reasoning": "test",
+        "confidence": 0.8,
+    }
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _spilled(buffer: WriteBehindBuffer) -> None:
+    """Wait for the background spill writer to catch up"""
+    for _ in range(100):
+        if buffer.get_stats()["unspilled_rows"] == 0:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("spill writer did not catch up")
+
+
+async def _count(session_factory, model) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_rows_for_every_table(session_factory, tmp_path):
+    flushed = []
+    buffer = WriteBehindBuffer(
+        session_factory, flush_interval_ms=60_000, spill_path=str(tmp_path / "spill.jsonl"),
+        on_flush=flushed.append
+    )
+    await buffer.start()
+
+    for claim_id in range(5):
+        buffer.add(FraudResult, _result(claim_id))
+    buffer.add(FraudAuditLog, {"event_type": "high_fraud_risk", "description": "x", "claim_id": 1, "severity": "high"})
+    await buffer.stop()
+
+    assert await _count(session_factory, FraudResult) == 5
+    assert await _count(session_factory, FraudAuditLog) == 1
+    assert set(flushed[0]) == {"fraud_results", "fraud_audit_logs"}
+    assert (tmp_path / "spill.jsonl").read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_spilled_rows_are_replayed_after_a_crash(session_factory, tmp_path):
+    spill_path = str(tmp_path / "spill.jsonl")
+
+    crashed = WriteBehindBuffer(session_factory, flush_interval_ms=60_000, spill_path=spill_path)
+    await crashed.start()
+    crashed.add(FraudResult, _result(1))
+    crashed.add(FraudResult, _result(2))
+    await _spilled(crashed)
+    # Simulate a crash: the flusher dies without a final flush
+    crashed._task.cancel()
+
+    assert await _count(session_factory, FraudResult) == 0
+
+    restarted = WriteBehindBuffer(session_factory, flush_interval_ms=60_000, spill_path=spill_path)
+    await restarted.start()
+    await restarted.stop()
+
+    assert await _count(session_factory, FraudResult) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_rows_pending(tmp_path):
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    buffer = WriteBehindBuffer(broken_session, flush_interval_ms=60_000)
+    await buffer.start()
+    buffer.add(FraudResult, _result(1))
+
+    assert await buffer.flush() == 0
+    assert buffer.get_stats()["pending_rows"] == 1
+    assert buffer.get_stats()["failed_flushes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_spill_writes_are_batched_with_one_fsync_each(tmp_path, monkeypatch):
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+    spill_path = tmp_path / "spill.jsonl"
+
+    buffer = WriteBehindBuffer(lambda: None, flush_interval_ms=60_000, spill_path=str(spill_path))
+    await buffer.start()
+    for claim_id in range(200):
+        buffer.add(FraudResult, _result(claim_id))
+
+    assert fsyncs == []  # add() only queues; nothing touches the disk on the caller's turn
+    await _spilled(buffer)
+
+    assert len(spill_path.read_text().splitlines()) == 200
+    assert len(fsyncs) == buffer.get_stats()["spill_batches"] == 1
+    buffer._task.cancel()
+    buffer._spill_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_rejects_new_rows(tmp_path):
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    buffer = WriteBehindBuffer(broken_session, flush_interval_ms=60_000, max_pending=3)
+    await buffer.start()
+    for claim_id in range(3):
+        assert buffer.add(FraudResult, _result(claim_id))
+
+    with pytest.raises(WriteBufferFullError):
+        buffer.add(FraudResult, _result(3))
+
+    assert await buffer.flush() == 0
+    stats = buffer.get_stats()
+    assert stats["pending_rows"] == 3
+    assert stats["overflowed_rows"] == 1
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_discards_and_counts(session_factory):
+    buffer = WriteBehindBuffer(session_factory, flush_interval_ms=60_000, max_pending=2, overflow_policy="drop")
+    await buffer.start()
+
+    accepted = [buffer.add(FraudResult, _result(claim_id)) for claim_id in range(5)]
+    await buffer.stop()
+
+    assert accepted == [True, True, False, False, False]
+    assert buffer.get_stats()["overflowed_rows"] == 3
+    assert await _count(session_factory, FraudResult) == 2
+
+
+def test_rejects_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        WriteBehindBuffer(lambda: None, overflow_policy="block")